@@ -28,6 +28,31 @@ class RunAudit:
             "url_repair_attempts": 0,
             "url_repairs": 0,
             "url_repair_failures": 0,
+            "http_hosts": 0,
+            "http_requests": 0,
+            "http_connections": 0,
+            "http_reused_connections": 0,
+            "title_cache_hits": 0,
+            "title_cache_misses": 0,
+            "analysis_cache_hits": 0,
+            "analysis_cache_misses": 0,
+            "description_store_hits": 0,
+            "description_store_writes": 0,
+            "description_store_deduplicated": 0,
+            "description_store_bytes_written": 0,
+            "readiness_waits": 0,
+            "readiness_wait_ms": 0,
+            "readiness_deadline_hits": 0,
+            "readiness_learned_companies": 0,
+            "unchanged_boards": 0,
+            "snapshot_bytes_saved": 0,
+            "browser_requests_blocked": 0,
+            "browser_estimated_bytes_avoided": 0,
+            "ledger_flushes": 0,
+            "ledger_records_written": 0,
+            "gemini_requests": 0,
+            "gemini_retries": 0,
+            "gemini_throttled_seconds": 0,
         }
         self.company_stats: Dict[str, Dict[str, int]] = {}
         self.issues: List[str] = []
@@ -43,6 +68,9 @@ class RunAudit:
                 "evaluated": 0,
                 "competitive": 0,
                 "held": 0,
+                "bytes_saved": 0,
+                "requests_blocked": 0,
+                "estimated_bytes_avoided": 0,
             }
         return self.company_stats[company]
 
@@ -57,6 +85,19 @@ class RunAudit:
         self.stats["duplicate_jobs"] += len(duplicate_notes)
         self.issues.extend(duplicate_notes[:5])
 
+    def record_unchanged_board(self, company: str, bytes_saved: int) -> None:
+        self.stats["unchanged_boards"] += 1
+        self.stats["snapshot_bytes_saved"] += bytes_saved
+        self._company(company)["bytes_saved"] = bytes_saved
+
+    def record_resources(self, company: str, requests_blocked: int, estimated_bytes_avoided: int) -> None:
+        """Browser requests the resource policy aborted; bytes are per-type estimates."""
+        self.stats["browser_requests_blocked"] += requests_blocked
+        self.stats["browser_estimated_bytes_avoided"] += estimated_bytes_avoided
+        company_stats = self._company(company)
+        company_stats["requests_blocked"] += requests_blocked
+        company_stats["estimated_bytes_avoided"] += estimated_bytes_avoided
+
     def record_candidates(self, company: str, new_count: int, candidate_count: int) -> None:
         self.stats["new_jobs"] += new_count
         self.stats["title_candidates"] += candidate_count
@@ -104,6 +145,32 @@ class RunAudit:
                     f"{company} - {job.get('title', '')}: URL repair ended as {repair.get('status')} after {len(attempts)} attempt(s)."
                 )
 
+    def record_http(self, http_stats: Dict[str, int]) -> None:
+        for key in ("http_hosts", "http_requests", "http_connections", "http_reused_connections"):
+            self.stats[key] = int(http_stats.get(key, 0) or 0)
+
+    def record_gemini(self, gemini_stats: Dict[str, float]) -> None:
+        self.stats["gemini_requests"] = int(gemini_stats.get("requests", 0) or 0)
+        self.stats["gemini_retries"] = int(gemini_stats.get("retries", 0) or 0)
+        self.stats["gemini_throttled_seconds"] = round(float(gemini_stats.get("throttled_seconds", 0) or 0), 1)
+
+    def record_ledger(self, ledger_stats: Dict[str, int]) -> None:
+        self.stats["ledger_flushes"] = int(ledger_stats.get("flushes", 0) or 0)
+        self.stats["ledger_records_written"] = int(ledger_stats.get("records", 0) or 0)
+
+    def record_cache(self, name: str, cache_stats: Dict[str, int]) -> None:
+        self.stats[f"{name}_hits"] = int(cache_stats.get("hits", 0) or 0)
+        self.stats[f"{name}_misses"] = int(cache_stats.get("misses", 0) or 0)
+
+    def record_descriptions(self, store_stats: Dict[str, int]) -> None:
+        for key in ("hits", "writes", "deduplicated", "bytes_written"):
+            self.stats[f"description_store_{key}"] = int(store_stats.get(key, 0) or 0)
+
+    def record_readiness(self, hint_stats: Dict[str, Any]) -> None:
+        for key in ("waits", "wait_ms", "deadline_hits"):
+            self.stats[f"readiness_{key}"] = int(hint_stats.get(key, 0) or 0)
+        self.stats["readiness_learned_companies"] = int(hint_stats.get("learned", 0) or 0)
+
     def record_email_selection(self, selected_count: int) -> None:
         self.stats["sent_in_email"] = selected_count
 
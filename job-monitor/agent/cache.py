@@ -0,0 +1,194 @@
+"""Persistent LRU caches for AI results under the job-agent data directory."""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+from agent.feedback import DEFAULT_DATA_DIR
+from agent.ledger import description_hash
+from ai.analyzer import ANALYSIS_MODEL, ANALYSIS_PROMPT_VERSION
+from ai.candidate_profile import CANDIDATE_FIT_PROFILE
+
+DEFAULT_TITLE_CACHE_FILE = os.getenv(
+    "JOB_TITLE_CACHE_FILE",
+    os.path.join(DEFAULT_DATA_DIR, "title_cache.json"),
+)
+DEFAULT_TITLE_CACHE_TTL_DAYS = 30
+DEFAULT_TITLE_CACHE_MAX_ENTRIES = 20_000
+DEFAULT_ANALYSIS_CACHE_FILE = os.getenv(
+    "JOB_ANALYSIS_CACHE_FILE",
+    os.path.join(DEFAULT_DATA_DIR, "analysis_cache.json"),
+)
+DEFAULT_ANALYSIS_CACHE_TTL_DAYS = 90
+DEFAULT_ANALYSIS_CACHE_MAX_ENTRIES = 5_000
+
+CANDIDATE_PROFILE_HASH = hashlib.sha256(CANDIDATE_FIT_PROFILE.encode("utf-8")).hexdigest()[:16]
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+class PersistentCache:
+    """JSON-backed LRU cache with a TTL, shared safely by worker threads.
+
+    Entries are kept in recency order on disk so eviction survives restarts.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float = None):
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = ttl_seconds
+        self.counters = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "writes": 0}
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._changes = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except Exception as exc:
+            print(f"[WARN] Could not load cache {self.path}: {exc}")
+            return
+        entries = data.get("entries") if isinstance(data, dict) else None
+        if isinstance(entries, dict):
+            self._entries = OrderedDict(
+                (key, entry) for key, entry in entries.items() if isinstance(entry, dict) and "value" in entry
+            )
+
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        if not self.ttl_seconds:
+            return False
+        try:
+            return now - float(entry.get("stored_at", 0)) > self.ttl_seconds
+        except (TypeError, ValueError):
+            return True
+
+    def get(self, key: str) -> Any:
+        """Return the cached value, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry, time.time()):
+                del self._entries[key]
+                self._dirty = True
+                self._changes += 1
+                self.counters["expired"] += 1
+                entry = None
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return entry["value"]
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = {"value": value, "stored_at": time.time()}
+            self._entries.move_to_end(key)
+            self.counters["writes"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+            self._dirty = True
+            self._changes += 1
+
+    def save(self) -> None:
+        """Atomically persist the cache if it changed."""
+        with self._lock:
+            if not self._dirty or not self.path:
+                return
+            payload = {"entries": dict(self._entries)}
+            changes = self._changes
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        with self._lock:
+            # A failed write leaves the cache dirty; entries added meanwhile wait for the next save
+            if self._changes == changes:
+                self._dirty = False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters, entries=len(self._entries))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def load_title_cache(path: str = DEFAULT_TITLE_CACHE_FILE) -> PersistentCache:
+    """Title-classification cache; JOB_TITLE_CACHE_TTL_DAYS=0 disables expiry."""
+    ttl_days = _env_number("JOB_TITLE_CACHE_TTL_DAYS", DEFAULT_TITLE_CACHE_TTL_DAYS)
+    return PersistentCache(
+        path,
+        max_entries=int(_env_number("JOB_TITLE_CACHE_MAX_ENTRIES", DEFAULT_TITLE_CACHE_MAX_ENTRIES)),
+        ttl_seconds=ttl_days * 86_400 if ttl_days else None,
+    )
+
+
+def analysis_cache_key(job: Dict[str, Any], model: str = ANALYSIS_MODEL) -> str:
+    """Content key for an analyzer result: posting fields, description, profile, model."""
+    parts = [
+        ANALYSIS_PROMPT_VERSION,
+        model,
+        CANDIDATE_PROFILE_HASH,
+        description_hash(job),
+    ] + [
+        " ".join(str(job.get(field, "") or "").split()).lower()
+        for field in ("company", "title", "location")
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """Normalized analyze_job results keyed by posting content.
+
+    Feedback calibration and verification caps are applied after lookup,
+    so only the Gemini call is skipped on a hit.
+    """
+
+    def __init__(self, store: PersistentCache):
+        self.store = store
+
+    def lookup(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        result = self.store.get(analysis_cache_key(job))
+        # Callers mutate evidence/concerns lists in place, so never hand out the cached object.
+        return copy.deepcopy(result) if isinstance(result, dict) else None
+
+    def store_result(self, job: Dict[str, Any], result: Dict[str, Any]) -> None:
+        self.store.put(analysis_cache_key(job), copy.deepcopy(result))
+
+    def save(self) -> None:
+        self.store.save()
+
+    def stats(self) -> Dict[str, int]:
+        return self.store.stats()
+
+
+def load_analysis_cache(path: str = DEFAULT_ANALYSIS_CACHE_FILE) -> AnalysisCache:
+    """Analyzer result cache; JOB_ANALYSIS_CACHE_TTL_DAYS=0 disables expiry."""
+    ttl_days = _env_number("JOB_ANALYSIS_CACHE_TTL_DAYS", DEFAULT_ANALYSIS_CACHE_TTL_DAYS)
+    return AnalysisCache(
+        PersistentCache(
+            path,
+            max_entries=int(_env_number("JOB_ANALYSIS_CACHE_MAX_ENTRIES", DEFAULT_ANALYSIS_CACHE_MAX_ENTRIES)),
+            ttl_seconds=ttl_days * 86_400 if ttl_days else None,
+        )
+    )
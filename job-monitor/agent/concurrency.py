@@ -0,0 +1,151 @@
+"""Bounded worker pool and per-host limits for concurrent monitor runs."""
+
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+from urllib.parse import urlparse
+
+DEFAULT_WORKERS = 1
+DEFAULT_HOST_LIMIT = 2
+DEFAULT_HOST_LIMITS = {
+    "boards-api.greenhouse.io": 4,
+    "api.ashbyhq.com": 2,
+}
+
+_COMPANY_TYPE_HOSTS = {
+    "greenhouse": "boards-api.greenhouse.io",
+    "ashby": "api.ashbyhq.com",
+    "parallel": "api.useparallel.com",
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def worker_count(value: int = None) -> int:
+    """Global worker count; 1 keeps the sequential run path."""
+    if value is not None:
+        return max(1, int(value))
+    return _env_int("JOB_MONITOR_WORKERS", DEFAULT_WORKERS)
+
+
+def parse_host_limits(value: str) -> Dict[str, int]:
+    """Parse "host=n,host=n" overrides into a host limit map."""
+    limits: Dict[str, int] = {}
+    for item in (value or "").split(","):
+        host, _, limit = item.partition("=")
+        host = host.strip().lower()
+        if not host:
+            continue
+        try:
+            limits[host] = max(1, int(limit))
+        except (TypeError, ValueError):
+            print(f"[WARN] Ignoring invalid host limit '{item.strip()}'")
+    return limits
+
+
+def url_host(url: str) -> str:
+    return (urlparse(url or "").netloc or "").lower()
+
+
+def company_host(company: Dict[str, Any]) -> str:
+    """Network host a company's board scrape talks to."""
+    company_type = company.get("type", "")
+    if company_type in _COMPANY_TYPE_HOSTS:
+        return _COMPANY_TYPE_HOSTS[company_type]
+    return url_host(str(company.get("board_token", "") or ""))
+
+
+class HostLimiter:
+    """Per-host semaphores so concurrent workers stay polite to shared ATS hosts."""
+
+    def __init__(self, limits: Dict[str, int] = None, default_limit: int = None):
+        self.limits = dict(DEFAULT_HOST_LIMITS)
+        self.limits.update(limits if limits is not None else parse_host_limits(os.getenv("JOB_MONITOR_HOST_LIMITS", "")))
+        self.default_limit = default_limit or _env_int("JOB_MONITOR_HOST_LIMIT", DEFAULT_HOST_LIMIT)
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def limit_for(self, host: str) -> int:
+        return self.limits.get((host or "").lower(), self.default_limit)
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        host = (host or "").lower()
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.limit_for(host))
+            return self._semaphores[host]
+
+    @contextmanager
+    def hold(self, host: str) -> Iterator[None]:
+        if not host:
+            yield
+            return
+        semaphore = self._semaphore(host)
+        with semaphore:
+            yield
+
+
+def run_ordered(
+    items: Iterable[Any],
+    func: Callable[[Any], Any],
+    workers: int = 1,
+    on_worker_exit: Callable[[], None] = None,
+) -> Iterator[Any]:
+    """Run func over items on a worker pool, yielding results in input order.
+
+    With one worker this is a plain sequential loop on the calling thread.
+    If the consumer stops early, items not yet started are dropped; only those
+    already running finish before the generator closes.
+    """
+    items: List[Any] = list(items)
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    futures = [Future() for _ in items]
+    work: "queue.Queue" = queue.Queue()
+    for index, item in enumerate(items):
+        work.put((index, item))
+
+    def worker() -> None:
+        try:
+            while True:
+                try:
+                    index, item = work.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    futures[index].set_result(func(item))
+                except BaseException as exc:
+                    futures[index].set_exception(exc)
+        finally:
+            if on_worker_exit:
+                on_worker_exit()
+
+    threads = [
+        threading.Thread(target=worker, name=f"job-monitor-worker-{number}", daemon=True)
+        for number in range(min(workers, len(items)))
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for future in futures:
+            yield future.result()
+    finally:
+        # A consumer that stops early (an exception or close) leaves nothing for workers to start
+        while True:
+            try:
+                work.get_nowait()
+            except queue.Empty:
+                break
+        for thread in threads:
+            thread.join()
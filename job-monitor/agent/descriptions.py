@@ -0,0 +1,158 @@
+"""Content-addressed, compressed store for normalized job descriptions."""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict
+
+from agent.feedback import DEFAULT_DATA_DIR
+
+DEFAULT_DESCRIPTION_DIR = os.getenv(
+    "JOB_DESCRIPTION_DIR",
+    os.path.join(DEFAULT_DATA_DIR, "descriptions"),
+)
+URL_INDEX_FILE = "url_index.json"
+# Reloaded text older than this is re-fetched, so edited postings are re-scored
+DEFAULT_DESCRIPTION_TTL_DAYS = 7
+
+
+def description_sha256(text: str) -> str:
+    """Content address of a normalized description ("" for no text)."""
+    if not text:
+        return ""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DescriptionStore:
+    """Descriptions stored once each as gzip blobs named by their SHA-256.
+
+    Blobs live at <dir>/<sha[:2]>/<sha>.txt.gz and are immutable, so worker
+    threads and concurrent runs can write the same blob without coordination.
+    A url -> sha index lets a posting's text be reloaded without the network
+    until it is ttl_seconds old; index entries without a store time count as expired.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float = None):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.index_path = os.path.join(directory, URL_INDEX_FILE)
+        self.urls: Dict[str, str] = {}
+        self.stored_at: Dict[str, float] = {}
+        self.counters = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "deduplicated": 0, "bytes_written": 0}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._changes = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+        except Exception as exc:
+            print(f"[WARN] Could not load description index {self.index_path}: {exc}")
+            return
+        urls = data.get("urls") if isinstance(data, dict) else None
+        if isinstance(urls, dict):
+            self.urls = {url: sha for url, sha in urls.items() if isinstance(sha, str)}
+        stored_at = data.get("stored_at") if isinstance(data, dict) else None
+        if isinstance(stored_at, dict):
+            self.stored_at = {
+                url: float(when) for url, when in stored_at.items() if url in self.urls and isinstance(when, (int, float))
+            }
+
+    def blob_path(self, sha: str) -> str:
+        return os.path.join(self.directory, sha[:2], f"{sha}.txt.gz")
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+    def put(self, text: str, url: str = "") -> str:
+        """Store text (already normalized) once; returns its sha256."""
+        sha = description_sha256(text)
+        if not sha:
+            return ""
+        path = self.blob_path(sha)
+        if os.path.exists(path):
+            self._count("deduplicated")
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = gzip.compress(text.encode("utf-8"), mtime=0)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._count("writes")
+            self._count("bytes_written", len(data))
+        if url:
+            with self._lock:
+                # Re-storing refreshes the entry's age even when the text is unchanged
+                self.urls[url] = sha
+                self.stored_at[url] = time.time()
+                self._dirty = True
+                self._changes += 1
+        return sha
+
+    def get(self, sha: str) -> str:
+        """Text for a sha256, or None when it was never stored."""
+        path = self.blob_path(sha) if sha else ""
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except Exception as exc:
+            print(f"[WARN] Could not read description {sha}: {exc}")
+            self._count("misses")
+            return None
+        self._count("hits")
+        return text
+
+    def get_for_url(self, url: str) -> str:
+        """Last stored text for a posting URL, or None when missing or older than the TTL."""
+        with self._lock:
+            sha = self.urls.get(url) if url else None
+            if sha and self.ttl_seconds and time.time() - self.stored_at.get(url, 0) > self.ttl_seconds:
+                self.counters["expired"] += 1
+                sha = None
+        if not sha:
+            return None
+        return self.get(sha)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters, urls=len(self.urls))
+
+    def save(self) -> None:
+        """Atomically persist the url index if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload: Dict[str, Any] = {
+                "urls": dict(sorted(self.urls.items())),
+                "stored_at": {url: round(self.stored_at[url]) for url in sorted(self.stored_at)},
+            }
+            changes = self._changes
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, indent=0, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+        with self._lock:
+            if self._changes == changes:
+                self._dirty = False
+
+
+def load_description_store(directory: str = DEFAULT_DESCRIPTION_DIR) -> DescriptionStore:
+    """Description store; JOB_DESCRIPTION_TTL_DAYS=0 reloads stored text regardless of age."""
+    try:
+        ttl_days = max(0.0, float(os.getenv("JOB_DESCRIPTION_TTL_DAYS", DEFAULT_DESCRIPTION_TTL_DAYS)))
+    except (TypeError, ValueError):
+        ttl_days = DEFAULT_DESCRIPTION_TTL_DAYS
+    return DescriptionStore(directory, ttl_seconds=ttl_days * 86400 if ttl_days else None)
@@ -4,6 +4,9 @@ import json
 import os
 from typing import Any, Dict, List
 
+from agent.job import job_text
+from agent.rule_matcher import SubstringMatcher, TextScan
+from agent.verification import apply_verification_caps
 from ai.analyzer import fit_tier_for_score
 
 DEFAULT_DATA_DIR = os.getenv("JOB_AGENT_DATA_DIR", "data")
@@ -67,16 +70,21 @@ def load_feedback(path: str = DEFAULT_FEEDBACK_FILE, create: bool = True) -> Dic
     feedback.setdefault("rules", [])
     feedback.setdefault("company_adjustments", {})
     feedback.setdefault("labels", sorted(VALID_LABELS))
+    feedback["_compiled_rules"] = CompiledRules(feedback["rules"])
     return feedback
 
 
 def save_feedback(feedback: Dict[str, Any], path: str = DEFAULT_FEEDBACK_FILE) -> None:
-    """Persist feedback, creating the data directory as needed."""
+    """Persist feedback, creating the data directory as needed.
+
+    Underscore keys (such as the compiled rule index) are runtime-only.
+    """
     directory = os.path.dirname(path)
     if directory:
         os.makedirs(directory, exist_ok=True)
+    persisted = {key: value for key, value in feedback.items() if not str(key).startswith("_")}
     with open(path, "w") as f:
-        json.dump(feedback, f, indent=2, sort_keys=True)
+        json.dump(persisted, f, indent=2, sort_keys=True)
 
 
 def _as_list(value: Any) -> List[str]:
@@ -99,11 +107,11 @@ def _matches_rule(job: Dict[str, Any], rule: Dict[str, Any]) -> bool:
     if not isinstance(rule, dict):
         return False
 
-    company = str(job.get("company", "") or "")
-    title = str(job.get("title", "") or "")
-    location = str(job.get("location", "") or "")
-    url = str(job.get("url", "") or "")
-    description = str(job.get("description", "") or "")
+    company = job_text(job, "company")
+    title = job_text(job, "title")
+    location = job_text(job, "location")
+    url = job_text(job, "url")
+    description = job_text(job, "description")
 
     if rule.get("company") and str(rule["company"]).lower() != company.lower():
         return False
@@ -118,6 +126,102 @@ def _matches_rule(job: Dict[str, Any], rule: Dict[str, Any]) -> bool:
     return True
 
 
+_RULE_FIELDS = (
+    ("title", "title_contains"),
+    ("location", "location_contains"),
+    ("url", "url_contains"),
+    ("description", "description_contains"),
+)
+
+
+class CompiledRules:
+    """Feedback rules indexed once so a job only visits rules that can match.
+
+    Rules are bucketed by company and gated on their first needle in the
+    cheapest field (title before location, URL, description). Every needle
+    of a field goes into one SubstringMatcher, so each field is lowercased
+    once per job and each distinct needle checked at most once. Matches are
+    exactly those of _matches_rule.
+    """
+
+    def __init__(self, rules: List[Any]):
+        self.source = rules
+        self.rules: List[Any] = list(rules) if isinstance(rules, (list, tuple)) else []
+        # Company ("" for any) -> rules without needles, and -> field -> gate needle -> rules
+        self.ungated: Dict[str, List[int]] = {}
+        self.gates: Dict[str, Dict[str, Dict[int, List[int]]]] = {}
+        # Per rule: needle IDs it requires, per field
+        self.requirements: Dict[int, List[tuple]] = {}
+        needle_ids: Dict[str, Dict[str, int]] = {field: {} for field, _ in _RULE_FIELDS}
+
+        for index, rule in enumerate(self.rules):
+            if not isinstance(rule, dict):
+                continue
+            company = str(rule["company"]).lower() if rule.get("company") else ""
+            required = []
+            for field, key in _RULE_FIELDS:
+                ids = needle_ids[field]
+                needles = [ids.setdefault(value.lower(), len(ids)) for value in _as_list(rule.get(key))]
+                if needles:
+                    required.append((field, needles))
+            self.requirements[index] = required
+            if required:
+                field, needles = required[0]
+                gates = self.gates.setdefault(company, {}).setdefault(field, {})
+                gates.setdefault(needles[0], []).append(index)
+            else:
+                self.ungated.setdefault(company, []).append(index)
+
+        self.matchers = {field: SubstringMatcher(ids) for field, ids in needle_ids.items() if ids}
+
+    def is_current(self, rules: Any) -> bool:
+        """Whether these are still the compiled rules; edits inside a rule dict are not noticed."""
+        if self.source is not rules:
+            return False
+        return not isinstance(rules, (list, tuple)) or len(rules) == len(self.rules)
+
+    def matching(self, job: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Rules that match job, in feedback.json order."""
+        company = job_text(job, "company").lower()
+        buckets = [""] if not company else ["", company]
+        scans: Dict[str, TextScan] = {}
+
+        def scan_for(field: str) -> TextScan:
+            scan = scans.get(field)
+            if scan is None:
+                scan = scans[field] = self.matchers[field].scan(job_text(job, field))
+            return scan
+
+        candidates: List[int] = []
+        for bucket in buckets:
+            candidates.extend(self.ungated.get(bucket, []))
+            for field, gates in self.gates.get(bucket, {}).items():
+                scan = scan_for(field)
+                for needle, indexes in gates.items():
+                    if scan.contains(needle):
+                        candidates.extend(indexes)
+
+        matched = []
+        for index in sorted(candidates):
+            for field, needles in self.requirements[index]:
+                scan = scan_for(field)
+                if not all(scan.contains(needle) for needle in needles):
+                    break
+            else:
+                matched.append(self.rules[index])
+        return matched
+
+
+def compiled_rules(feedback: Dict[str, Any]) -> CompiledRules:
+    """The feedback's compiled rules, recompiled if its rule list was replaced or extended."""
+    rules = feedback.get("rules", []) or []
+    compiled = feedback.get("_compiled_rules")
+    if not isinstance(compiled, CompiledRules) or not compiled.is_current(rules):
+        compiled = CompiledRules(rules)
+        feedback["_compiled_rules"] = compiled
+    return compiled
+
+
 def _set_score(job: Dict[str, Any], score: int) -> None:
     score = max(1, min(10, int(score)))
     job["score"] = score
@@ -235,9 +339,9 @@ def apply_feedback_calibration(job: Dict[str, Any], feedback: Dict[str, Any]) ->
         except (TypeError, ValueError):
             pass
 
-    for rule in feedback.get("rules", []) or []:
-        if _matches_rule(job, rule):
-            changes.extend(_apply_rule_action(job, rule))
+    # Rule actions only touch score fields, so matches can be found before applying any
+    for rule in compiled_rules(feedback).matching(job):
+        changes.extend(_apply_rule_action(job, rule))
 
     direct_feedback = (feedback.get("jobs") or {}).get(job["feedback_id"])
     if isinstance(direct_feedback, str):
@@ -261,3 +365,22 @@ def apply_feedback_calibration(job: Dict[str, Any], feedback: Dict[str, Any]) ->
         "applied": changes,
     }
     return job
+
+
+def apply_analysis(job: Dict[str, Any], analysis: Dict[str, Any], feedback: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy an analyzer result onto a job, then apply feedback calibration and verification caps.
+
+    Shared by evaluate_job and replay so live runs and replays score identically.
+    """
+    job["score"] = analysis["score"]
+    job["reason"] = analysis["reason"]
+    job["summary"] = analysis["summary"]
+    job["fit_tier"] = analysis.get("fit_tier", "")
+    job["competitive_angle"] = analysis.get("competitive_angle", "")
+    job["evidence"] = analysis.get("evidence", [])
+    job["concerns"] = analysis.get("concerns", [])
+    job["extraction"] = analysis.get("extraction", {})
+    job["analysis_raw"] = analysis.get("analysis_raw", {})
+    apply_feedback_calibration(job, feedback)
+    apply_verification_caps(job)
+    return job
@@ -0,0 +1,171 @@
+"""Slotted job record with dict-compatible access for the pipeline."""
+
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, List, Mapping
+
+# Posting fields that derived values are computed from; writing one drops the cache
+SOURCE_FIELDS = frozenset({"id", "company", "title", "location", "url", "description"})
+
+
+class Job(MutableMapping):
+    """One posting as it moves from scrape to ledger.
+
+    Known fields live in slots and anything else goes to an overflow dict, so
+    a Job reads and writes like the dicts scrapers return. Derived values
+    (text fields, canonical URL, combined text, hashes) are computed once
+    through derive() and dropped whenever a source field changes.
+    """
+
+    FIELDS = (
+        "id",
+        "company",
+        "title",
+        "location",
+        "url",
+        "description",
+        "description_source",
+        "description_sha256",
+        "feedback_id",
+        "score",
+        "fit_tier",
+        "reason",
+        "summary",
+        "competitive_angle",
+        "evidence",
+        "concerns",
+        "extraction",
+        "analysis_raw",
+        "verification",
+        "url_repair",
+        "calibration",
+    )
+    __slots__ = FIELDS + ("_extra", "_derived")
+
+    id: str
+    company: str
+    title: str
+    location: str
+    url: str
+    description: str
+    description_source: str
+    description_sha256: str
+    feedback_id: str
+    score: int
+    fit_tier: str
+    reason: str
+    summary: str
+    competitive_angle: str
+    evidence: List[str]
+    concerns: List[str]
+    extraction: Dict[str, Any]
+    analysis_raw: Dict[str, Any]
+    verification: Dict[str, Any]
+    url_repair: Dict[str, Any]
+    calibration: Dict[str, Any]
+
+    def __init__(self, data: Mapping[str, Any] = None, **fields: Any):
+        object.__setattr__(self, "_extra", {})
+        object.__setattr__(self, "_derived", {})
+        for source in (data or {}, fields):
+            for key, value in source.items():
+                self[key] = value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in SOURCE_FIELDS:
+            self._derived.clear()
+
+    def __delattr__(self, name: str) -> None:
+        object.__delattr__(self, name)
+        if name in SOURCE_FIELDS:
+            self._derived.clear()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _SLOTTED:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _SLOTTED:
+            setattr(self, key, value)
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _SLOTTED:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        if key in _SLOTTED:
+            return hasattr(self, key)
+        return key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self.FIELDS:
+            if hasattr(self, field):
+                yield field
+        yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for field in self.FIELDS if hasattr(self, field)) + len(self._extra)
+
+    def __reduce__(self):
+        # Rebuild through __init__ so copies and pickles start with an empty derived cache
+        return (Job, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return f"Job({self.to_dict()!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _SLOTTED:
+            return getattr(self, key, default)
+        return self._extra.get(key, default)
+
+    def copy(self) -> "Job":
+        return Job(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def derive(self, name: str, compute: Callable[["Job"], Any]) -> Any:
+        """Memoized compute(self); only valid for values built from SOURCE_FIELDS."""
+        try:
+            return self._derived[name]
+        except KeyError:
+            value = self._derived[name] = compute(self)
+            return value
+
+    def text(self, field: str) -> str:
+        """The field as a string, "" when missing or empty."""
+        if field not in SOURCE_FIELDS:
+            return str(self.get(field, "") or "")
+        return self.derive(field, lambda job: str(job.get(field, "") or ""))
+
+
+_SLOTTED = frozenset(Job.FIELDS)
+
+
+def as_job(data: Mapping[str, Any]) -> Job:
+    return data if isinstance(data, Job) else Job(data)
+
+
+def job_text(job: Mapping[str, Any], field: str) -> str:
+    """str(job.get(field, "") or ""), cached on a Job."""
+    if isinstance(job, Job):
+        return job.text(field)
+    return str(job.get(field, "") or "")
+
+
+def derived(job: Mapping[str, Any], name: str, compute: Callable[[Mapping[str, Any]], Any]) -> Any:
+    """compute(job), cached on a Job until one of its source fields changes."""
+    if isinstance(job, Job):
+        return job.derive(name, compute)
+    return compute(job)
@@ -1,13 +1,19 @@
 """Persistent job-agent ledger and run audit storage."""
 
-import hashlib
 import json
 import os
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
+from agent.descriptions import description_sha256
 from agent.feedback import DEFAULT_DATA_DIR, feedback_id
+from agent.job import derived, job_text
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes still batch, just without the advisory lock
+    fcntl = None
 
 DEFAULT_LEDGER_FILE = os.getenv(
     "JOB_LEDGER_FILE",
@@ -27,11 +33,16 @@ def new_run_id() -> str:
     return str(uuid.uuid4())
 
 
-def description_hash(job: Dict[str, Any]) -> str:
-    description = str(job.get("description", "") or "")
+def job_description_sha256(job: Dict[str, Any]) -> str:
+    """Address of the job's text in the description store."""
+    description = job_text(job, "description")
     if not description:
-        return ""
-    return hashlib.sha256(description.encode("utf-8")).hexdigest()[:16]
+        return str(job.get("description_sha256", "") or "")
+    return derived(job, "description_sha256", lambda job: description_sha256(description))
+
+
+def description_hash(job: Dict[str, Any]) -> str:
+    return job_description_sha256(job)[:16]
 
 
 def ledger_entry(job: Dict[str, Any], run_id: str, sent_in_email: bool) -> Dict[str, Any]:
@@ -45,6 +56,7 @@ def ledger_entry(job: Dict[str, Any], run_id: str, sent_in_email: bool) -> Dict[
         "location": job.get("location", ""),
         "url": job.get("url", ""),
         "description_hash": description_hash(job),
+        "description_sha256": job_description_sha256(job),
         "description_source": job.get("description_source", ""),
         "score": job.get("score"),
         "fit_tier": job.get("fit_tier", ""),
@@ -54,6 +66,7 @@ def ledger_entry(job: Dict[str, Any], run_id: str, sent_in_email: bool) -> Dict[
         "evidence": job.get("evidence", []),
         "concerns": job.get("concerns", []),
         "extraction": job.get("extraction", {}),
+        "analysis_raw": job.get("analysis_raw", {}),
         "verification": job.get("verification", {}),
         "url_repair": job.get("url_repair", {}),
         "calibration": job.get("calibration", {}),
@@ -61,12 +74,104 @@ def ledger_entry(job: Dict[str, Any], run_id: str, sent_in_email: bool) -> Dict[
     }
 
 
-def append_jsonl(record: Dict[str, Any], path: str) -> None:
+def email_selection_record(run_id: str, feedback_ids: Iterable[str]) -> Dict[str, Any]:
+    """Follow-up to streamed entries, which are written provisionally as not sent."""
+    return {
+        "record_type": "email_selection",
+        "run_id": run_id,
+        "recorded_at": now_iso(),
+        "feedback_ids": sorted(feedback_ids),
+    }
+
+
+def apply_email_selections(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fold email_selection records into the entries of their run and drop them."""
+    entries = []
+    selected: Dict[str, set] = {}
+    for record in records:
+        if record.get("record_type") == "email_selection":
+            selected.setdefault(record.get("run_id", ""), set()).update(record.get("feedback_ids", []))
+        else:
+            entries.append(record)
+    for entry in entries:
+        if entry.get("feedback_id") in selected.get(entry.get("run_id", ""), ()):
+            entry["sent_in_email"] = True
+    return entries
+
+
+def _jsonl_line(record: Dict[str, Any]) -> str:
+    return json.dumps(record, sort_keys=True) + "\n"
+
+
+def append_locked(path: str, payload: bytes) -> int:
+    """Append bytes under an exclusive flock with one fsync; returns the offset written at."""
     directory = os.path.dirname(path)
     if directory:
         os.makedirs(directory, exist_ok=True)
-    with open(path, "a") as f:
-        f.write(json.dumps(record, sort_keys=True) + "\n")
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        offset = os.fstat(fd).st_size
+        view = memoryview(payload)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        os.fsync(fd)
+        return offset
+    finally:
+        # Closing the descriptor also releases the lock
+        os.close(fd)
+
+
+def write_jsonl_lines(path: str, lines: List[str]) -> None:
+    """Append complete lines in one locked write so concurrent runs never interleave."""
+    if lines:
+        append_locked(path, "".join(lines).encode("utf-8"))
+
+
+def append_jsonl(record: Dict[str, Any], path: str) -> None:
+    write_jsonl_lines(path, [_jsonl_line(record)])
+
+
+class LedgerWriter:
+    """Buffer JSONL records per file and write each file in one locked batch.
+
+    Use as a context manager, or call flush() explicitly; records buffered
+    when an exception escapes the with-block are still written.
+    """
+
+    def __init__(self):
+        self._buffers: Dict[str, List[str]] = {}
+        self.flushes = 0
+        self.records_written = 0
+
+    def add(self, record: Dict[str, Any], path: str) -> None:
+        self._buffers.setdefault(path, []).append(_jsonl_line(record))
+
+    def pending(self) -> int:
+        return sum(len(lines) for lines in self._buffers.values())
+
+    def flush(self) -> int:
+        """Write every buffered file; returns records written."""
+        written = 0
+        while self._buffers:
+            path, lines = next(iter(self._buffers.items()))
+            write_jsonl_lines(path, lines)
+            del self._buffers[path]
+            written += len(lines)
+            self.flushes += 1
+        self.records_written += written
+        return written
+
+    def stats(self) -> Dict[str, int]:
+        return {"flushes": self.flushes, "records": self.records_written}
+
+    def __enter__(self) -> "LedgerWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.flush()
 
 
 def append_ledger_entry(
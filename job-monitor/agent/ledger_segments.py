@@ -0,0 +1,328 @@
+"""Segmented, gzip-compressed ledger with a seekable sidecar index.
+
+Each flush appends one gzip member to the active segment, so a batch can be
+read back by seeking to its offset and inflating only that member. Segments
+rotate monthly or by size, and compaction folds closed segments into a
+latest-state-per-job snapshot.
+
+Usage:
+    python -m agent.ledger_segments compact
+    python -m agent.ledger_segments rebuild-index
+    python -m agent.ledger_segments export job_ledger.jsonl [run_audits.jsonl]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from agent.feedback import DEFAULT_DATA_DIR
+from agent.ledger import (
+    DEFAULT_LEDGER_FILE,
+    DEFAULT_RUN_AUDIT_FILE,
+    append_locked,
+    apply_email_selections,
+    email_selection_record,
+)
+from agent.ledger_store import LedgerBackend, _read_jsonl
+
+DEFAULT_SEGMENT_DIR = os.getenv(
+    "JOB_LEDGER_SEGMENT_DIR",
+    os.path.join(DEFAULT_DATA_DIR, "ledger_segments"),
+)
+DEFAULT_SEGMENT_MAX_BYTES = 8 * 1024 * 1024
+INDEX_FILE = "index.jsonl"
+META_FILE = "meta.json"
+SNAPSHOT_FILE = "snapshot.jsonl.gz"
+ENTRY_PREFIX = "ledger"
+AUDIT_PREFIX = "audits"
+# Records per member when writing imports and snapshots, so reads stay seekable
+MEMBER_RECORDS = 500
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def encode_member(records: List[Dict[str, Any]]) -> bytes:
+    payload = "".join(json.dumps(record, sort_keys=True) + "\n" for record in records)
+    return gzip.compress(payload.encode("utf-8"), mtime=0)
+
+
+def _parse_lines(payload: bytes) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in payload.decode("utf-8").splitlines() if line.strip()]
+
+
+def iter_members(path: str) -> Iterator[Tuple[int, int, List[Dict[str, Any]]]]:
+    """Walk a multi-member gzip file, yielding (offset, length, records) per member."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset < len(data):
+        inflater = zlib.decompressobj(wbits=31)
+        try:
+            payload = inflater.decompress(data[offset:])
+        except zlib.error as e:
+            print(f"[WARN] Stopping at unreadable member at {path}:{offset}: {e}")
+            return
+        if not inflater.eof:
+            print(f"[WARN] Ignoring truncated member at {path}:{offset}")
+            return
+        length = len(data) - offset - len(inflater.unused_data)
+        yield offset, length, _parse_lines(payload)
+        offset += length
+
+
+def read_member(path: str, offset: int, length: int) -> List[Dict[str, Any]]:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return _parse_lines(zlib.decompress(f.read(length), wbits=31))
+
+
+def _index_line(segment: str, offset: int, length: int, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    feedback_ids = set()
+    run_ids = set()
+    for record in records:
+        run_ids.add(record.get("run_id", ""))
+        if record.get("record_type") == "email_selection":
+            # Selection records are found by the jobs they mark as sent
+            feedback_ids.update(record.get("feedback_ids", []))
+        else:
+            feedback_ids.add(record.get("feedback_id", ""))
+    return {
+        "segment": segment,
+        "offset": offset,
+        "length": length,
+        "records": len(records),
+        "feedback_ids": sorted(feedback_ids),
+        "run_ids": sorted(run_ids),
+    }
+
+
+def _latest_key(entry: Dict[str, Any]) -> str:
+    return str(entry.get("evaluated_at", ""))
+
+
+class SegmentedLedger(LedgerBackend):
+    """Ledger entries and run audits in rotated multi-member gzip segments.
+
+    index.jsonl maps every entry member to the feedback_ids and run_ids it
+    holds, so job and run lookups inflate only the members they need.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_SEGMENT_DIR,
+        max_segment_bytes: int = None,
+        import_ledger_path: str = DEFAULT_LEDGER_FILE,
+        import_audit_path: str = DEFAULT_RUN_AUDIT_FILE,
+        clock: Callable[[], datetime] = None,
+    ):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes or _env_int(
+            "JOB_LEDGER_SEGMENT_MAX_BYTES", DEFAULT_SEGMENT_MAX_BYTES
+        )
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self._pending_entries: List[Dict[str, Any]] = []
+        self._pending_audits: List[Dict[str, Any]] = []
+        self.flushes = 0
+        self.records_written = 0
+        os.makedirs(directory, exist_ok=True)
+        self._import_jsonl(import_ledger_path, import_audit_path)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _import_jsonl(self, ledger_path: str, audit_path: str) -> None:
+        meta_path = self._path(META_FILE)
+        if os.path.exists(meta_path):
+            return
+        entries = apply_email_selections(_read_jsonl(ledger_path))
+        audits = list(_read_jsonl(audit_path))
+        for start in range(0, len(entries), MEMBER_RECORDS):
+            self._append_member(ENTRY_PREFIX, entries[start:start + MEMBER_RECORDS])
+        for start in range(0, len(audits), MEMBER_RECORDS):
+            self._append_member(AUDIT_PREFIX, audits[start:start + MEMBER_RECORDS])
+        with open(meta_path, "w") as f:
+            json.dump({"jsonl_imported": {"entries": len(entries), "run_audits": len(audits)}}, f)
+        if entries or audits:
+            print(f"Imported {len(entries)} ledger entries and {len(audits)} run audits into {self.directory}")
+
+    def segments(self, prefix: str = ENTRY_PREFIX) -> List[str]:
+        return sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(f"{prefix}-") and name.endswith(".jsonl.gz")
+        )
+
+    def _active_segment(self, prefix: str, incoming_bytes: int) -> str:
+        period = self.clock().strftime("%Y%m")
+        existing = self.segments(prefix)
+        if existing:
+            last = existing[-1]
+            _, last_period, last_sequence = last[: -len(".jsonl.gz")].split("-")
+            size = os.path.getsize(self._path(last))
+            if last_period == period and (size == 0 or size + incoming_bytes <= self.max_segment_bytes):
+                return last
+            sequence = int(last_sequence) + 1 if last_period == period else 1
+        else:
+            sequence = 1
+        return f"{prefix}-{period}-{sequence:04d}.jsonl.gz"
+
+    def _append_member(self, prefix: str, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        data = encode_member(records)
+        segment = self._active_segment(prefix, len(data))
+        offset = append_locked(self._path(segment), data)
+        if prefix == ENTRY_PREFIX:
+            line = _index_line(segment, offset, len(data), records)
+            append_locked(self.index_path, (json.dumps(line, sort_keys=True) + "\n").encode("utf-8"))
+
+    def append_entries(self, entries: List[Dict[str, Any]]) -> None:
+        self._pending_entries.extend(entries)
+
+    def append_run_audit(self, audit: Dict[str, Any]) -> None:
+        self._pending_audits.append(audit)
+
+    def record_email_selection(self, run_id: str, feedback_ids: Iterable[str]) -> None:
+        self._pending_entries.append(email_selection_record(run_id, feedback_ids))
+
+    def flush(self) -> None:
+        """Write buffered entries and audits as one gzip member each."""
+        if not self._pending_entries and not self._pending_audits:
+            return
+        self._append_member(ENTRY_PREFIX, self._pending_entries)
+        self._append_member(AUDIT_PREFIX, self._pending_audits)
+        self.records_written += len(self._pending_entries) + len(self._pending_audits)
+        self.flushes += 1
+        self._pending_entries = []
+        self._pending_audits = []
+
+    def stats(self) -> Dict[str, int]:
+        return {"flushes": self.flushes, "records": self.records_written}
+
+    def _index(self) -> List[Dict[str, Any]]:
+        return list(_read_jsonl(self.index_path))
+
+    def _records_from_index(self, key: str, value: str) -> List[Dict[str, Any]]:
+        self.flush()
+        records = []
+        for line in self._index():
+            if value in line.get(key, []):
+                records.extend(read_member(self._path(line["segment"]), line["offset"], line["length"]))
+        return apply_email_selections(records)
+
+    def _raw_records(self) -> Iterator[Dict[str, Any]]:
+        for name in [SNAPSHOT_FILE] + self.segments(ENTRY_PREFIX):
+            for _, _, records in iter_members(self._path(name)):
+                yield from records
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        self.flush()
+        return iter(apply_email_selections(self._raw_records()))
+
+    def iter_run_audits(self) -> Iterator[Dict[str, Any]]:
+        self.flush()
+        for name in self.segments(AUDIT_PREFIX):
+            for _, _, records in iter_members(self._path(name)):
+                yield from records
+
+    def job_history(self, feedback_id: str) -> List[Dict[str, Any]]:
+        entries = [entry for entry in self._records_from_index("feedback_ids", feedback_id)
+                   if entry.get("feedback_id") == feedback_id]
+        return sorted(entries, key=_latest_key)
+
+    def run_entries(self, run_id: str) -> List[Dict[str, Any]]:
+        return [entry for entry in self._records_from_index("run_ids", run_id) if entry.get("run_id") == run_id]
+
+    def rebuild_index(self) -> int:
+        """Rewrite index.jsonl from the segments themselves; returns members indexed."""
+        lines = []
+        for name in [SNAPSHOT_FILE] + self.segments(ENTRY_PREFIX):
+            for offset, length, records in iter_members(self._path(name)):
+                lines.append(_index_line(name, offset, length, records))
+        self._replace_index(lines)
+        return len(lines)
+
+    def _replace_index(self, lines: List[Dict[str, Any]]) -> None:
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            for line in lines:
+                f.write(json.dumps(line, sort_keys=True) + "\n")
+        os.replace(tmp_path, self.index_path)
+
+    def compact(self) -> int:
+        """Fold every closed segment into the snapshot; returns segments folded.
+
+        The snapshot keeps the latest evaluation per feedback_id. Email
+        selections whose entries stay in the active segment are kept there.
+        """
+        self.flush()
+        closed = self.segments(ENTRY_PREFIX)[:-1]
+        if not closed:
+            return 0
+
+        raw = []
+        for name in [SNAPSHOT_FILE] + closed:
+            for _, _, records in iter_members(self._path(name)):
+                raw.extend(records)
+        latest: Dict[str, Dict[str, Any]] = {}
+        for entry in apply_email_selections(raw):
+            key = entry.get("feedback_id", "")
+            if key not in latest or _latest_key(entry) >= _latest_key(latest[key]):
+                latest[key] = entry
+        entries = sorted(latest.values(), key=_latest_key)
+
+        tmp_path = self._path(f"{SNAPSHOT_FILE}.tmp")
+        snapshot_lines = []
+        with open(tmp_path, "wb") as f:
+            for start in range(0, len(entries), MEMBER_RECORDS):
+                records = entries[start:start + MEMBER_RECORDS]
+                data = encode_member(records)
+                snapshot_lines.append(_index_line(SNAPSHOT_FILE, f.tell(), len(data), records))
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        kept_lines = [
+            line for line in self._index()
+            if line.get("segment") != SNAPSHOT_FILE and line.get("segment") not in closed
+        ]
+        os.replace(tmp_path, self._path(SNAPSHOT_FILE))
+        self._replace_index(snapshot_lines + kept_lines)
+        for name in closed:
+            os.remove(self._path(name))
+        return len(closed)
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain the segmented job ledger.")
+    parser.add_argument("--dir", default=DEFAULT_SEGMENT_DIR, help="segment directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("compact", help="fold closed segments into the latest-state snapshot")
+    commands.add_parser("rebuild-index", help="rewrite index.jsonl from the segments")
+    export = commands.add_parser("export", help="write entries (and run audits) as JSONL")
+    export.add_argument("ledger_path")
+    export.add_argument("audit_path", nargs="?")
+    args = parser.parse_args(argv)
+
+    ledger = SegmentedLedger(args.dir)
+    if args.command == "compact":
+        print(f"Folded {ledger.compact()} segment(s) into {SNAPSHOT_FILE}")
+    elif args.command == "rebuild-index":
+        print(f"Indexed {ledger.rebuild_index()} member(s)")
+    else:
+        print(f"Exported {ledger.export_jsonl(args.ledger_path, args.audit_path)} entries to {args.ledger_path}")
+    ledger.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""Pluggable ledger backends with a small query API.
+
+JSONL (the default) keeps the append-only files the workflow commits; the
+SQLite backend indexes the same records for seeks instead of full scans, and
+agent.ledger_segments stores them as compressed, indexed segments.
+"""
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List
+
+from agent.feedback import DEFAULT_DATA_DIR
+from agent.ledger import (
+    DEFAULT_LEDGER_FILE,
+    DEFAULT_RUN_AUDIT_FILE,
+    LedgerWriter,
+    apply_email_selections,
+    email_selection_record,
+)
+
+LEDGER_BACKENDS = ("jsonl", "sqlite", "segments")
+DEFAULT_LEDGER_BACKEND = "jsonl"
+DEFAULT_LEDGER_DB = os.getenv(
+    "JOB_LEDGER_DB",
+    os.path.join(DEFAULT_DATA_DIR, "job_ledger.sqlite3"),
+)
+
+_PERIOD_LENGTHS = {"day": 10, "month": 7, "year": 4}
+
+
+def _score(entry: Dict[str, Any]) -> Any:
+    try:
+        return int(entry.get("score"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _period_key(evaluated_at: str, period: str) -> str:
+    if period not in _PERIOD_LENGTHS:
+        raise ValueError(f"Unknown period '{period}'; expected one of {sorted(_PERIOD_LENGTHS)}")
+    return str(evaluated_at or "")[:_PERIOD_LENGTHS[period]]
+
+
+def _read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    if not path or not os.path.exists(path):
+        return
+    with open(path, "r") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"[WARN] Skipping unreadable line {line_number} in {path}: {e}")
+
+
+def _write_jsonl(path: str, records: Iterator[Dict[str, Any]]) -> int:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    count = 0
+    with open(path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record, sort_keys=True) + "\n")
+            count += 1
+    return count
+
+
+class LedgerBackend:
+    """Shared query API; subclasses override the scans with index lookups where they can."""
+
+    def append_entries(self, entries: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def append_run_audit(self, audit: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def record_email_selection(self, run_id: str, feedback_ids: Iterable[str]) -> None:
+        """Mark a run's provisionally written entries as sent."""
+        raise NotImplementedError
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def iter_run_audits(self) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Make appended records durable."""
+
+    def stats(self) -> Dict[str, int]:
+        return {"flushes": 0, "records": 0}
+
+    def close(self) -> None:
+        self.flush()
+
+    def job_history(self, feedback_id: str) -> List[Dict[str, Any]]:
+        """Every evaluation of one job, oldest first."""
+        entries = [entry for entry in self.iter_entries() if entry.get("feedback_id") == feedback_id]
+        return sorted(entries, key=lambda entry: entry.get("evaluated_at", ""))
+
+    def run_entries(self, run_id: str) -> List[Dict[str, Any]]:
+        """Every entry written by one run, in write order."""
+        return [entry for entry in self.iter_entries() if entry.get("run_id") == run_id]
+
+    def latest_for_description(self, description_hash: str) -> Dict[str, Any]:
+        """Most recent evaluation of a description, or None."""
+        latest = None
+        for entry in self.iter_entries():
+            if description_hash and entry.get("description_hash") == description_hash:
+                if latest is None or entry.get("evaluated_at", "") >= latest.get("evaluated_at", ""):
+                    latest = entry
+        return latest
+
+    def company_runs(self, company: str) -> List[Dict[str, Any]]:
+        """Per-run summary for one company: jobs evaluated, best score, jobs emailed."""
+        runs: Dict[str, Dict[str, Any]] = {}
+        for entry in self.iter_entries():
+            if entry.get("company") != company:
+                continue
+            run = runs.setdefault(
+                entry.get("run_id", ""),
+                {"run_id": entry.get("run_id", ""), "evaluated_at": entry.get("evaluated_at", ""),
+                 "jobs": 0, "max_score": None, "sent_in_email": 0},
+            )
+            if entry.get("evaluated_at", "") < run["evaluated_at"]:
+                run["evaluated_at"] = entry.get("evaluated_at", "")
+            run["jobs"] += 1
+            score = _score(entry)
+            if score is not None and (run["max_score"] is None or score > run["max_score"]):
+                run["max_score"] = score
+            run["sent_in_email"] += 1 if entry.get("sent_in_email") else 0
+        return sorted(runs.values(), key=lambda run: run["evaluated_at"])
+
+    def score_distribution(self, since: str = None, period: str = "day") -> Dict[str, Dict[int, int]]:
+        """{period: {score: count}} for evaluations at or after since (ISO timestamp)."""
+        distribution: Dict[str, Dict[int, int]] = {}
+        for entry in self.iter_entries():
+            evaluated_at = entry.get("evaluated_at", "")
+            score = _score(entry)
+            if score is None or (since and evaluated_at < since):
+                continue
+            bucket = distribution.setdefault(_period_key(evaluated_at, period), {})
+            bucket[score] = bucket.get(score, 0) + 1
+        return dict(sorted(distribution.items()))
+
+    def export_jsonl(self, ledger_path: str, audit_path: str = None) -> int:
+        """Write all entries (and run audits) as JSONL; returns entries written."""
+        count = _write_jsonl(ledger_path, self.iter_entries())
+        if audit_path:
+            _write_jsonl(audit_path, self.iter_run_audits())
+        return count
+
+
+class JsonlLedger(LedgerBackend):
+    """The original append-only files; queries are full scans.
+
+    Appends are buffered by a LedgerWriter until flush() or close().
+    """
+
+    def __init__(self, ledger_path: str = DEFAULT_LEDGER_FILE, audit_path: str = DEFAULT_RUN_AUDIT_FILE):
+        self.ledger_path = ledger_path
+        self.audit_path = audit_path
+        self.writer = LedgerWriter()
+
+    def append_entries(self, entries: List[Dict[str, Any]]) -> None:
+        for entry in entries:
+            self.writer.add(entry, self.ledger_path)
+
+    def append_run_audit(self, audit: Dict[str, Any]) -> None:
+        self.writer.add(audit, self.audit_path)
+
+    def record_email_selection(self, run_id: str, feedback_ids: Iterable[str]) -> None:
+        self.writer.add(email_selection_record(run_id, feedback_ids), self.ledger_path)
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return self.writer.stats()
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        self.flush()
+        return iter(apply_email_selections(_read_jsonl(self.ledger_path)))
+
+    def iter_run_audits(self) -> Iterator[Dict[str, Any]]:
+        self.flush()
+        return _read_jsonl(self.audit_path)
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    evaluated_at TEXT NOT NULL,
+    feedback_id TEXT NOT NULL,
+    company TEXT NOT NULL,
+    description_hash TEXT NOT NULL,
+    score INTEGER,
+    sent_in_email INTEGER NOT NULL DEFAULT 0,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ledger_feedback_id ON ledger (feedback_id, evaluated_at);
+CREATE INDEX IF NOT EXISTS ledger_run_id ON ledger (run_id);
+CREATE INDEX IF NOT EXISTS ledger_company ON ledger (company, run_id);
+CREATE INDEX IF NOT EXISTS ledger_description_hash ON ledger (description_hash, evaluated_at);
+CREATE INDEX IF NOT EXISTS ledger_evaluated_at ON ledger (evaluated_at);
+CREATE TABLE IF NOT EXISTS run_audits (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS run_audits_run_id ON run_audits (run_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SqliteLedger(LedgerBackend):
+    """Indexed on feedback_id, run_id, company, description_hash and evaluated_at.
+
+    Full records are kept as JSON next to the indexed columns, so exports
+    round-trip exactly. Existing JSONL files are imported on first open.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_LEDGER_DB,
+        import_ledger_path: str = DEFAULT_LEDGER_FILE,
+        import_audit_path: str = DEFAULT_RUN_AUDIT_FILE,
+    ):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SQLITE_SCHEMA)
+        self._pending_entries: List[Dict[str, Any]] = []
+        self._pending_audits: List[Dict[str, Any]] = []
+        self.flushes = 0
+        self.records_written = 0
+        self._import_jsonl(import_ledger_path, import_audit_path)
+
+    def _import_jsonl(self, ledger_path: str, audit_path: str) -> None:
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = 'jsonl_imported'").fetchone():
+            return
+        entries = apply_email_selections(_read_jsonl(ledger_path))
+        audits = list(_read_jsonl(audit_path))
+        with self.conn:
+            self._insert_entries(entries)
+            self._insert_audits(audits)
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('jsonl_imported', ?)",
+                (json.dumps({"entries": len(entries), "run_audits": len(audits)}),),
+            )
+        if entries or audits:
+            print(f"Imported {len(entries)} ledger entries and {len(audits)} run audits into {self.path}")
+
+    def _insert_entries(self, entries: List[Dict[str, Any]]) -> None:
+        self.conn.executemany(
+            "INSERT INTO ledger (run_id, evaluated_at, feedback_id, company, description_hash, score, "
+            "sent_in_email, record) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    str(entry.get("run_id", "")),
+                    str(entry.get("evaluated_at", "")),
+                    str(entry.get("feedback_id", "")),
+                    str(entry.get("company", "")),
+                    str(entry.get("description_hash", "")),
+                    _score(entry),
+                    1 if entry.get("sent_in_email") else 0,
+                    json.dumps(entry, sort_keys=True),
+                )
+                for entry in entries
+            ],
+        )
+
+    def _insert_audits(self, audits: List[Dict[str, Any]]) -> None:
+        self.conn.executemany(
+            "INSERT INTO run_audits (run_id, started_at, record) VALUES (?, ?, ?)",
+            [
+                (str(audit.get("run_id", "")), str(audit.get("started_at", "")), json.dumps(audit, sort_keys=True))
+                for audit in audits
+            ],
+        )
+
+    def append_entries(self, entries: List[Dict[str, Any]]) -> None:
+        self._pending_entries.extend(entries)
+
+    def append_run_audit(self, audit: Dict[str, Any]) -> None:
+        self._pending_audits.append(audit)
+
+    def record_email_selection(self, run_id: str, feedback_ids: Iterable[str]) -> None:
+        feedback_ids = set(feedback_ids)
+        if not feedback_ids:
+            return
+        rows = self._execute("SELECT id, feedback_id, record FROM ledger WHERE run_id = ?", (run_id,)).fetchall()
+        updates = []
+        for row_id, feedback_id, record in rows:
+            if feedback_id in feedback_ids:
+                entry = json.loads(record)
+                entry["sent_in_email"] = True
+                updates.append((json.dumps(entry, sort_keys=True), row_id))
+        with self.conn:
+            self.conn.executemany("UPDATE ledger SET sent_in_email = 1, record = ? WHERE id = ?", updates)
+        self.flushes += 1
+
+    def flush(self) -> None:
+        """Insert everything buffered in one transaction."""
+        if not self._pending_entries and not self._pending_audits:
+            return
+        with self.conn:
+            self._insert_entries(self._pending_entries)
+            self._insert_audits(self._pending_audits)
+        self.records_written += len(self._pending_entries) + len(self._pending_audits)
+        self.flushes += 1
+        self._pending_entries = []
+        self._pending_audits = []
+
+    def stats(self) -> Dict[str, int]:
+        return {"flushes": self.flushes, "records": self.records_written}
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        self.flush()
+        return self.conn.execute(sql, params)
+
+    def _records(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        return [json.loads(row[0]) for row in self._execute(sql, params)]
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        for (record,) in self._execute("SELECT record FROM ledger ORDER BY id"):
+            yield json.loads(record)
+
+    def iter_run_audits(self) -> Iterator[Dict[str, Any]]:
+        for (record,) in self._execute("SELECT record FROM run_audits ORDER BY id"):
+            yield json.loads(record)
+
+    def job_history(self, feedback_id: str) -> List[Dict[str, Any]]:
+        return self._records(
+            "SELECT record FROM ledger WHERE feedback_id = ? ORDER BY evaluated_at, id",
+            (feedback_id,),
+        )
+
+    def run_entries(self, run_id: str) -> List[Dict[str, Any]]:
+        return self._records("SELECT record FROM ledger WHERE run_id = ? ORDER BY id", (run_id,))
+
+    def latest_for_description(self, description_hash: str) -> Dict[str, Any]:
+        if not description_hash:
+            return None
+        records = self._records(
+            "SELECT record FROM ledger WHERE description_hash = ? ORDER BY evaluated_at DESC, id DESC LIMIT 1",
+            (description_hash,),
+        )
+        return records[0] if records else None
+
+    def company_runs(self, company: str) -> List[Dict[str, Any]]:
+        rows = self._execute(
+            "SELECT run_id, MIN(evaluated_at), COUNT(*), MAX(score), SUM(sent_in_email) "
+            "FROM ledger WHERE company = ? GROUP BY run_id ORDER BY MIN(evaluated_at)",
+            (company,),
+        )
+        return [
+            {"run_id": run_id, "evaluated_at": evaluated_at, "jobs": jobs, "max_score": max_score, "sent_in_email": sent}
+            for run_id, evaluated_at, jobs, max_score, sent in rows
+        ]
+
+    def score_distribution(self, since: str = None, period: str = "day") -> Dict[str, Dict[int, int]]:
+        length = len(_period_key("0000-00-00", period))
+        rows = self._execute(
+            "SELECT substr(evaluated_at, 1, ?), score, COUNT(*) FROM ledger "
+            "WHERE score IS NOT NULL AND evaluated_at >= ? GROUP BY 1, 2 ORDER BY 1, 2",
+            (length, since or ""),
+        )
+        distribution: Dict[str, Dict[int, int]] = {}
+        for bucket, score, count in rows:
+            distribution.setdefault(bucket, {})[score] = count
+        return distribution
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self.conn.close()
+
+
+def ledger_streaming() -> bool:
+    """Opt in (JOB_LEDGER_STREAMING=1) to write entries as companies finish rather than once after the email.
+
+    Streamed runs write every entry as not sent and append an email_selection
+    record afterwards; readers in this package fold those records back in,
+    but external consumers of job_ledger.jsonl must skip them.
+    """
+    return os.getenv("JOB_LEDGER_STREAMING", "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def open_ledger(backend: str = None) -> LedgerBackend:
+    """Open the configured backend (JOB_LEDGER_BACKEND=jsonl|sqlite|segments)."""
+    backend = (backend or os.getenv("JOB_LEDGER_BACKEND", DEFAULT_LEDGER_BACKEND)).strip().lower()
+    if backend == "sqlite":
+        return SqliteLedger()
+    if backend == "segments":
+        # Imported here because ledger_segments builds on this module
+        from agent.ledger_segments import SegmentedLedger
+
+        return SegmentedLedger()
+    if backend != "jsonl":
+        print(f"[WARN] Unknown JOB_LEDGER_BACKEND '{backend}', using {DEFAULT_LEDGER_BACKEND}")
+    return JsonlLedger()
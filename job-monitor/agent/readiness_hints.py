@@ -0,0 +1,132 @@
+"""Per-company page-readiness hints learned from past Playwright loads.
+
+Each readiness wait reports when its probe last changed (settled_ms). The
+store keeps a moving average of that per company and derives a tighter
+deadline from it once a company has a few runs, so a slow board keeps the
+full deadline while a quick one stops waiting early on the pages where no
+other signal fires. Static overrides stay in companies.py:
+
+    {"name": ..., "ready_selector": ".job-list a", "ready_deadline_ms": 8000}
+"""
+
+import json
+import os
+import threading
+from collections import Counter
+from typing import Any, Dict
+
+from agent.feedback import DEFAULT_DATA_DIR
+from scrapers.readiness import DEFAULT_STABLE_MS, ReadinessPlan
+
+DEFAULT_READINESS_HINTS_FILE = os.getenv(
+    "JOB_READINESS_HINTS_FILE",
+    os.path.join(DEFAULT_DATA_DIR, "readiness_hints.json"),
+)
+SETTLED_ALPHA = 0.3
+MIN_LEARNING_RUNS = 2
+MIN_LEARNED_DEADLINE_MS = 2_000
+
+
+class ReadinessHints:
+    """JSON-backed settle times per company, shared safely by worker threads."""
+
+    def __init__(self, path: str = DEFAULT_READINESS_HINTS_FILE):
+        self.path = path
+        self.counters = {"waits": 0, "wait_ms": 0, "deadline_hits": 0}
+        self.signals = Counter()
+        self._companies: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except Exception as exc:
+            print(f"[WARN] Could not load readiness hints {self.path}: {exc}")
+            return
+        companies = data.get("companies") if isinstance(data, dict) else None
+        if isinstance(companies, dict):
+            self._companies = {name: hint for name, hint in companies.items() if isinstance(hint, dict)}
+
+    def hint(self, name: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._companies.get(name) or {})
+
+    def learned_deadline_ms(self, name: str, hard_deadline_ms: int) -> int:
+        """Twice the usual settle time plus a stability window, within [2s, hard deadline]."""
+        hint = self.hint(name)
+        settled = hint.get("settled_ms")
+        if settled is None or hint.get("runs", 0) < MIN_LEARNING_RUNS:
+            return hard_deadline_ms
+        deadline = int(2 * float(settled) + 2 * DEFAULT_STABLE_MS)
+        return max(min(MIN_LEARNED_DEADLINE_MS, hard_deadline_ms), min(deadline, hard_deadline_ms))
+
+    def plan_for(self, company: Dict[str, Any]) -> ReadinessPlan:
+        """Readiness plan for a company: its static overrides, else the learned deadline."""
+        name = company.get("name", "")
+        hard = ReadinessPlan().deadline_ms
+        deadline = company.get("ready_deadline_ms")
+        if deadline is None:
+            deadline = self.learned_deadline_ms(name, hard)
+        return ReadinessPlan(
+            selector=company.get("ready_selector", ""),
+            deadline_ms=int(deadline),
+            on_result=lambda result: self.record(name, result),
+        )
+
+    def record(self, name: str, result: Dict[str, Any]) -> None:
+        signal = result.get("signal", "")
+        settled = float(result.get("settled_ms", 0))
+        with self._lock:
+            self.counters["waits"] += 1
+            self.counters["wait_ms"] += int(result.get("elapsed_ms", 0))
+            self.signals[signal] += 1
+            if signal == "deadline":
+                self.counters["deadline_hits"] += 1
+            empty = not result.get("value")
+            if empty and signal != "deadline":
+                # Nothing loaded, so there is no settle time to learn from
+                return
+            hint = self._companies.setdefault(name, {"runs": 0})
+            hint["runs"] = hint.get("runs", 0) + 1
+            hint["last_signal"] = signal
+            self._dirty = True
+            if signal == "deadline" and (empty or settled >= result.get("deadline_ms", 0) - DEFAULT_STABLE_MS):
+                # Empty or still changing when time ran out: the learned deadline was too tight
+                hint.pop("settled_ms", None)
+                hint["runs"] = 0
+            elif hint.get("settled_ms") is None:
+                hint["settled_ms"] = round(settled)
+            else:
+                hint["settled_ms"] = round(SETTLED_ALPHA * settled + (1 - SETTLED_ALPHA) * hint["settled_ms"])
+
+    def save(self) -> None:
+        """Atomically persist the hints if they changed."""
+        with self._lock:
+            if not self._dirty or not self.path:
+                return
+            payload = {"companies": {name: dict(hint) for name, hint in self._companies.items()}}
+            self._dirty = False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            learned = sum(
+                1 for hint in self._companies.values()
+                if hint.get("settled_ms") is not None and hint.get("runs", 0) >= MIN_LEARNING_RUNS
+            )
+            return dict(self.counters, signals=dict(self.signals), learned=learned)
+
+
+def load_readiness_hints(path: str = DEFAULT_READINESS_HINTS_FILE) -> ReadinessHints:
+    return ReadinessHints(path)
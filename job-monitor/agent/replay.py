@@ -0,0 +1,204 @@
+"""Offline re-scoring of ledger history with the current caps and feedback rules.
+
+Replays each entry's stored raw analyzer fields through _normalize_result,
+apply_feedback_calibration and apply_verification_caps, with no Gemini calls
+or network, and reports how scores and fit tiers would change.
+
+Usage:
+    python -m agent.replay [--backend sqlite] [--feedback data/feedback.json] [--latest] [--since 2026-01-01]
+"""
+
+import argparse
+import json
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from agent.descriptions import DescriptionStore, load_description_store
+from agent.feedback import DEFAULT_FEEDBACK_FILE, apply_analysis, load_feedback
+from agent.ledger_store import LEDGER_BACKENDS, open_ledger
+from ai.analyzer import _fallback, _normalize_result
+
+# Entry fields that were never rewritten by caps or calibration
+_PASSTHROUGH_FIELDS = ("reason", "summary", "competitive_angle")
+
+
+class ReplayReport:
+    """Score and tier diff counts between recorded and replayed evaluations."""
+
+    def __init__(self, max_examples: int = 10):
+        self.max_examples = max_examples
+        self.counts = Counter()
+        self.tier_changes = Counter()
+        self.examples: List[Dict[str, Any]] = []
+
+    def skip(self, reason: str) -> None:
+        self.counts["entries"] += 1
+        self.counts[f"skipped_{reason}"] += 1
+
+    def record(self, entry: Dict[str, Any], replayed: Dict[str, Any]) -> None:
+        self.counts["entries"] += 1
+        self.counts["replayed"] += 1
+        old_score, new_score = entry.get("score"), replayed.get("score")
+        old_tier, new_tier = entry.get("fit_tier", ""), replayed.get("fit_tier", "")
+        if old_score == new_score and old_tier == new_tier:
+            self.counts["unchanged"] += 1
+            return
+        if old_score != new_score:
+            self.counts["score_changed"] += 1
+            self.counts["score_raised" if (new_score or 0) > (old_score or 0) else "score_lowered"] += 1
+        if old_tier != new_tier:
+            self.counts["tier_changed"] += 1
+            self.tier_changes[(old_tier, new_tier)] += 1
+        if len(self.examples) < self.max_examples:
+            self.examples.append({
+                "feedback_id": entry.get("feedback_id", ""),
+                "run_id": entry.get("run_id", ""),
+                "title": entry.get("title", ""),
+                "score": [old_score, new_score],
+                "fit_tier": [old_tier, new_tier],
+                "calibration": (replayed.get("calibration") or {}).get("applied", []),
+            })
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "counts": dict(sorted(self.counts.items())),
+            "tier_changes": {f"{old} -> {new}": count for (old, new), count in self.tier_changes.most_common()},
+            "examples": self.examples,
+        }
+
+    def lines(self) -> List[str]:
+        counts = self.counts
+        lines = [
+            f"Replayed {counts['replayed']} of {counts['entries']} entries: "
+            f"{counts['score_changed']} score changes ({counts['score_raised']} up, {counts['score_lowered']} down), "
+            f"{counts['tier_changed']} tier changes"
+        ]
+        skipped = {key[len("skipped_"):]: value for key, value in sorted(counts.items()) if key.startswith("skipped_")}
+        if skipped:
+            lines.append("Skipped: " + ", ".join(f"{count} {reason.replace('_', ' ')}" for reason, count in skipped.items()))
+        for (old, new), count in self.tier_changes.most_common():
+            lines.append(f"  {old or '-'} -> {new or '-'}: {count}")
+        for example in self.examples:
+            lines.append(
+                f"  {example['feedback_id']} ({example['title']}): "
+                f"{example['score'][0]} -> {example['score'][1]}, {example['fit_tier'][0]} -> {example['fit_tier'][1]}"
+            )
+        return lines
+
+
+class Replayer:
+    """Rebuilds jobs from ledger entries and re-scores them offline."""
+
+    def __init__(self, feedback: Dict[str, Any], descriptions: DescriptionStore = None):
+        self.feedback = feedback
+        self.descriptions = descriptions
+        # Many entries re-evaluate the same posting; descriptions are immutable by hash
+        self._description = lru_cache(maxsize=1024)(self._load_description)
+
+    def _load_description(self, sha: str) -> Optional[str]:
+        return self.descriptions.get(sha) if self.descriptions is not None else None
+
+    def job_from_entry(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The job as evaluate_job saw it, or None when its description is not stored."""
+        description = ""
+        sha = entry.get("description_sha256", "")
+        if sha:
+            description = self._description(sha)
+        elif entry.get("description_hash"):
+            # Written before the description store existed
+            description = None
+        if description is None:
+            # Rows that carry their own text can still be replayed
+            description = entry.get("description")
+            if not isinstance(description, str) or not description:
+                return None
+        return {
+            "id": entry.get("job_id", ""),
+            "feedback_id": entry.get("feedback_id", ""),
+            "company": entry.get("company", ""),
+            "title": entry.get("title", ""),
+            "location": entry.get("location", ""),
+            "url": entry.get("url", ""),
+            "description": description,
+            "description_source": entry.get("description_source", ""),
+            "verification": entry.get("verification") or {},
+        }
+
+    def replay_entry(self, entry: Dict[str, Any], report: ReplayReport) -> Optional[Dict[str, Any]]:
+        raw = entry.get("analysis_raw")
+        if not isinstance(raw, dict) or not raw:
+            report.skip("no_analysis_raw")
+            return None
+        job = self.job_from_entry(entry)
+        if job is None:
+            report.skip("no_description")
+            return None
+
+        passthrough = {field: str(entry.get(field, "") or "") for field in _PASSTHROUGH_FIELDS}
+        if "fallback_score" in raw:
+            analysis = _fallback(int(raw["fallback_score"]), passthrough["reason"], passthrough["summary"], job)
+            analysis["analysis_raw"] = raw
+        else:
+            analysis = _normalize_result(dict(raw, **passthrough), job)
+        apply_analysis(job, analysis, self.feedback)
+        report.record(entry, job)
+        return job
+
+    def replay(self, entries: Iterable[Dict[str, Any]], max_examples: int = 10) -> ReplayReport:
+        report = ReplayReport(max_examples)
+        for entry in entries:
+            try:
+                self.replay_entry(entry, report)
+            except Exception as e:
+                print(f"[WARN] Could not replay {entry.get('feedback_id', '')} from run {entry.get('run_id', '')}: {e}")
+                report.skip("error")
+        if report.counts["skipped_no_description"]:
+            print(f"[WARN] Skipped {report.counts['skipped_no_description']} ledger entries whose description text is not stored")
+        return report
+
+
+def select_entries(
+    entries: Iterable[Dict[str, Any]],
+    latest: bool = False,
+    since: str = None,
+) -> Iterable[Dict[str, Any]]:
+    """Filter ledger entries by evaluated_at; latest keeps one evaluation per job."""
+    if since:
+        entries = (entry for entry in entries if str(entry.get("evaluated_at", "")) >= since)
+    if not latest:
+        return entries
+    newest: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        key = entry.get("feedback_id", "")
+        if key not in newest or str(entry.get("evaluated_at", "")) >= str(newest[key].get("evaluated_at", "")):
+            newest[key] = entry
+    return list(newest.values())
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Re-score ledger history offline with current caps and feedback.")
+    parser.add_argument("--backend", choices=LEDGER_BACKENDS, help="ledger backend (default JOB_LEDGER_BACKEND)")
+    parser.add_argument("--feedback", default=DEFAULT_FEEDBACK_FILE, help="feedback.json to replay with")
+    parser.add_argument("--latest", action="store_true", help="only the latest evaluation of each job")
+    parser.add_argument("--since", help="only entries evaluated at or after this ISO timestamp")
+    parser.add_argument("--examples", type=int, default=10, help="changed entries to list")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    feedback = load_feedback(args.feedback, create=False)
+    ledger = open_ledger(args.backend)
+    try:
+        entries = select_entries(ledger.iter_entries(), latest=args.latest, since=args.since)
+        report = Replayer(feedback, load_description_store()).replay(entries, args.examples)
+    finally:
+        ledger.close()
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print("\n".join(report.lines()))
+
+
+if __name__ == "__main__":
+    main()
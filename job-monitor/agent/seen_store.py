@@ -0,0 +1,159 @@
+"""SQLite-backed seen-job IDs with first/last-seen times and bounded retention."""
+
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Set
+
+from agent.feedback import DEFAULT_DATA_DIR
+
+DEFAULT_SEEN_JOBS_DB = os.getenv(
+    "JOB_SEEN_JOBS_DB",
+    os.path.join(DEFAULT_DATA_DIR, "seen_jobs.sqlite3"),
+)
+DEFAULT_RETENTION_DAYS = 90
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_jobs (
+    company TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL DEFAULT 0,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    removed_at TEXT,
+    PRIMARY KEY (company, job_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS seen_jobs_removed_at ON seen_jobs (removed_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _timestamp(now: datetime = None) -> str:
+    return (now or datetime.now(timezone.utc)).isoformat(timespec="seconds")
+
+
+def _retention_days() -> float:
+    try:
+        return max(0.0, float(os.getenv("JOB_SEEN_RETENTION_DAYS", DEFAULT_RETENTION_DAYS)))
+    except (TypeError, ValueError):
+        return DEFAULT_RETENTION_DAYS
+
+
+class SeenJobsStore:
+    """Job IDs per company; IDs that leave a board are kept as seen for a retention window.
+
+    Each company update is one transaction, so a crash never leaves a
+    company half-written. Use from one thread (the main merge loop).
+    """
+
+    def __init__(self, path: str = DEFAULT_SEEN_JOBS_DB, retention_days: float = None):
+        self.path = path
+        self.retention_days = _retention_days() if retention_days is None else retention_days
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def migrate_json(self, json_path: str) -> int:
+        """One-shot import of the legacy {company: [ids]} file; returns IDs imported."""
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+            return 0
+        if not json_path or not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, "r") as f:
+                legacy = json.load(f)
+        except Exception as e:
+            print(f"[WARN] Could not migrate {json_path}: {e}")
+            return 0
+
+        now = _timestamp()
+        imported = 0
+        with self.conn:
+            for company, ids in (legacy or {}).items():
+                rows = [(company, str(job_id), position, now, now) for position, job_id in enumerate(ids or [])]
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO seen_jobs (company, job_id, position, first_seen, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                imported += len(rows)
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('json_migrated', ?)",
+                (json.dumps({"path": json_path, "at": now, "ids": imported}),),
+            )
+        return imported
+
+    def current_ids(self) -> Dict[str, List[str]]:
+        """IDs on each board as of its last successful scrape, in board order."""
+        current: Dict[str, List[str]] = {}
+        rows = self.conn.execute(
+            "SELECT company, job_id FROM seen_jobs WHERE removed_at IS NULL ORDER BY company, position"
+        )
+        for company, job_id in rows:
+            current.setdefault(company, []).append(job_id)
+        return current
+
+    def known_ids(self) -> Dict[str, Set[str]]:
+        """Current plus retained removed IDs, for new-job membership checks."""
+        known: Dict[str, Set[str]] = {}
+        for company, job_id in self.conn.execute("SELECT company, job_id FROM seen_jobs"):
+            known.setdefault(company, set()).add(job_id)
+        return known
+
+    def update_company(self, company: str, job_ids: Iterable[str], now: datetime = None) -> None:
+        """Record a board's current IDs; IDs no longer listed are marked removed."""
+        stamp = _timestamp(now)
+        rows = [(company, str(job_id), position, stamp, stamp) for position, job_id in enumerate(job_ids)]
+        current = {row[1] for row in rows}
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO seen_jobs (company, job_id, position, first_seen, last_seen) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (company, job_id) DO UPDATE SET "
+                "position = excluded.position, last_seen = excluded.last_seen, removed_at = NULL",
+                rows,
+            )
+            # Removed = stored minus current, so same-second updates or clock skew cannot misclassify
+            listed = {
+                job_id
+                for (job_id,) in self.conn.execute(
+                    "SELECT job_id FROM seen_jobs WHERE company = ? AND removed_at IS NULL", (company,)
+                )
+            }
+            self.conn.executemany(
+                "UPDATE seen_jobs SET removed_at = ? WHERE company = ? AND job_id = ?",
+                [(stamp, company, job_id) for job_id in listed - current],
+            )
+
+    def purge_removed(self, now: datetime = None) -> int:
+        """Forget removed IDs older than the retention window; returns rows deleted."""
+        cutoff = _timestamp((now or datetime.now(timezone.utc)) - timedelta(days=self.retention_days))
+        with self.conn:
+            return self.conn.execute(
+                "DELETE FROM seen_jobs WHERE removed_at IS NOT NULL AND removed_at < ?",
+                (cutoff,),
+            ).rowcount
+
+    def first_seen(self, company: str, job_id: str) -> str:
+        row = self.conn.execute(
+            "SELECT first_seen FROM seen_jobs WHERE company = ? AND job_id = ?",
+            (company, job_id),
+        ).fetchone()
+        return row[0] if row else ""
+
+
+def open_seen_store(path: str = DEFAULT_SEEN_JOBS_DB, legacy_json: str = None) -> SeenJobsStore:
+    """Open the store, importing the legacy JSON file on first use."""
+    store = SeenJobsStore(path)
+    imported = store.migrate_json(legacy_json)
+    if imported:
+        print(f"Migrated {imported} seen job IDs from {legacy_json} to {path}")
+    return store
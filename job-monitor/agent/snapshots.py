@@ -0,0 +1,82 @@
+"""Per-board fetch snapshots (validators + content hash) for conditional requests."""
+
+import json
+import os
+import threading
+from typing import Any, Dict
+
+from agent.feedback import DEFAULT_DATA_DIR
+
+DEFAULT_BOARD_SNAPSHOT_FILE = os.getenv(
+    "JOB_BOARD_SNAPSHOT_FILE",
+    os.path.join(DEFAULT_DATA_DIR, "board_snapshots.json"),
+)
+
+
+class BoardSnapshotStore:
+    """ETag/Last-Modified/sha256 per board, shared safely by worker threads.
+
+    Scrapers stage a snapshot when they fetch a board; it only becomes the
+    baseline for the next run once the company finished without error and
+    is committed, so a failed run never hides postings behind a 304.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.snapshots: Dict[str, Dict[str, Any]] = {}
+        self._staged: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except Exception as exc:
+            print(f"[WARN] Could not load board snapshots {self.path}: {exc}")
+            return
+        boards = data.get("boards") if isinstance(data, dict) else None
+        if isinstance(boards, dict):
+            self.snapshots = {key: value for key, value in boards.items() if isinstance(value, dict)}
+
+    def get(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = self.snapshots.get(key)
+            return dict(snapshot) if snapshot else None
+
+    def stage(self, key: str, snapshot: Dict[str, Any]) -> None:
+        with self._lock:
+            self._staged[key] = dict(snapshot)
+
+    def commit(self, key: str) -> None:
+        with self._lock:
+            snapshot = self._staged.pop(key, None)
+            if snapshot is not None and snapshot != self.snapshots.get(key):
+                self.snapshots[key] = snapshot
+                self._dirty = True
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._staged.pop(key, None)
+
+    def save(self) -> None:
+        """Atomically persist committed snapshots if any changed."""
+        with self._lock:
+            if not self._dirty or not self.path:
+                return
+            payload = {"boards": dict(sorted(self.snapshots.items()))}
+            self._dirty = False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def load_board_snapshots(path: str = DEFAULT_BOARD_SNAPSHOT_FILE) -> BoardSnapshotStore:
+    return BoardSnapshotStore(path)
@@ -6,23 +6,17 @@ import re
 from typing import Any, Callable, Dict, List, Tuple
 from urllib.parse import parse_qs, urldefrag, urljoin, urlparse
 
-import requests
-from bs4 import BeautifulSoup
-from google import genai
-
 from agent.verification import verify_job
+from ai.client import gemini_model
+from scrapers.browser import browser_page
+from scrapers.http_client import http_get
 from scrapers.job_details import MIN_USEFUL_DESCRIPTION_CHARS, fetch_job_description
+from scrapers.readiness import goto_when_ready
+from scrapers.soup import make_soup
 
 DEFAULT_MAX_REPAIR_ATTEMPTS = 3
 MAX_CANDIDATE_LINKS = 20
 
-_HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    )
-}
-
 JOB_URL_HINT_RE = re.compile(
     r"(/jobs?/|/careers/job|/positions?/|/openings?/|job_id=|gh_jid=|jid=|pid=|lever\.co|greenhouse)",
     re.IGNORECASE,
@@ -100,28 +94,22 @@ def _known_url_repairs(job: Dict[str, Any]) -> List[Dict[str, Any]]:
     return candidates
 
 
-def fetch_url_html(url: str, timeout: int = 15) -> str:
+def fetch_url_html(url: str, timeout: int = None) -> str:
     """Fetch HTML from a URL for candidate-link extraction."""
     if not url:
         return ""
 
     try:
-        response = requests.get(url, headers=_HEADERS, timeout=timeout)
+        response = http_get(url, timeout=timeout)
         response.raise_for_status()
         return response.text
     except Exception as request_error:
         print(f"[WARN] requests repair fetch failed for {url}: {request_error}")
 
     try:
-        from playwright.sync_api import sync_playwright
-
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(url, timeout=60_000, wait_until="domcontentloaded")
-            page.wait_for_timeout(2_000)
+        with browser_page() as page:
+            goto_when_ready(page, url)
             html = page.content()
-            browser.close()
         return html
     except Exception as playwright_error:
         print(f"[WARN] Playwright repair fetch failed for {url}: {playwright_error}")
@@ -130,7 +118,7 @@ def fetch_url_html(url: str, timeout: int = 15) -> str:
 
 def extract_candidate_links(html: str, base_url: str, job: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Extract likely job-detail URLs from a generic careers/search page."""
-    soup = BeautifulSoup(html or "", "html.parser")
+    soup = make_soup(html)
     title = str(job.get("title", "") or "")
     exact_title = re.sub(r"\s+", " ", title).strip().lower()
     terms = _title_terms(title)
@@ -215,7 +203,6 @@ def _rank_candidates_with_gemini(job: Dict[str, Any], candidates: List[Dict[str,
         return candidates, meta
 
     try:
-        client = genai.Client(api_key=api_key)
         compact_candidates = [
             {
                 "url": candidate.get("url", ""),
@@ -238,10 +225,7 @@ Candidates:
 
 Return ONLY JSON:
 {{"ranked_urls": ["<best url first>"], "reason": "<brief reason>"}}"""
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-        )
+        response = gemini_model("gemini-2.5-flash").generate(prompt)
         result = json.loads((response.text or "").strip().strip("`"))
         ranked_urls = [
             _normalize_url(url)
@@ -295,8 +279,13 @@ def repair_job_url(
     use_gemini: bool = None,
     fetch_description_func: Callable[[str], str] = fetch_job_description,
     fetch_html_func: Callable[[str], str] = fetch_url_html,
+    store=None,
 ) -> Dict[str, Any]:
-    """Try to repair a suspect job URL with a bounded observe-act-verify loop."""
+    """Try to repair a suspect job URL with a bounded observe-act-verify loop.
+
+    With a description store (put), a repaired job's new text is stored so its
+    description_sha256 always names a stored blob.
+    """
     original_url = str(job.get("url", "") or "")
     max_attempts = _max_attempts(max_attempts)
     use_gemini = _env_bool("JOB_URL_REPAIR_USE_GEMINI", False) if use_gemini is None else bool(use_gemini)
@@ -373,6 +362,12 @@ def repair_job_url(
             job["url"] = candidate_url
             job["description"] = description
             job["description_source"] = "url_repair"
+            job.pop("description_sha256", None)
+            if store is not None and description:
+                try:
+                    job["description_sha256"] = store.put(description, candidate_url)
+                except Exception as e:
+                    print(f"[WARN] Could not store description for {candidate_url}: {e}")
             job["verification"] = candidate_verification
             loop["status"] = "repaired"
             loop["final_url"] = candidate_url
@@ -4,6 +4,7 @@ import re
 from typing import Any, Dict, List, Tuple
 from urllib.parse import parse_qs, urlparse, urlunparse
 
+from agent.job import derived, job_text
 from ai.analyzer import fit_tier_for_score
 
 MIN_USEFUL_DESCRIPTION_CHARS = 300
@@ -63,6 +64,10 @@ def _canonical_url(url: str) -> str:
     )
 
 
+def _job_canonical_url(job: Dict[str, Any]) -> str:
+    return derived(job, "canonical_url", lambda job: _canonical_url(job_text(job, "url")))
+
+
 def _looks_generic_url(url: str) -> bool:
     parsed = urlparse(url or "")
     if not parsed.netloc:
@@ -100,10 +105,10 @@ def _text_mentions_title(title: str, text: str) -> bool:
 
 def verify_job(job: Dict[str, Any]) -> Dict[str, Any]:
     """Return URL/detail quality checks that can be audited and used for caps."""
-    title = str(job.get("title", "") or "")
-    company = str(job.get("company", "") or "")
-    url = str(job.get("url", "") or "")
-    description = str(job.get("description", "") or "")
+    title = job_text(job, "title")
+    company = job_text(job, "company")
+    url = job_text(job, "url")
+    description = job_text(job, "description")
     description_len = len(description.strip())
 
     issues: List[str] = []
@@ -135,10 +140,11 @@ def verify_job(job: Dict[str, Any]) -> Dict[str, Any]:
         issues.append("Job detail page appears closed or unavailable.")
         score_cap = min(score_cap or 3, 3)
 
-    if description and title and not _text_mentions_title(title, description):
+    description_lower = description.lower()
+    if description and title and not _text_mentions_title(title, description_lower):
         issues.append("Job detail text does not clearly mention distinctive title terms.")
 
-    if description and company and company.lower() not in description.lower():
+    if description and company and company.lower() not in description_lower:
         checks.append("Company name not present in detail text; acceptable for many ATS pages.")
 
     quality = "passed"
@@ -153,7 +159,7 @@ def verify_job(job: Dict[str, Any]) -> Dict[str, Any]:
         "checks": checks[:6],
         "score_cap": score_cap,
         "description_length": description_len,
-        "canonical_url": _canonical_url(url),
+        "canonical_url": _job_canonical_url(job),
     }
 
 
@@ -191,11 +197,11 @@ def collapse_duplicate_jobs(jobs: List[Dict[str, Any]]) -> Tuple[List[Dict[str,
     duplicate_notes: List[str] = []
 
     for job in jobs:
-        company = str(job.get("company", "") or "").lower()
-        job_id = str(job.get("id", "") or "").strip().lower()
-        canonical_url = _canonical_url(str(job.get("url", "") or ""))
-        title = re.sub(r"\s+", " ", str(job.get("title", "") or "").strip().lower())
-        location = re.sub(r"\s+", " ", str(job.get("location", "") or "").strip().lower())
+        company = job_text(job, "company").lower()
+        job_id = job_text(job, "id").strip().lower()
+        canonical_url = _job_canonical_url(job)
+        title = derived(job, "normalized_title", lambda job: _normalized_phrase(job_text(job, "title")))
+        location = re.sub(r"\s+", " ", job_text(job, "location").strip().lower())
 
         key = (company, job_id or canonical_url or f"{title}|{location}")
         if key in seen:
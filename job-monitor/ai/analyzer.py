@@ -3,14 +3,15 @@
 import json
 import os
 import re
-import time
 from typing import Any, Dict, List, Tuple
 
-from google import genai
-
 from ai.candidate_profile import CANDIDATE_FIT_PROFILE
+from ai.client import gemini_model
 
 MAX_DESCRIPTION_CHARS = 12_000
+ANALYSIS_MODEL = "gemini-2.5-flash"
+# Bump when the prompt or normalization changes so cached analyses are not reused.
+ANALYSIS_PROMPT_VERSION = "analysis-v1"
 
 ROLE_TYPES = {
     "PM",
@@ -116,13 +117,19 @@ def fit_tier_for_score(score: int) -> str:
     return "Low Fit"
 
 
-def _combined_text(job: Dict[str, str]) -> str:
+def _join_text(job: Dict[str, str]) -> str:
     return " ".join(
         str(job.get(key, "") or "")
         for key in ("title", "company", "location", "description")
     )
 
 
+def _combined_text(job: Dict[str, str]) -> str:
+    # agent.job.Job records memoize derived values; plain dicts recompute
+    derive = getattr(job, "derive", None)
+    return derive("combined_text", _join_text) if derive is not None else _join_text(job)
+
+
 def _has_useful_description(job: Dict[str, str]) -> bool:
     return len(str(job.get("description", "") or "").strip()) >= 300
 
@@ -277,9 +284,19 @@ def _fallback(score: int, reason: str, summary: str = "", job: Dict[str, str] =
         "evidence": [],
         "concerns": cap_concerns,
         "extraction": {},
+        "analysis_raw": {"fallback_score": score},
     }
 
 
+def _replayable_fields(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Raw model fields that caps and calibration rewrite, kept so scoring can be replayed offline.
+
+    reason, summary and competitive_angle pass through unchanged and are
+    replayed from the ledger entry itself.
+    """
+    return {key: result[key] for key in ("score", "extraction", "concerns", "evidence") if key in result}
+
+
 def _normalize_result(result: Dict[str, Any], job: Dict[str, str]) -> Dict[str, Any]:
     raw_score = int(result.get("score", 5))
     raw_extraction = result.get("extraction")
@@ -300,18 +317,23 @@ def _normalize_result(result: Dict[str, Any], job: Dict[str, str]) -> Dict[str,
         "evidence": _listify(result.get("evidence")),
         "concerns": (ai_concerns + cap_concerns + extraction_concerns)[:6],
         "extraction": extraction if has_extraction else {},
+        "analysis_raw": _replayable_fields(result),
     }
 
 
-def analyze_job(job: Dict[str, str]) -> Dict[str, Any]:
+def analyze_job(job: Dict[str, str], cache=None) -> Dict[str, Any]:
+    """Score a job with Gemini; a cache (lookup/store_result) skips repeat calls."""
+    if cache is not None:
+        cached = cache.lookup(job)
+        if cached is not None:
+            return cached
+
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         return _fallback(5, "No API key", "", job)
 
     response_text = ""
     try:
-        client = genai.Client(api_key=api_key)
-
         job_title = job.get("title", "")
         company = job.get("company", "")
         location = job.get("location", "") or "Not specified"
@@ -359,22 +381,13 @@ Return ONLY a JSON object, no markdown, no explanation:
   }}
 }}"""
 
-        for attempt in range(3):
-            try:
-                response = client.models.generate_content(
-                    model="gemini-2.5-flash",
-                    contents=prompt
-                )
-                break
-            except Exception as e:
-                if "429" in str(e) and attempt < 2:
-                    time.sleep(35)
-                    continue
-                raise
-
+        response = gemini_model(ANALYSIS_MODEL).generate(prompt)
         response_text = response.text.strip()
         result = _parse_json_response(response_text)
-        return _normalize_result(result, job)
+        normalized = _normalize_result(result, job)
+        if cache is not None:
+            cache.store_result(job, normalized)
+        return normalized
 
     except Exception as e:
         print(f"[AI RAW] {response_text[:500]}")
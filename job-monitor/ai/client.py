@@ -0,0 +1,106 @@
+"""Process-wide genai client shared by every Gemini call site."""
+
+import os
+import threading
+from typing import Any, Callable, Dict
+
+from google import genai
+
+from ai.gemini import get_gemini_executor
+
+DEFAULT_TIMEOUT_SECONDS = 120
+
+
+class GeminiModel:
+    """Handle for one model; calls go through the shared rate-limit executor."""
+
+    def __init__(self, provider: "GeminiClientProvider", name: str):
+        self.provider = provider
+        self.name = name
+
+    def generate(self, contents: Any, config: Any = None) -> Any:
+        return get_gemini_executor().generate(self.provider.client(), self.name, contents, config=config)
+
+
+class GeminiClientProvider:
+    """Lazily build one genai.Client and hand out per-model handles.
+
+    The client is rebuilt only if GEMINI_API_KEY changes. Tests inject a
+    client_factory (called with the API key) to stay offline.
+    """
+
+    def __init__(
+        self,
+        api_key: str = None,
+        timeout_seconds: float = None,
+        client_factory: Callable[[str], Any] = None,
+    ):
+        self.api_key = api_key
+        if timeout_seconds is None:
+            try:
+                timeout_seconds = float(os.getenv("JOB_GEMINI_TIMEOUT", DEFAULT_TIMEOUT_SECONDS))
+            except (TypeError, ValueError):
+                timeout_seconds = DEFAULT_TIMEOUT_SECONDS
+        self.timeout_seconds = max(1.0, timeout_seconds)
+        self.client_factory = client_factory or self._build_client
+        self.stats = {"clients_created": 0}
+        self._client = None
+        self._client_key = None
+        self._models: Dict[str, GeminiModel] = {}
+        self._lock = threading.Lock()
+
+    def _build_client(self, api_key: str) -> Any:
+        # Retries are owned by the executor, so only the transport timeout is set here.
+        return genai.Client(api_key=api_key, http_options={"timeout": int(self.timeout_seconds * 1000)})
+
+    def client(self) -> Any:
+        api_key = self.api_key or os.getenv("GEMINI_API_KEY")
+        with self._lock:
+            if self._client is None or api_key != self._client_key:
+                self._close_client()
+                self._client = self.client_factory(api_key)
+                self._client_key = api_key
+                self.stats["clients_created"] += 1
+            return self._client
+
+    def model(self, name: str) -> GeminiModel:
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = GeminiModel(self, name)
+            return self._models[name]
+
+    def _close_client(self) -> None:
+        client, self._client = self._client, None
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                print(f"[WARN] Could not close Gemini client: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_client()
+
+
+_provider: GeminiClientProvider = None
+_provider_lock = threading.Lock()
+
+
+def get_gemini_provider() -> GeminiClientProvider:
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = GeminiClientProvider()
+        return _provider
+
+
+def set_gemini_provider(provider: GeminiClientProvider) -> None:
+    """Swap the process-wide provider (tests install one with a fake client_factory)."""
+    global _provider
+    with _provider_lock:
+        _provider = provider
+
+
+def gemini_model(name: str) -> GeminiModel:
+    return get_gemini_provider().model(name)
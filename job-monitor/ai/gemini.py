@@ -0,0 +1,232 @@
+"""Rate-limit-aware execution layer shared by every Gemini call site."""
+
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+# Published free-tier quotas; override with JOB_GEMINI_LIMITS or JOB_GEMINI_RPM/TPM.
+DEFAULT_MODEL_LIMITS: Dict[str, Tuple[int, int]] = {
+    "gemini-2.5-flash": (10, 250_000),
+    "gemini-2.5-flash-lite": (15, 250_000),
+}
+DEFAULT_RPM = 10
+DEFAULT_TPM = 250_000
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 2.0
+DEFAULT_MAX_DELAY = 90.0
+OUTPUT_TOKEN_ALLOWANCE = 512
+
+RETRYABLE_CODES = {429, 500, 502, 503, 504}
+RETRYABLE_STATUS_RE = re.compile(r"\b(429|500|502|503|504|RESOURCE_EXHAUSTED|UNAVAILABLE|DEADLINE_EXCEEDED)\b")
+RETRY_DELAY_RE = re.compile(r"retryDelay['\"]?\s*:\s*['\"]?(\d+(?:\.\d+)?)s", re.IGNORECASE)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_model_limits(value: str) -> Dict[str, Tuple[int, int]]:
+    """Parse "model=rpm/tpm,model=rpm/tpm" overrides."""
+    limits: Dict[str, Tuple[int, int]] = {}
+    for item in (value or "").split(","):
+        model, _, budget = item.partition("=")
+        rpm, _, tpm = budget.partition("/")
+        if not model.strip():
+            continue
+        try:
+            limits[model.strip()] = (max(1, int(rpm)), max(1, int(tpm or DEFAULT_TPM)))
+        except (TypeError, ValueError):
+            print(f"[WARN] Ignoring invalid Gemini limit '{item.strip()}'")
+    return limits
+
+
+def estimate_tokens(contents: Any) -> int:
+    """Cheap prompt-size estimate (~4 chars per token) plus an output allowance."""
+    return len(str(contents or "")) // 4 + OUTPUT_TOKEN_ALLOWANCE
+
+
+def retry_after_seconds(error: Exception) -> float:
+    """Server-requested delay from a Retry-After header or RetryInfo detail, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        if value:
+            return max(0.0, float(value))
+    except (AttributeError, TypeError, ValueError):
+        pass
+    match = RETRY_DELAY_RE.search(f"{getattr(error, 'details', '')} {error}")
+    return float(match.group(1)) if match else 0.0
+
+
+def is_retryable(error: Exception) -> bool:
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code in RETRYABLE_CODES
+    if RETRYABLE_STATUS_RE.search(str(error)):
+        return True
+    # Transport failures (timeouts, resets) carry no status code.
+    return isinstance(error, OSError) or type(error).__module__.split(".")[0] in {"httpx", "httpcore"}
+
+
+class TokenBucket:
+    """Refill-per-minute budget; callers block until enough capacity is available."""
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = max(1.0, float(per_minute))
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available; 0 means it was taken."""
+        amount = min(float(amount), self.capacity)
+        self._refill()
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def debit(self, amount: float) -> None:
+        """Charge usage discovered after the fact; the balance may go negative."""
+        self._refill()
+        self.tokens -= amount
+
+
+class _ModelBudget:
+    def __init__(self, rpm: int, tpm: int, clock: Callable[[], float]):
+        self.requests = TokenBucket(rpm, clock)
+        self.tokens = TokenBucket(tpm, clock)
+        self.paused_until = 0.0
+
+
+class GeminiExecutor:
+    """Run generate_content within per-model RPM/TPM budgets.
+
+    Retries honor Retry-After/RetryInfo and otherwise back off exponentially
+    with jitter; a server-requested pause applies to every caller of that model.
+    """
+
+    def __init__(
+        self,
+        model_limits: Dict[str, Tuple[int, int]] = None,
+        max_concurrency: int = None,
+        max_attempts: int = None,
+        base_delay: float = None,
+        max_delay: float = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.model_limits = dict(DEFAULT_MODEL_LIMITS)
+        if os.getenv("JOB_GEMINI_RPM") or os.getenv("JOB_GEMINI_TPM"):
+            rpm = int(_env_float("JOB_GEMINI_RPM", DEFAULT_RPM)) or DEFAULT_RPM
+            tpm = int(_env_float("JOB_GEMINI_TPM", DEFAULT_TPM)) or DEFAULT_TPM
+            self.model_limits = {model: (rpm, tpm) for model in self.model_limits}
+            self.default_limits = (rpm, tpm)
+        else:
+            self.default_limits = (DEFAULT_RPM, DEFAULT_TPM)
+        self.model_limits.update(
+            model_limits if model_limits is not None else parse_model_limits(os.getenv("JOB_GEMINI_LIMITS", ""))
+        )
+        self.max_attempts = max_attempts or int(_env_float("JOB_GEMINI_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)) or 1
+        self.base_delay = base_delay if base_delay is not None else _env_float("JOB_GEMINI_BASE_DELAY", DEFAULT_BASE_DELAY)
+        self.max_delay = max_delay if max_delay is not None else _env_float("JOB_GEMINI_MAX_DELAY", DEFAULT_MAX_DELAY)
+        concurrency = max_concurrency or int(_env_float("JOB_GEMINI_CONCURRENCY", DEFAULT_CONCURRENCY)) or 1
+        self.sleep = sleep
+        self.clock = clock
+        self.stats = {"requests": 0, "retries": 0, "throttled_seconds": 0.0}
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._budgets: Dict[str, _ModelBudget] = {}
+        self._lock = threading.Lock()
+
+    def _budget(self, model: str) -> _ModelBudget:
+        if model not in self._budgets:
+            rpm, tpm = self.model_limits.get(model, self.default_limits)
+            self._budgets[model] = _ModelBudget(rpm, tpm, self.clock)
+        return self._budgets[model]
+
+    def _reserve(self, model: str, tokens: int) -> None:
+        """Block until the model has request and token budget for one call."""
+        while True:
+            with self._lock:
+                budget = self._budget(model)
+                wait = max(0.0, budget.paused_until - self.clock())
+                if not wait:
+                    wait = budget.requests.wait_time(1)
+                    if not wait:
+                        wait = budget.tokens.wait_time(tokens)
+                        if wait:
+                            budget.requests.debit(-1)  # give the request slot back
+                if not wait:
+                    return
+                self.stats["throttled_seconds"] += wait
+            self.sleep(wait)
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay * (0.5 + random.random() / 2)
+
+    def generate(self, client: Any, model: str, contents: Any, config: Any = None) -> Any:
+        """Call client.models.generate_content under the shared budget with retries."""
+        estimated = estimate_tokens(contents)
+        kwargs = {"model": model, "contents": contents}
+        if config is not None:
+            kwargs["config"] = config
+
+        for attempt in range(1, self.max_attempts + 1):
+            self._reserve(model, estimated)
+            try:
+                with self._slots:
+                    with self._lock:
+                        self.stats["requests"] += 1
+                    response = client.models.generate_content(**kwargs)
+            except Exception as e:
+                if attempt >= self.max_attempts or not is_retryable(e):
+                    raise
+                delay = retry_after_seconds(e) or self._backoff(attempt)
+                delay = min(self.max_delay, delay)
+                with self._lock:
+                    self.stats["retries"] += 1
+                    budget = self._budget(model)
+                    budget.paused_until = max(budget.paused_until, self.clock() + delay)
+                print(f"[RETRY] Gemini {model} attempt {attempt}/{self.max_attempts} in {delay:.1f}s: {str(e)[:120]}")
+                continue
+
+            usage = getattr(response, "usage_metadata", None)
+            actual = getattr(usage, "total_token_count", None)
+            if isinstance(actual, int) and actual > estimated:
+                with self._lock:
+                    self._budget(model).tokens.debit(actual - estimated)
+            return response
+
+
+_executor: GeminiExecutor = None
+_executor_lock = threading.Lock()
+
+
+def get_gemini_executor() -> GeminiExecutor:
+    """Process-wide executor so every call site shares one quota view."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = GeminiExecutor()
+        return _executor
+
+
+def set_gemini_executor(executor: GeminiExecutor) -> None:
+    global _executor
+    with _executor_lock:
+        _executor = executor
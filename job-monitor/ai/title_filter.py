@@ -1,7 +1,21 @@
 """Flash Lite AI title filter for PM roles."""
+import json
 import os
-import time
-from google import genai
+import re
+from typing import Dict, List
+
+from ai.analyzer import _parse_json_response
+from ai.client import gemini_model
+
+TITLE_MODEL = "gemini-2.5-flash-lite"
+# Bump when the prompt or decision rules change so cached answers are not reused.
+TITLE_PROMPT_VERSION = "title-v1"
+DEFAULT_BATCH_SIZE = 40
+
+_PM_ROLE_DEFINITION = (
+    "a Product Management role or closely related (e.g. Product Manager, Product Lead, "
+    "Group PM, Head of Product, Director of Product, Staff PM)"
+)
 
 
 def is_pm_role(title: str) -> bool:
@@ -12,23 +26,119 @@ def is_pm_role(title: str) -> bool:
         return False
 
     prompt = (
-        "Is this job title a Product Management role or closely related (e.g. Product Manager, Product Lead, Group PM, Head of Product, Director of Product, Staff PM)? Reply with only YES or NO.\n\n"
+        f"Is this job title {_PM_ROLE_DEFINITION}? Reply with only YES or NO.\n\n"
         f"Title: {title}"
     )
 
-    for attempt in range(1, 4):
+    try:
+        response = gemini_model(TITLE_MODEL).generate(prompt)
+        text = (response.text or "").strip().upper()
+        return "YES" in text
+    except Exception as e:
+        print(f"[WARN] is_pm_role failed for '{title[:50]}': {e}")
+        return False
+
+
+def title_cache_key(title: str) -> str:
+    """Cache key for a title decision under the current prompt and model."""
+    normalized = re.sub(r"\s+", " ", title or "").strip().lower()
+    return f"{TITLE_PROMPT_VERSION}|{TITLE_MODEL}|{normalized}"
+
+
+def _batch_prompt(titles: List[str]) -> str:
+    numbered = [{"index": index, "title": title} for index, title in enumerate(titles, start=1)]
+    return (
+        f"For each job title below, decide whether it is {_PM_ROLE_DEFINITION}.\n\n"
+        f"Titles:\n{json.dumps(numbered, indent=2)}\n\n"
+        "Return ONLY JSON with one entry per title, in the same order:\n"
+        '{"results": [{"index": <title index>, "is_pm": <true or false>}]}'
+    )
+
+
+def _parse_batch_response(response_text: str, count: int) -> List[bool]:
+    """Map a structured batch response back to titles; raise ValueError if incomplete."""
+    result = _parse_json_response(response_text)
+    entries = result.get("results") if isinstance(result, dict) else result
+    if not isinstance(entries, list):
+        raise ValueError("batch response has no results list")
+
+    decisions: Dict[int, bool] = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise ValueError(f"batch entry is not an object: {entry!r}")
         try:
-            client = genai.Client(api_key=api_key)
-            response = client.models.generate_content(
-                model="gemini-2.5-flash-lite",
-                contents=prompt,
-            )
-            text = (response.text or "").strip().upper()
-            return "YES" in text
-        except Exception as e:
-            if attempt < 3:
-                print(f"[RETRY] is_pm_role attempt {attempt}/3 for '{title[:40]}'.")
-                time.sleep(5)
-            else:
-                print(f"[WARN] is_pm_role failed for '{title[:50]}': {e}")
-                return False
+            index = int(entry.get("index"))
+        except (TypeError, ValueError):
+            raise ValueError(f"batch entry has no index: {entry!r}")
+        value = entry.get("is_pm")
+        if isinstance(value, str) and value.strip().lower() in {"true", "yes", "false", "no"}:
+            value = value.strip().lower() in {"true", "yes"}
+        if not isinstance(value, bool):
+            raise ValueError(f"batch entry has no boolean is_pm: {entry!r}")
+        decisions[index] = value
+
+    missing = [index for index in range(1, count + 1) if index not in decisions]
+    if missing:
+        raise ValueError(f"batch response missing indexes {missing[:5]}")
+    return [decisions[index] for index in range(1, count + 1)]
+
+
+def _classify_batch(titles: List[str]) -> List[bool]:
+    try:
+        response = gemini_model(TITLE_MODEL).generate(
+            _batch_prompt(titles),
+            config={"response_mime_type": "application/json"},
+        )
+    except Exception as e:
+        raise RuntimeError(f"batch request failed: {e}")
+    return _parse_batch_response(response.text or "", len(titles))
+
+
+def is_pm_role_batch(titles: List[str], batch_size: int = None, cache=None) -> Dict[str, bool]:
+    """Classify many titles with one Gemini call per batch.
+
+    Unparseable batches are split in half until they parse; a single title
+    that still fails falls back to is_pm_role. When a cache (get/put by key)
+    is given, only uncached titles reach Gemini and parsed answers are stored.
+    """
+    decisions: Dict[str, bool] = {}
+    unique_titles = []
+    for title in dict.fromkeys(title for title in titles if title):
+        cached = cache.get(title_cache_key(title)) if cache is not None else None
+        if isinstance(cached, bool):
+            decisions[title] = cached
+        else:
+            unique_titles.append(title)
+    if not unique_titles:
+        return decisions
+
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        print("[WARN] is_pm_role_batch: GEMINI_API_KEY not set")
+        decisions.update((title, False) for title in unique_titles)
+        return decisions
+
+    batch_size = max(1, batch_size or DEFAULT_BATCH_SIZE)
+    pending = [unique_titles[start:start + batch_size] for start in range(0, len(unique_titles), batch_size)]
+
+    while pending:
+        batch = pending.pop(0)
+        try:
+            batch_decisions = dict(zip(batch, _classify_batch(batch)))
+            decisions.update(batch_decisions)
+            if cache is not None:
+                for title, decision in batch_decisions.items():
+                    cache.put(title_cache_key(title), decision)
+        except RuntimeError as e:
+            # Same outcome as is_pm_role when Gemini is unreachable.
+            print(f"[WARN] is_pm_role_batch failed for {len(batch)} title(s): {e}")
+            decisions.update((title, False) for title in batch)
+        except ValueError as e:
+            if len(batch) == 1:
+                decisions[batch[0]] = is_pm_role(batch[0])
+                continue
+            middle = len(batch) // 2
+            print(f"[WARN] is_pm_role_batch splitting {len(batch)} title(s): {e}")
+            pending[:0] = [batch[:middle], batch[middle:]]
+
+    return decisions
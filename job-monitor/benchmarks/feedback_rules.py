@@ -0,0 +1,96 @@
+"""Benchmark feedback rule matching: rule-by-rule scan vs compiled rules.
+
+Usage:
+    python -m benchmarks.feedback_rules [--jobs 200] [--rules 10 100 1000 5000] [--description-only]
+
+Title-gated rules mostly exercise the company/needle gates; description-only
+rules make every job check every description needle, where the automaton
+replaces thousands of substring searches with one pass.
+"""
+
+import argparse
+import random
+import time
+
+from agent.feedback import CompiledRules, _matches_rule
+
+WORDS = (
+    "product platform growth ai agents evals guardrails support customer enterprise "
+    "payments risk fraud search ranking ads identity billing data infra mobile "
+    "consumer developer api workflow automation compliance trust safety analytics"
+).split()
+COMPANIES = [f"Company{index}" for index in range(40)]
+
+
+def _phrase(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def make_jobs(rng: random.Random, count: int):
+    return [
+        {
+            "company": rng.choice(COMPANIES),
+            "title": f"Senior Product Manager, {_phrase(rng, 2).title()}",
+            "location": rng.choice(["Remote - US", "New York, NY", "San Francisco, CA", "London"]),
+            "url": f"https://jobs.example.com/{index}",
+            # Roughly the 12k-character cap normalize_description applies
+            "description": _phrase(rng, 1_700)[:12_000],
+        }
+        for index in range(count)
+    ]
+
+
+def make_rules(rng: random.Random, count: int, title_gated: bool = True):
+    rules = []
+    for index in range(count):
+        rule = {"name": f"rule {index}", "score_delta": -1}
+        if rng.random() < 0.5:
+            rule["company"] = rng.choice(COMPANIES)
+        if title_gated:
+            rule["title_contains"] = rng.choice(WORDS)
+        # Multi-word phrases rarely occur, so most rules scan the whole description
+        rule["description_contains"] = [_phrase(rng, 3), rng.choice(WORDS)]
+        rules.append(rule)
+    return rules
+
+
+def _timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--rules", type=int, nargs="+", default=[10, 100, 1_000, 5_000])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--description-only", action="store_true", help="rules without title_contains")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    jobs = make_jobs(rng, args.jobs)
+    print(f"{'rules':>6} {'compile ms':>11} {'scan ms/job':>12} {'compiled ms/job':>16} {'speedup':>8}")
+    for count in args.rules:
+        rules = make_rules(rng, count, title_gated=not args.description_only)
+        compiled = None
+
+        def compile_rules():
+            nonlocal compiled
+            compiled = CompiledRules(rules)
+
+        compile_seconds = _timed(compile_rules)
+        expected = []
+        scan_seconds = _timed(lambda: expected.extend([rule for rule in rules if _matches_rule(job, rule)] for job in jobs))
+        actual = []
+        compiled_seconds = _timed(lambda: actual.extend(compiled.matching(job) for job in jobs))
+        if actual != expected:
+            raise SystemExit(f"compiled rules disagree with the scan at {count} rules")
+        print(
+            f"{count:>6} {compile_seconds * 1_000:>11.1f} {scan_seconds * 1_000 / len(jobs):>12.3f} "
+            f"{compiled_seconds * 1_000 / len(jobs):>16.3f} {scan_seconds / compiled_seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
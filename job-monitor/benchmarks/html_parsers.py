@@ -0,0 +1,58 @@
+"""Benchmark HTML parse throughput per make_soup backend.
+
+Usage:
+    python -m benchmarks.html_parsers [--sections 50 400] [--repeat 5]
+
+Reports MB/s for building the BeautifulSoup tree alone and for the full
+extract_readable_text call on the same pages. Backends that are not
+installed are listed as skipped.
+"""
+
+import argparse
+import os
+import random
+import time
+from unittest import mock
+
+from benchmarks.readable_text import make_page
+from scrapers.job_details import extract_readable_text
+from scrapers.soup import HTML_PARSERS, html_parser_name, make_soup
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, nargs="+", default=[50, 400])
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    pages = [make_page(rng, sections, args.depth) for sections in args.sections]
+    print(f"{'backend':>12} {'page KB':>8} {'parse MB/s':>11} {'extract MB/s':>13}")
+    for backend in HTML_PARSERS:
+        if html_parser_name(backend) != backend:
+            print(f"{backend:>12} skipped (not installed)")
+            continue
+        with mock.patch.dict(os.environ, {"JOB_HTML_PARSER": backend}):
+            for html in pages:
+                megabytes = len(html.encode("utf-8")) / 1_000_000
+                parse = _best_of(lambda: make_soup(html), args.repeat)
+                extract = _best_of(lambda: extract_readable_text(html), args.repeat)
+                print(
+                    f"{backend:>12} {len(html) / 1024:>8.0f} {megabytes / parse:>11.2f} "
+                    f"{megabytes / extract:>13.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
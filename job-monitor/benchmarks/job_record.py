@@ -0,0 +1,96 @@
+"""Benchmark per-job memory and the derived-value hot path: dict vs Job.
+
+Usage:
+    python -m benchmarks.job_record [--jobs 5000]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from agent.feedback import CompiledRules
+from agent.job import Job
+from agent.ledger import description_hash
+from agent.verification import collapse_duplicate_jobs, verify_job
+from ai.analyzer import apply_score_caps
+from benchmarks.feedback_rules import COMPANIES, _phrase, make_rules
+
+
+def make_records(rng: random.Random, count: int):
+    """Evaluated jobs as they sit in run state, descriptions already streamed out."""
+    return [
+        {
+            "id": str(index),
+            "company": rng.choice(COMPANIES),
+            "title": f"Senior Product Manager, {_phrase(rng, 2).title()}",
+            "location": "Remote - US",
+            "url": f"https://boards.example.com/jobs/{index}",
+            "description_source": "greenhouse_api",
+            "description_sha256": f"{index:064x}",
+            "feedback_id": f"Company::{index}",
+            "score": rng.randint(1, 10),
+            "fit_tier": "Competitive",
+            "reason": _phrase(rng, 12),
+            "summary": _phrase(rng, 30),
+            "competitive_angle": _phrase(rng, 12),
+            "evidence": [_phrase(rng, 6)],
+            "concerns": [_phrase(rng, 6)],
+            "extraction": {},
+            "analysis_raw": {},
+            "verification": {},
+            "url_repair": {},
+            "calibration": {},
+        }
+        for index in range(count)
+    ]
+
+
+def _allocated(build) -> int:
+    tracemalloc.start()
+    kept = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def _pipeline(jobs, rules) -> float:
+    """The per-job normalization steps evaluate_job and the ledger repeat."""
+    started = time.perf_counter()
+    unique, _ = collapse_duplicate_jobs(jobs)
+    for job in unique:
+        verify_job(job)
+        apply_score_caps(job, 8)
+        rules.matching(job)
+        description_hash(job)
+        description_hash(job)
+    return time.perf_counter() - started
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    records = make_records(rng, args.jobs)
+    # Copy the shared strings' containers only, so both sides pay for the same values
+    dict_bytes = _allocated(lambda: [dict(record) for record in records])
+    job_bytes = _allocated(lambda: [Job(record) for record in records])
+    print(f"memory per job: dict {dict_bytes / args.jobs:.0f} B, Job {job_bytes / args.jobs:.0f} B")
+
+    for record in records:
+        record["description"] = _phrase(rng, 1_700)[:12_000]
+    rules = CompiledRules(make_rules(rng, 100))
+    dict_seconds = _pipeline([dict(record) for record in records], rules)
+    job_seconds = _pipeline([Job(record) for record in records], rules)
+    print(
+        f"pipeline per job: dict {dict_seconds * 1e6 / args.jobs:.0f} us, "
+        f"Job {job_seconds * 1e6 / args.jobs:.0f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
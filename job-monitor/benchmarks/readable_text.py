@@ -0,0 +1,90 @@
+"""Benchmark readable-text extraction: selector-by-selector vs single pass.
+
+Usage:
+    python -m benchmarks.readable_text [--sections 50 200 800] [--depth 8] [--repeat 3]
+
+Pages nest the posting under several wrappers and repeat description-classed
+blocks, the shape that makes the selector scan serialize the same text many
+times. Both timings include html.parser parsing.
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.feedback_rules import _phrase
+from scrapers.job_details import (
+    MAX_DESCRIPTION_CHARS,
+    READABLE_SELECTORS,
+    SKIPPED_TAGS,
+    extract_readable_text,
+    normalize_description,
+)
+from scrapers.soup import make_soup
+
+
+def extract_readable_text_by_selectors(html: str, max_chars: int = MAX_DESCRIPTION_CHARS) -> str:
+    """Selector-by-selector extraction with html.parser; the reference extract_readable_text must match."""
+    soup = make_soup(html, "html.parser")
+    for tag in soup(list(SKIPPED_TAGS)):
+        tag.decompose()
+
+    candidates = []
+    for selector in READABLE_SELECTORS:
+        for node in soup.select(selector):
+            text = node.get_text(" ", strip=True)
+            if text:
+                candidates.append(text)
+
+    if not candidates:
+        candidates.append(soup.get_text(" ", strip=True))
+
+    return normalize_description(max(candidates, key=len, default=""), max_chars)
+
+
+def make_page(rng: random.Random, sections: int, depth: int) -> str:
+    blocks = []
+    for index in range(sections):
+        paragraphs = "".join(f"<p>{_phrase(rng, 25)}</p>" for _ in range(3))
+        blocks.append(f'<div class="section-description" data-testid="job-section-{index}">{paragraphs}</div>')
+    body = f'<section class="job-description" id="job-description">{"".join(blocks)}</section>'
+    for level in range(depth):
+        body = f'<div class="layout description-wrapper-{level}">{body}</div>'
+    chrome = "<nav>" + "".join(f"<a href='/{index}'>Link {index}</a>" for index in range(50)) + "</nav>"
+    scripts = "".join(f"<script>window.__state{index} = {{}};</script>" for index in range(20))
+    return f"<html><head>{scripts}</head><body>{chrome}<main><article>{body}</article></main><footer>Footer</footer></body></html>"
+
+
+def _best_of(fn, html: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(html)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, nargs="+", default=[50, 200, 800])
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    print(f"{'sections':>8} {'page KB':>8} {'selectors ms':>13} {'single pass ms':>15} {'speedup':>8}")
+    for sections in args.sections:
+        html = make_page(rng, sections, args.depth)
+        if extract_readable_text(html) != extract_readable_text_by_selectors(html):
+            raise SystemExit(f"single pass disagrees with the selector scan at {sections} sections")
+        scan = _best_of(extract_readable_text_by_selectors, html, args.repeat)
+        single = _best_of(extract_readable_text, html, args.repeat)
+        print(
+            f"{sections:>8} {len(html) / 1024:>8.0f} {scan * 1_000:>13.1f} "
+            f"{single * 1_000:>15.1f} {scan / single:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
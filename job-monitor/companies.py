@@ -20,10 +20,10 @@ COMPANIES = [
     {"name": "Customer.io", "type": "greenhouse", "board_token": "customerio"},
     {"name": "Elastic", "type": "greenhouse", "board_token": "elastic"},
     {"name": "Pinterest", "type": "greenhouse", "board_token": "pinterest"},
-    # Ashby companies
-    {"name": "1Password", "type": "playwright", "board_token": "https://jobs.ashbyhq.com/1password"},
-    {"name": "Kraken", "type": "playwright", "board_token": "https://jobs.ashbyhq.com/kraken.com"},
-    {"name": "Zapier", "type": "playwright", "board_token": "https://jobs.ashbyhq.com/zapier"},
+    # Ashby companies (board_token is the jobs.ashbyhq.com board name)
+    {"name": "1Password", "type": "ashby", "board_token": "1password"},
+    {"name": "Kraken", "type": "ashby", "board_token": "kraken.com"},
+    {"name": "Zapier", "type": "ashby", "board_token": "zapier"},
     {"name": "CoreWeave (W&B)", "type": "playwright", "board_token": "https://coreweave.com/careers/weights-biases"},
     {"name": "Mattermost", "type": "playwright", "board_token": "https://mattermost.com/careers/#openings"},
     {"name": "Buffer", "type": "playwright", "board_token": "https://buffer.com/journey"},
@@ -36,21 +36,24 @@ COMPANIES = [
     {"name": "Twilio", "type": "playwright", "board_token": "https://www.twilio.com/en-us/company/jobs"},
     {"name": "Sourcegraph", "type": "playwright", "board_token": "https://sourcegraph.com/jobs"},
     {"name": "Quiq", "type": "playwright", "board_token": "https://quiq.com/careers/"},
-    {"name": "PostHog", "type": "playwright", "board_token": "https://jobs.ashbyhq.com/posthog"},
-    {"name": "Sentry", "type": "playwright", "board_token": "https://jobs.ashbyhq.com/sentry"},
-    {"name": "Help Scout", "type": "playwright", "board_token": "https://jobs.ashbyhq.com/helpscout"},
-    {"name": "Notion", "type": "playwright", "board_token": "https://jobs.ashbyhq.com/notion"},
-    {"name": "ElevenLabs", "type": "playwright", "board_token": "https://jobs.ashbyhq.com/elevenlabs"},
-    {"name": "Dacagon", "type": "playwright", "board_token": "https://jobs.ashbyhq.com/dacagon"},
+    {"name": "PostHog", "type": "ashby", "board_token": "posthog"},
+    {"name": "Sentry", "type": "ashby", "board_token": "sentry"},
+    {"name": "Help Scout", "type": "ashby", "board_token": "helpscout"},
+    {"name": "Notion", "type": "ashby", "board_token": "notion"},
+    {"name": "ElevenLabs", "type": "ashby", "board_token": "elevenlabs"},
+    {"name": "Dacagon", "type": "ashby", "board_token": "dacagon"},
     {"name": "Dropbox", "type": "playwright", "board_token": "https://jobs.dropbox.com/all-jobs"},
     {"name": "Yelp", "type": "playwright", "board_token": "https://www.yelp.careers/us/en/search-results"},
-    {"name": "Airbnb", "type": "facetwp", "board_token": "https://careers.airbnb.com/positions/"},
-    {"name": "Akamai Technologies", "type": "playwright", "board_token": "https://fa-extu-saasfaprod1.fa.ocs.oraclecloud.com/hcmUI/CandidateExperience/en/sites/CX_1/jobs"},
+    # ready_selector ends the page-readiness wait as soon as the job list renders
+    {"name": "Airbnb", "type": "facetwp", "board_token": "https://careers.airbnb.com/positions/", "ready_selector": ".facetwp-template a[href]"},
+    # Oracle JET job lists do not render without their theme stylesheets
+    {"name": "Akamai Technologies", "type": "playwright", "board_token": "https://fa-extu-saasfaprod1.fa.ocs.oraclecloud.com/hcmUI/CandidateExperience/en/sites/CX_1/jobs", "allow_resource_types": ["stylesheet"]},
     {"name": "Alliants", "type": "playwright", "board_token": "https://alliants.careers.hibob.com/jobs"},
-    {"name": "Bonterra", "type": "playwright", "board_token": "https://bonterra.wd1.myworkdayjobs.com/bonterratech"},
+    {"name": "Bonterra", "type": "playwright", "board_token": "https://bonterra.wd1.myworkdayjobs.com/bonterratech", "ready_selector": "a[data-automation-id='jobTitle']"},
     {"name": "Dayforce", "type": "playwright", "board_token": "https://jobs.dayforcehcm.com/en-US/mydayforce/alljobs"},
-    {"name": "HubSpot", "type": "playwright", "board_token": "https://www.hubspot.com/careers/jobs?page=1"},
-    {"name": "Sinch", "type": "playwright", "board_token": "https://iaings.fa.ocs.oraclecloud.com/hcmUI/CandidateExperience/en/sites/CX_1/jobs"},
+    # HubSpot serves its own page scripts through its analytics and banner hosts
+    {"name": "HubSpot", "type": "playwright", "board_token": "https://www.hubspot.com/careers/jobs?page=1", "allow_resource_domains": ["hs-analytics.net", "hs-banner.com"]},
+    {"name": "Sinch", "type": "playwright", "board_token": "https://iaings.fa.ocs.oraclecloud.com/hcmUI/CandidateExperience/en/sites/CX_1/jobs", "allow_resource_types": ["stylesheet"]},
     # {"name": "Synoptek", "type": "playwright", "board_token": "https://careers.synoptek.com/jobs"},
     {"name": "Toast", "type": "playwright", "board_token": "https://careers.toasttab.com/jobs/search"},
     # Parallel ATS
@@ -1,23 +1,42 @@
 """Main orchestration script for job monitoring."""
 
-import json
-import os
 import re
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List
 from companies import COMPANIES
-from scrapers.greenhouse import scrape_greenhouse
-from scrapers.ashby import scrape_ashby
+from scrapers.greenhouse import (
+    PENDING_DESCRIPTION_SOURCE,
+    BoardUnchanged,
+    board_snapshot_key,
+    detail_worker_count,
+    fetch_greenhouse_description,
+    scrape_greenhouse,
+)
+from scrapers.ashby import legacy_seen_ids, scrape_ashby
 from scrapers.static import scrape_static, scrape_parallel
 from scrapers.playwright_scraper import scrape_playwright
 from scrapers.facetwp_scraper import scrape_facetwp
-from scrapers.job_details import enrich_job_details
+from scrapers.browser import close_browser
+from scrapers.readiness import ReadinessPlan
+from scrapers.resource_policy import resource_policy_for, resource_scope
+from scrapers.http_client import http_stats
+from scrapers.job_details import enrich_job_details, reload_stored_description
 from ai.analyzer import analyze_job
-from ai.title_filter import is_pm_role
+from ai.client import get_gemini_provider
+from ai.gemini import get_gemini_executor
+from ai.title_filter import is_pm_role_batch
 from agent.audit import RunAudit
-from agent.feedback import apply_feedback_calibration, feedback_id, load_feedback
-from agent.ledger import append_ledger_entry, append_run_audit, email_feedback_ids
+from agent.cache import AnalysisCache, PersistentCache, load_analysis_cache, load_title_cache
+from agent.descriptions import DescriptionStore, load_description_store
+from agent.readiness_hints import ReadinessHints, load_readiness_hints
+from agent.seen_store import SeenJobsStore, open_seen_store
+from agent.snapshots import BoardSnapshotStore, load_board_snapshots
+from agent.concurrency import HostLimiter, company_host, run_ordered, url_host, worker_count
+from agent.feedback import apply_analysis, feedback_id, load_feedback
+from agent.job import as_job
+from agent.ledger import email_feedback_ids, ledger_entry
+from agent.ledger_store import LedgerBackend, ledger_streaming, open_ledger
 from agent.url_repair import repair_job_url
-from agent.verification import apply_verification_caps, collapse_duplicate_jobs, verify_job
+from agent.verification import collapse_duplicate_jobs, verify_job
 from notifier.email import send_email
 
 TITLE_FILTER = (
@@ -26,144 +45,394 @@ TITLE_FILTER = (
     r'program manager|forward deployed|fde'
 )
 
+# Legacy seen-jobs file, imported once into the SQLite store
 SEEN_JOBS_FILE = "seen_jobs.json"
 
 
-def load_seen_jobs() -> Dict[str, List[str]]:
-    """Load previously seen job IDs from JSON file."""
-    if os.path.exists(SEEN_JOBS_FILE):
-        try:
-            with open(SEEN_JOBS_FILE, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading seen_jobs.json: {e}")
-            return {}
-    return {}
+def load_seen_jobs(store: SeenJobsStore) -> Dict[str, List[str]]:
+    """Load each company's current job IDs from the seen-jobs store."""
+    try:
+        return store.current_ids()
+    except Exception as e:
+        print(f"Error loading seen jobs: {e}")
+        return {}
 
 
-def save_seen_jobs(seen_jobs: Dict[str, List[str]]) -> None:
-    """Save seen job IDs to JSON file."""
+def save_seen_jobs(seen_jobs: Dict[str, List[str]], store: SeenJobsStore) -> bool:
+    """Write each company's current job IDs to the seen-jobs store."""
     try:
-        with open(SEEN_JOBS_FILE, "w") as f:
-            json.dump(seen_jobs, f, indent=2)
+        for company_name, job_ids in seen_jobs.items():
+            store.update_company(company_name, job_ids)
+        store.purge_removed()
+        return True
     except Exception as e:
-        print(f"Error saving seen_jobs.json: {e}")
+        print(f"Error saving seen jobs: {e}")
+        return False
 
 
-def get_new_jobs(all_jobs: List[Dict[str, str]], seen_ids: List[str]) -> List[Dict[str, str]]:
+def get_new_jobs(all_jobs: List[Dict[str, str]], seen_ids: Iterable[str]) -> List[Dict[str, str]]:
     """Filter out jobs that have been seen before."""
+    seen_ids = seen_ids if isinstance(seen_ids, (set, frozenset)) else set(seen_ids)
     return [job for job in all_jobs if job["id"] not in seen_ids]
 
 
+def filter_titles(jobs: List[Dict[str, str]], title_cache: PersistentCache = None) -> List[Dict[str, str]]:
+    """Keep PM-like titles: regex fast path, then one batched AI call for the rest."""
+    regex_matches = [
+        bool(re.search(TITLE_FILTER, job.get("title", ""), re.IGNORECASE))
+        for job in jobs
+    ]
+    # AI catches edge cases the regex misses
+    ai_titles = [job.get("title", "") for job, matched in zip(jobs, regex_matches) if not matched]
+    ai_decisions = is_pm_role_batch(ai_titles, cache=title_cache) if ai_titles else {}
+    return [
+        job
+        for job, matched in zip(jobs, regex_matches)
+        if matched or ai_decisions.get(job.get("title", ""), False)
+    ]
+
+
+def fetch_pending_descriptions(
+    company: Dict[str, Any],
+    jobs: List[Dict[str, Any]],
+    host_limiter: HostLimiter,
+    descriptions: DescriptionStore = None,
+) -> None:
+    """Fetch bodies for light-mode Greenhouse jobs that survived the seen and title filters."""
+    pending = [
+        job
+        for job in jobs
+        if job.get("description_source") == PENDING_DESCRIPTION_SOURCE
+        and not reload_stored_description(job, descriptions)
+    ]
+    if not pending:
+        return
+    board_token = company.get("board_token")
+    host = company_host(company)
+
+    def fetch(job):
+        with host_limiter.hold(host):
+            return fetch_greenhouse_description(board_token, job)
+
+    # Detail fetches report their own failures; enrich_job_details falls back to the posting page
+    for _ in run_ordered(pending, fetch, min(len(pending), detail_worker_count())):
+        pass
+
+
+class UnknownCompanyType(Exception):
+    """Raised when companies.py names a scraper type main does not know."""
+
+
+def scrape_company(
+    company: Dict[str, Any],
+    snapshots: BoardSnapshotStore = None,
+    readiness: ReadinessPlan = None,
+) -> List[Dict[str, str]]:
+    """Dispatch a company config to its scraper."""
+    company_name = company["name"]
+    company_type = company["type"]
+    board_token = company.get("board_token")
+
+    if company_type == "greenhouse":
+        return scrape_greenhouse(board_token, company_name, snapshots)
+    if company_type == "ashby":
+        return scrape_ashby(board_token, company_name)
+    if company_type == "static":
+        # For static companies, board_token is the URL
+        return scrape_static(board_token, company_name)
+    if company_type == "playwright":
+        # For playwright companies, board_token is the URL
+        return scrape_playwright(board_token, company_name, readiness)
+    if company_type == "facetwp":
+        return scrape_facetwp(board_token, company_name, readiness)
+    if company_type == "parallel":
+        return scrape_parallel(company["company_id"], company_name)
+    raise UnknownCompanyType(f"Unknown company type '{company_type}' for {company_name}")
+
+
+def evaluate_job(
+    job: Dict[str, Any],
+    feedback: Dict[str, Any],
+    analysis_cache: AnalysisCache = None,
+    descriptions: DescriptionStore = None,
+    host_limiter: HostLimiter = None,
+) -> Dict[str, Any]:
+    """Enrich, verify, score, and calibrate one title-filtered job.
+
+    The job host's slot is held only while its pages are fetched, so a slow
+    AI call does not block other companies' fetches from that host.
+    """
+    with (host_limiter or HostLimiter()).hold(url_host(str(job.get("url", "") or ""))):
+        enrich_job_details(job, descriptions)
+        job["feedback_id"] = feedback_id(job)
+        repair_job_url(job, store=descriptions)
+    job["verification"] = job.get("verification") or verify_job(job)
+    analysis = analyze_job(job, cache=analysis_cache)
+    apply_analysis(job, analysis, feedback)
+    return job
+
+
+def process_company(
+    company: Dict[str, Any],
+    seen_ids: Iterable[str],
+    feedback: Dict[str, Any],
+    host_limiter: HostLimiter = None,
+    title_cache: PersistentCache = None,
+    analysis_cache: AnalysisCache = None,
+    snapshots: BoardSnapshotStore = None,
+    descriptions: DescriptionStore = None,
+    readiness_hints: ReadinessHints = None,
+) -> Dict[str, Any]:
+    """Scrape, filter, and evaluate one company without touching shared run state.
+
+    The result records progress even when a step fails, so merge_company_result
+    can replay exactly what the sequential loop would have recorded. A board
+    snapshot is committed only when the company finishes without error.
+    Browser pages opened along the way use the company's resource policy,
+    and the requests it blocked are reported with the result. Listing pages
+    wait for readiness under the company's plan from readiness_hints.
+    """
+    readiness = readiness_hints.plan_for(company) if readiness_hints is not None else None
+    with resource_scope(resource_policy_for(company)) as resources:
+        result = _process_company(
+            company, seen_ids, feedback, host_limiter, title_cache, analysis_cache, snapshots, descriptions, readiness
+        )
+    result["resources_blocked"] = resources.requests
+    result["resource_estimated_bytes_avoided"] = resources.estimated_bytes_avoided
+    return result
+
+
+def _process_company(
+    company: Dict[str, Any],
+    seen_ids: Iterable[str],
+    feedback: Dict[str, Any],
+    host_limiter: HostLimiter,
+    title_cache: PersistentCache,
+    analysis_cache: AnalysisCache,
+    snapshots: BoardSnapshotStore,
+    descriptions: DescriptionStore,
+    readiness: ReadinessPlan = None,
+) -> Dict[str, Any]:
+    result = {
+        "company": company["name"],
+        "jobs": None,
+        "scraped_count": 0,
+        "duplicate_notes": [],
+        "new_count": None,
+        "candidate_count": 0,
+        "evaluated": [],
+        "error": "",
+        "error_detail": "",
+        "unchanged": False,
+        "bytes_saved": 0,
+    }
+    host_limiter = host_limiter or HostLimiter()
+    snapshot_key = board_snapshot_key(company.get("board_token")) if company["type"] == "greenhouse" else ""
+    # Without seen IDs (first run, lost state) a 304 would hide every posting
+    if not seen_ids:
+        snapshots = None
+
+    try:
+        try:
+            with host_limiter.hold(company_host(company)):
+                jobs = scrape_company(company, snapshots, readiness)
+        except UnknownCompanyType as e:
+            result["error"] = str(e)
+            result["error_detail"] = str(e)
+            return result
+        except BoardUnchanged as e:
+            # Every posting was already seen last run; skip dedupe, filtering, and evaluation
+            result["unchanged"] = True
+            result["scraped_count"] = e.job_count
+            result["bytes_saved"] = e.bytes_saved
+            result["new_count"] = 0
+            snapshots.commit(snapshot_key)
+            return result
+
+        result["scraped_count"] = len(jobs)
+        jobs, duplicate_notes = collapse_duplicate_jobs([as_job(job) for job in jobs])
+        result["jobs"] = jobs
+        result["duplicate_notes"] = duplicate_notes
+
+        # Filter to only new jobs
+        if company["type"] == "ashby":
+            # IDs recorded while the board was scraped with Playwright embed the posting UUID
+            seen_ids = set(seen_ids) | legacy_seen_ids(seen_ids)
+        new_jobs = get_new_jobs(jobs, seen_ids)
+        new_jobs_count = len(new_jobs)
+        filtered_jobs = filter_titles(new_jobs, title_cache)
+        result["new_count"] = new_jobs_count
+        result["candidate_count"] = len(filtered_jobs)
+        fetch_pending_descriptions(company, filtered_jobs, host_limiter, descriptions)
+
+        # Analyze jobs; score-based routing happens in merge_company_result
+        for job in filtered_jobs:
+            evaluate_job(job, feedback, analysis_cache, descriptions, host_limiter)
+            result["evaluated"].append(job)
+        if snapshots is not None and snapshot_key:
+            snapshots.commit(snapshot_key)
+    except Exception as e:
+        result["error"] = f"Error processing {company['name']}: {e}"
+        result["error_detail"] = str(e)
+        if snapshots is not None and snapshot_key:
+            snapshots.discard(snapshot_key)
+
+    return result
+
+
+def stream_ledger_entries(jobs: List[Dict[str, Any]], ledger: LedgerBackend, run_id: str) -> None:
+    """Write provisional (not-sent) entries now; email selection follows as its own record."""
+    if not jobs:
+        return
+    ledger.append_entries([ledger_entry(job, run_id, False) for job in jobs])
+    for job in jobs:
+        # The email renders from scores and summaries, never the description body
+        job.pop("description", None)
+    try:
+        ledger.flush()
+    except Exception as e:
+        # Entries stay buffered and are retried on the next flush
+        print(f"[WARN] Could not flush ledger entries: {e}")
+
+
+def merge_company_result(
+    result: Dict[str, Any],
+    state: Dict[str, Any],
+    audit: RunAudit,
+    ledger: LedgerBackend = None,
+) -> None:
+    """Fold one company's result into run state in the same order the sequential loop did."""
+    company_name = result["company"]
+    errors = state["errors"]
+    if result.get("resources_blocked"):
+        audit.record_resources(
+            company_name, result["resources_blocked"], result.get("resource_estimated_bytes_avoided", 0)
+        )
+
+    if result.get("unchanged"):
+        audit.record_scrape(company_name, result["scraped_count"])
+        audit.record_unchanged_board(company_name, result["bytes_saved"])
+        audit.record_candidates(company_name, 0, 0)
+        # Seen IDs stay as recorded when this snapshot was taken
+        print(f"{company_name}: board unchanged, 0 new jobs found")
+        return
+
+    if result["jobs"] is not None:
+        audit.record_scrape(company_name, result["scraped_count"])
+        audit.record_duplicates(result["duplicate_notes"])
+    if result["new_count"] is not None:
+        audit.record_candidates(company_name, result["new_count"], result["candidate_count"])
+
+    filtered_jobs = []
+    for job in result["evaluated"]:
+        state["evaluated_jobs"].append(job)
+        audit.record_evaluated(job)
+
+        if job["score"] < 7:
+            print(f"{company_name}: job '{job['title']}' scored {job['score']}/10 - skipped")
+            state["low_jobs_by_company"].setdefault(company_name, []).append(job)
+        else:
+            filtered_jobs.append(job)
+    if ledger is not None:
+        stream_ledger_entries(result["evaluated"], ledger, audit.run_id)
+
+    if result["error"]:
+        errors.append(result["error"])
+        audit.record_error(result["error"])
+        print(f"{company_name}: ERROR - {result['error_detail']}")
+        return
+
+    if filtered_jobs:
+        state["new_jobs_by_company"][company_name] = filtered_jobs
+    # Update seen jobs with all current IDs (both new and previously seen, dropping removed ones)
+    state["seen_jobs"][company_name] = [job["id"] for job in result["jobs"]]
+
+    # Print summary for this company
+    print(f"{company_name}: {len(filtered_jobs)} new jobs found")
+
+
 def main():
     """Main orchestration function."""
-    # Load previously seen jobs
-    seen_jobs = load_seen_jobs()
+    # Load previously seen jobs (importing the legacy JSON file on first run)
+    seen_store = open_seen_store(legacy_json=SEEN_JOBS_FILE)
+    seen_jobs = load_seen_jobs(seen_store)
+    # Membership also covers recently removed IDs, so a relisted posting is not re-sent
+    known_ids = seen_store.known_ids()
     feedback = load_feedback()
     audit = RunAudit()
-    evaluated_jobs = []
-    
-    # Scrape all companies
-    all_new_jobs_by_company = {}
-    all_low_jobs_by_company = {}
-    errors = []
-    
-    for company in COMPANIES:
-        company_name = company["name"]
-        company_type = company["type"]
-        board_token = company.get("board_token")
-        
+    host_limiter = HostLimiter()
+    title_cache = load_title_cache()
+    analysis_cache = load_analysis_cache()
+    snapshots = load_board_snapshots()
+    descriptions = load_description_store()
+    readiness_hints = load_readiness_hints()
+    workers = worker_count()
+    ledger = None
+    if ledger_streaming():
         try:
-            if company_type == "greenhouse":
-                jobs = scrape_greenhouse(board_token, company_name)
-            elif company_type == "ashby":
-                jobs = scrape_ashby(board_token, company_name)
-            elif company_type == "static":
-                # For static companies, board_token is the URL
-                jobs = scrape_static(board_token, company_name)
-            elif company_type == "playwright":
-                # For playwright companies, board_token is the URL
-                jobs = scrape_playwright(board_token, company_name)
-            elif company_type == "facetwp":
-                jobs = scrape_facetwp(board_token, company_name)
-            elif company_type == "parallel":
-                jobs = scrape_parallel(company["company_id"], company_name)
-            else:
-                error_msg = f"Unknown company type '{company_type}' for {company_name}"
-                errors.append(error_msg)
-                audit.record_error(error_msg)
-                print(f"{company_name}: ERROR - {error_msg}")
-                continue
-
-            audit.record_scrape(company_name, len(jobs))
-            jobs, duplicate_notes = collapse_duplicate_jobs(jobs)
-            audit.record_duplicates(duplicate_notes)
-            
-            # Get seen IDs for this company (default to empty list)
-            seen_ids = seen_jobs.get(company_name, [])
-            
-            # Filter to only new jobs
-            new_jobs = get_new_jobs(jobs, seen_ids)
-            new_jobs_count = len(new_jobs)
-            filtered_jobs = []
-            for job in new_jobs:
-                title = job.get("title", "")
-                if re.search(TITLE_FILTER, title, re.IGNORECASE):
-                    filtered_jobs.append(job)  # fast path, no API call
-                elif is_pm_role(title):
-                    filtered_jobs.append(job)  # AI catches edge cases
-            new_jobs = filtered_jobs
-            audit.record_candidates(company_name, new_jobs_count, len(new_jobs))
-
-            # Analyze and filter jobs by score
-            filtered_jobs = []
-            for job in new_jobs:
-                enrich_job_details(job)
-                job["feedback_id"] = feedback_id(job)
-                repair_job_url(job)
-                job["verification"] = job.get("verification") or verify_job(job)
-                analysis = analyze_job(job)
-                job["score"] = analysis["score"]
-                job["reason"] = analysis["reason"]
-                job["summary"] = analysis["summary"]
-                job["fit_tier"] = analysis.get("fit_tier", "")
-                job["competitive_angle"] = analysis.get("competitive_angle", "")
-                job["evidence"] = analysis.get("evidence", [])
-                job["concerns"] = analysis.get("concerns", [])
-                job["extraction"] = analysis.get("extraction", {})
-                apply_feedback_calibration(job, feedback)
-                apply_verification_caps(job)
-                evaluated_jobs.append(job)
-                audit.record_evaluated(job)
-                
-                if job["score"] < 7:
-                    print(f"{company_name}: job '{job['title']}' scored {job['score']}/10 - skipped")
-                    if company_name not in all_low_jobs_by_company:
-                        all_low_jobs_by_company[company_name] = []
-                    all_low_jobs_by_company[company_name].append(job)
-                else:
-                    filtered_jobs.append(job)
-            
-            if filtered_jobs:
-                all_new_jobs_by_company[company_name] = filtered_jobs
-                # Update seen jobs with all jobs (both new and previously seen)
-                all_job_ids = [job["id"] for job in jobs]
-                seen_jobs[company_name] = all_job_ids
-            else:
-                # Still update seen jobs with current job IDs (in case jobs were removed)
-                all_job_ids = [job["id"] for job in jobs]
-                seen_jobs[company_name] = all_job_ids
-            
-            # Print summary for this company
-            print(f"{company_name}: {len(filtered_jobs)} new jobs found")
-                
+            ledger = open_ledger()
         except Exception as e:
-            error_msg = f"Error processing {company_name}: {e}"
-            errors.append(error_msg)
-            audit.record_error(error_msg)
-            print(f"{company_name}: ERROR - {e}")
-            continue
-    
+            print(f"Error opening agent ledger, writing it after the email instead: {e}")
+    state = {
+        "seen_jobs": seen_jobs,
+        "evaluated_jobs": [],
+        "new_jobs_by_company": {},
+        "low_jobs_by_company": {},
+        "errors": [],
+    }
+    if workers > 1:
+        print(f"Running with {workers} concurrent company workers")
+
+    # Scrape all companies; results merge in COMPANIES order in either mode
+    results = run_ordered(
+        COMPANIES,
+        lambda company: process_company(
+            company,
+            known_ids.get(company["name"], set()),
+            feedback,
+            host_limiter,
+            title_cache,
+            analysis_cache,
+            snapshots,
+            descriptions,
+            readiness_hints,
+        ),
+        workers,
+        on_worker_exit=close_browser,
+    )
+    try:
+        for result in results:
+            merge_company_result(result, state, audit, ledger)
+    finally:
+        # A failed merge stops companies that have not started yet
+        results.close()
+        # Sequential runs lease pages on the main thread's shared browser
+        close_browser()
+    audit.record_http(http_stats())
+    audit.record_gemini(get_gemini_executor().stats)
+    get_gemini_provider().close()
+    for cache_name, cache in (("title_cache", title_cache), ("analysis_cache", analysis_cache)):
+        try:
+            cache.save()
+        except Exception as e:
+            print(f"Error saving {cache_name}: {e}")
+        audit.record_cache(cache_name, cache.stats())
+    try:
+        descriptions.save()
+    except Exception as e:
+        print(f"Error saving description index: {e}")
+    audit.record_descriptions(descriptions.stats())
+    try:
+        readiness_hints.save()
+    except Exception as e:
+        print(f"Error saving readiness hints: {e}")
+    audit.record_readiness(readiness_hints.stats())
+
+    evaluated_jobs = state["evaluated_jobs"]
+    all_new_jobs_by_company = state["new_jobs_by_company"]
+    all_low_jobs_by_company = state["low_jobs_by_company"]
+    errors = state["errors"]
+
     selected_feedback_ids = email_feedback_ids(
         all_new_jobs_by_company,
         all_low_jobs_by_company,
@@ -183,23 +452,43 @@ def main():
     if not email_sent:
         selected_feedback_ids = set()
         audit.record_email_selection(0)
-        run_audit = audit.to_dict()
 
     try:
-        for job in evaluated_jobs:
-            append_ledger_entry(
-                job,
-                audit.run_id,
-                (job.get("feedback_id") or feedback_id(job)) in selected_feedback_ids,
-            )
-        append_run_audit(run_audit)
+        streamed = ledger is not None
+        if not streamed:
+            ledger = open_ledger()
+            ledger.append_entries([
+                ledger_entry(
+                    job,
+                    audit.run_id,
+                    (job.get("feedback_id") or feedback_id(job)) in selected_feedback_ids,
+                )
+                for job in evaluated_jobs
+            ])
+        try:
+            if streamed and selected_feedback_ids:
+                ledger.record_email_selection(audit.run_id, selected_feedback_ids)
+            ledger.flush()
+            # The audit's own write is the one flush it cannot count
+            audit.record_ledger(ledger.stats())
+            ledger.append_run_audit(audit.to_dict())
+        finally:
+            ledger.close()
         print(f"Saved agent ledger for run {audit.run_id}")
     except Exception as e:
         print(f"Error saving agent ledger: {e}")
     
     # Save updated seen jobs
-    save_seen_jobs(seen_jobs)
-    print("Updated seen_jobs.json")
+    saved = save_seen_jobs(seen_jobs, seen_store)
+    seen_store.close()
+    if not saved:
+        return
+    print("Updated seen jobs store")
+    # Only after seen IDs are saved, so an unchanged board never hides unsaved postings
+    try:
+        snapshots.save()
+    except Exception as e:
+        print(f"Error saving board snapshots: {e}")
 
 
 if __name__ == "__main__":
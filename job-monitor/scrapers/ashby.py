@@ -1,92 +1,91 @@
-"""Ashby job board scraper."""
+"""Ashby job board scraper using the public posting API."""
 
-import requests
+import os
 import re
-from bs4 import BeautifulSoup
-from typing import List, Dict
-from urllib.parse import urljoin, urlparse
-
-
-def _extract_location_from_text(text: str) -> str:
-    """Try to extract location from surrounding text."""
-    # Common location patterns
-    location_patterns = [
-        r'(Remote|Remote\s*[–-]\s*\w+|Remote\s*\([^)]+\))',
-        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z]{2})',  # City, State
-        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z][a-z]+)',  # City, Country
-    ]
-    
-    for pattern in location_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-    
-    return ""
-
-
-def scrape_ashby(board_token: str, company_name: str) -> List[Dict[str, str]]:
+from typing import Any, Dict, Iterable, List, Set
+
+from scrapers.http_client import http_get
+from scrapers.job_details import extract_readable_text, normalize_description
+
+API_BASE = "https://api.ashbyhq.com/posting-api/job-board"
+BOARD_BASE = "https://jobs.ashbyhq.com"
+POSTING_ID_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+
+def ashby_api_base() -> str:
+    return os.getenv("JOB_ASHBY_API_BASE", API_BASE).rstrip("/")
+
+
+def include_descriptions(value: bool = None) -> bool:
+    """Whether scraped jobs keep the board's description text (JOB_ASHBY_DESCRIPTIONS, default on)."""
+    if value is not None:
+        return value
+    return os.getenv("JOB_ASHBY_DESCRIPTIONS", "1") != "0"
+
+
+def legacy_seen_ids(seen_ids: Iterable[str]) -> Set[str]:
+    """Posting UUIDs inside IDs recorded when these boards were rendered with Playwright.
+
+    Those IDs embedded the posting UUID in a URL slug; the API uses the bare UUID.
+    """
+    return {match for seen_id in seen_ids for match in POSTING_ID_PATTERN.findall(str(seen_id))}
+
+
+def _location(posting: Dict[str, Any]) -> str:
+    location = str(posting.get("location") or "").strip()
+    if posting.get("isRemote") and "remote" not in location.lower():
+        return f"{location} (Remote)" if location else "Remote"
+    return location
+
+
+def _description(posting: Dict[str, Any]) -> str:
+    description = normalize_description(posting.get("descriptionPlain", ""))
+    if not description and posting.get("descriptionHtml"):
+        description = extract_readable_text(posting["descriptionHtml"])
+    return description
+
+
+def scrape_ashby(board_token: str, company_name: str, descriptions: bool = None) -> List[Dict[str, str]]:
     """
-    Scrape Product Manager jobs from Ashby job board.
-    
+    Scrape Product Manager jobs from an Ashby job board.
+
+    One request to the posting API returns every listed posting with its
+    description, so these boards need neither a browser nor detail fetches.
+
     Args:
-        board_token: Ashby board token
+        board_token: Ashby job board name (jobs.ashbyhq.com/<name>)
         company_name: Company name for the returned job dicts
-        
+        descriptions: Keep description text; defaults to JOB_ASHBY_DESCRIPTIONS
+
     Returns:
-        List of job dicts with keys: id, title, location, url, company
-        
+        List of job dicts with keys: id, title, location, url, company,
+        plus description and description_source when descriptions are kept
+
     Raises:
-        Exception: If the page cannot be fetched or parsed
+        Exception: If the board cannot be fetched or parsed
     """
-    url = f"https://jobs.ashbyhq.com/{board_token}"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(f"{ashby_api_base()}/{board_token}")
         response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Failed to fetch page: {e}")
-    
-    try:
-        soup = BeautifulSoup(response.content, 'html.parser')
+        data = response.json()
     except Exception as e:
-        raise Exception(f"Failed to parse HTML: {e}")
-    
+        raise Exception(f"Failed to fetch Ashby board '{board_token}': {e}")
+
+    keep_descriptions = include_descriptions(descriptions)
     jobs = []
-    # Find all anchor tags that link to job listings (/jobs/{job-id})
-    all_links = soup.find_all('a', href=True)
-    
-    for link in all_links:
-        href = link.get('href', '')
-        link_text = link.get_text(strip=True)
-        
-        # Check if this is a job listing link (href contains /jobs/)
-        if '/jobs/' in href:
-            # Extract job ID from URL if possible
-            job_id_match = re.search(r'/jobs/([^/?]+)', href)
-            job_id = job_id_match.group(1) if job_id_match else href
-            
-            # Build full URL
-            job_url = urljoin(url, href)
-            
-            # Extract title from link text
-            title = link_text
-            
-            # Try to extract location from surrounding context
-            location = ""
-            parent = link.parent
-            if parent:
-                location_text = parent.get_text()
-                location = _extract_location_from_text(location_text)
-            
-            jobs.append({
-                "id": job_id,
-                "title": title,
-                "location": location,
-                "url": job_url,
-                "company": company_name
-            })
-    
+    for posting in data.get("jobs") or []:
+        if posting.get("isListed") is False or not posting.get("id"):
+            continue
+        job = {
+            "id": str(posting["id"]),
+            "title": re.sub(r"\s+", " ", str(posting.get("title") or "")).strip(),
+            "location": _location(posting),
+            "url": posting.get("jobUrl") or f"{BOARD_BASE}/{board_token}/{posting['id']}",
+            "company": company_name,
+        }
+        if keep_descriptions:
+            description = _description(posting)
+            job["description"] = description
+            job["description_source"] = "ashby_api" if description else "unavailable"
+        jobs.append(job)
     return jobs
@@ -0,0 +1,167 @@
+"""Run-scoped Playwright browser shared by scrapers and detail fetchers."""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+
+from scrapers.resource_policy import current_resource_scope
+
+DEFAULT_MAX_PAGES = 4
+DEFAULT_RECYCLE_AFTER = 50
+
+_local = threading.local()
+_page_slots: threading.BoundedSemaphore = None
+_page_slots_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def _default_playwright_factory():
+    from playwright.sync_api import sync_playwright
+
+    return sync_playwright()
+
+
+def _global_page_slots() -> threading.BoundedSemaphore:
+    """Bound open pages across every worker thread's browser."""
+    global _page_slots
+    with _page_slots_lock:
+        if _page_slots is None:
+            _page_slots = threading.BoundedSemaphore(_env_int("JOB_BROWSER_MAX_PAGES", DEFAULT_MAX_PAGES))
+        return _page_slots
+
+
+class BrowserManager:
+    """Start Chromium once and lease isolated contexts/pages from it.
+
+    Playwright's sync API is bound to the thread that started it, so each
+    worker thread owns one manager (see get_browser_manager).
+    """
+
+    def __init__(
+        self,
+        recycle_after: int = None,
+        page_slots: threading.BoundedSemaphore = None,
+        playwright_factory: Callable[[], Any] = None,
+        launch_options: Dict[str, Any] = None,
+    ):
+        self.recycle_after = recycle_after or _env_int("JOB_BROWSER_RECYCLE_AFTER", DEFAULT_RECYCLE_AFTER)
+        self.page_slots = page_slots
+        self.playwright_factory = playwright_factory or _default_playwright_factory
+        self.launch_options = launch_options or {"headless": True}
+        self.stats = {"launches": 0, "leases": 0, "recycles": 0, "crash_restarts": 0}
+        self._playwright = None
+        self._browser = None
+        self._leases_since_launch = 0
+
+    def _launch(self) -> None:
+        self._playwright = self.playwright_factory().start()
+        self._browser = self._playwright.chromium.launch(**self.launch_options)
+        self._leases_since_launch = 0
+        self.stats["launches"] += 1
+
+    def _shutdown(self) -> None:
+        browser, playwright = self._browser, self._playwright
+        self._browser = None
+        self._playwright = None
+        for closer in (getattr(browser, "close", None), getattr(playwright, "stop", None)):
+            if closer is None:
+                continue
+            try:
+                closer()
+            except Exception as exc:
+                print(f"[WARN] Browser shutdown failed: {exc}")
+
+    def _connected(self) -> bool:
+        if self._browser is None:
+            return False
+        try:
+            return bool(self._browser.is_connected())
+        except Exception:
+            return False
+
+    def _ensure_browser(self):
+        if self._browser is not None and not self._connected():
+            self.stats["crash_restarts"] += 1
+            print("[WARN] Chromium disconnected; relaunching shared browser")
+            self._shutdown()
+        if self._browser is None:
+            self._launch()
+        return self._browser
+
+    def _new_context(self, context_options: Dict[str, Any]):
+        try:
+            return self._ensure_browser().new_context(**context_options)
+        except Exception as exc:
+            # A crashed browser can still report connected; restart once and retry.
+            print(f"[WARN] Could not open browser context ({exc}); relaunching shared browser")
+            self.stats["crash_restarts"] += 1
+            self._shutdown()
+            return self._ensure_browser().new_context(**context_options)
+
+    @contextmanager
+    def page(self, **context_options: Any) -> Iterator[Any]:
+        """Lease a fresh page in its own browser context.
+
+        The calling thread's resource policy (see resource_scope) is routed
+        onto the context, so blocked requests are aborted before they load.
+        """
+        policy, usage = current_resource_scope()
+        if policy.enabled:
+            # Service workers fetch outside context.route, so they would bypass the policy
+            context_options = {"service_workers": "block", **context_options}
+        slots = self.page_slots or _global_page_slots()
+        with slots:
+            context = self._new_context(context_options)
+            if policy.enabled:
+                try:
+                    policy.install(context, usage)
+                except Exception as exc:
+                    print(f"[WARN] Could not install resource blocking: {exc}")
+            self.stats["leases"] += 1
+            self._leases_since_launch += 1
+            try:
+                yield context.new_page()
+            finally:
+                try:
+                    context.close()
+                except Exception as exc:
+                    print(f"[WARN] Browser context close failed: {exc}")
+                if self._leases_since_launch >= self.recycle_after:
+                    self.stats["recycles"] += 1
+                    self._shutdown()
+
+    def close(self) -> None:
+        self._shutdown()
+
+
+def get_browser_manager() -> BrowserManager:
+    """Return the calling thread's run-scoped browser manager."""
+    manager = getattr(_local, "manager", None)
+    if manager is None:
+        manager = BrowserManager()
+        _local.manager = manager
+    return manager
+
+
+@contextmanager
+def browser_page(**context_options: Any) -> Iterator[Any]:
+    """Lease a page from the shared browser for this thread."""
+    with get_browser_manager().page(**context_options) as page:
+        yield page
+
+
+def close_browser() -> None:
+    """Close the calling thread's browser; call at the end of a run or worker."""
+    manager = getattr(_local, "manager", None)
+    if manager is None:
+        return
+    _local.manager = None
+    manager.close()
+
@@ -1,10 +1,20 @@
 """FacetWP-based career site scraper (WordPress + FacetWP plugin)."""
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
 import re
 from typing import List, Dict
 from urllib.parse import urljoin
 
+from scrapers.browser import browser_page
+from scrapers.readiness import ReadinessPlan, act_when_ready, goto_when_ready
+from scrapers.soup import make_soup
+
+# Listing size plus first link, so a page of the same length still registers as new
+FACETWP_PROBE = """
+() => {
+    const links = document.querySelectorAll(".facetwp-template a[href]");
+    return links.length ? `${links.length}:${links[0].getAttribute("href")}` : "";
+}
+"""
+
 
 def _generate_id(url: str, title: str) -> str:
     slug = re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')[:50]
@@ -13,7 +23,7 @@ def _generate_id(url: str, title: str) -> str:
 
 
 def _parse_template(html: str, base_url: str, company_name: str) -> List[Dict[str, str]]:
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = make_soup(html)
     template = soup.find(class_='facetwp-template')
     if not template:
         return []
@@ -36,22 +46,20 @@ def _parse_template(html: str, base_url: str, company_name: str) -> List[Dict[st
     return jobs
 
 
-def scrape_facetwp(url: str, company_name: str) -> List[Dict[str, str]]:
+def scrape_facetwp(url: str, company_name: str, readiness: ReadinessPlan = None) -> List[Dict[str, str]]:
     """Scrape PM jobs from a FacetWP-powered WordPress careers site."""
+    readiness = readiness or ReadinessPlan()
     jobs = []
     seen_ids = set()
     last_page = 1
 
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(url, timeout=60000, wait_until='networkidle')
-            page.wait_for_timeout(3000)
+        with browser_page() as page:
+            goto_when_ready(page, url, readiness, FACETWP_PROBE)
 
             # Detect last page number
             html = page.content()
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = make_soup(html)
             last_page_el = soup.find(class_='facetwp-page last')
             last_page = int(last_page_el.get('data-page', 1)) if last_page_el else 1
             print(f"[DEBUG] {company_name}: {last_page} pages detected")
@@ -65,8 +73,10 @@ def scrape_facetwp(url: str, company_name: str) -> List[Dict[str, str]]:
             # Paginate through remaining pages
             for page_num in range(2, last_page + 1):
                 try:
-                    page.click(f'[data-page="{page_num}"]')
-                    page.wait_for_timeout(3000)
+                    # Wait for the AJAX refresh to swap the listing rather than a fixed sleep
+                    act_when_ready(
+                        page, lambda: page.click(f'[data-page="{page_num}"]'), readiness, FACETWP_PROBE
+                    )
                     for job in _parse_template(page.content(), url, company_name):
                         if job['id'] not in seen_ids:
                             seen_ids.add(job['id'])
@@ -75,8 +85,6 @@ def scrape_facetwp(url: str, company_name: str) -> List[Dict[str, str]]:
                     print(f"[WARN] {company_name}: page {page_num} failed: {e}")
                     break
 
-            browser.close()
-
     except Exception as e:
         print(f"Error scraping FacetWP for {company_name}: {e}")
 
@@ -1,33 +1,114 @@
 """Greenhouse job board scraper."""
 
+import hashlib
+import os
 import re
-import requests
 from typing import List, Dict
+from scrapers.http_client import http_get
 from scrapers.job_details import extract_greenhouse_description
 
+API_BASE = "https://boards-api.greenhouse.io/v1/boards"
+FETCH_MODES = ("light", "full")
+DEFAULT_FETCH_MODE = "full"
+# Light-mode jobs carry this until fetch_greenhouse_description fills them in
+PENDING_DESCRIPTION_SOURCE = "greenhouse_pending"
+DEFAULT_DETAIL_WORKERS = 4
 
-def scrape_greenhouse(board_token: str, company_name: str) -> List[Dict[str, str]]:
+
+def greenhouse_fetch_mode(value: str = None) -> str:
+    """full (default) embeds every body; light lists jobs without content and fetches bodies per job later."""
+    mode = (value or os.getenv("JOB_GREENHOUSE_FETCH_MODE", DEFAULT_FETCH_MODE)).strip().lower()
+    if mode not in FETCH_MODES:
+        print(f"[WARN] Unknown JOB_GREENHOUSE_FETCH_MODE '{mode}', using {DEFAULT_FETCH_MODE}")
+        return DEFAULT_FETCH_MODE
+    return mode
+
+
+def detail_worker_count() -> int:
+    """Concurrent single-job fetches per board (JOB_GREENHOUSE_DETAIL_WORKERS)."""
+    try:
+        return max(1, int(os.getenv("JOB_GREENHOUSE_DETAIL_WORKERS", DEFAULT_DETAIL_WORKERS)))
+    except (TypeError, ValueError):
+        return DEFAULT_DETAIL_WORKERS
+
+
+class BoardUnchanged(Exception):
+    """Raised when a board matches its last committed snapshot, so the company can be skipped."""
+
+    def __init__(self, board_token: str, job_count: int, bytes_saved: int):
+        super().__init__(f"Greenhouse board '{board_token}' unchanged")
+        self.job_count = job_count
+        self.bytes_saved = bytes_saved
+
+
+def board_snapshot_key(board_token: str) -> str:
+    return f"greenhouse/{board_token}"
+
+
+def _conditional_headers(snapshot: Dict) -> Dict[str, str]:
+    headers = {}
+    if snapshot and snapshot.get("etag"):
+        headers["If-None-Match"] = snapshot["etag"]
+    if snapshot and snapshot.get("last_modified"):
+        headers["If-Modified-Since"] = snapshot["last_modified"]
+    return headers
+
+
+def scrape_greenhouse(board_token: str, company_name: str, snapshots=None, mode: str = None) -> List[Dict[str, str]]:
     """
     Scrape Product Manager jobs from Greenhouse job board.
-    
+
     Args:
         board_token: Greenhouse board token
         company_name: Company name for the returned job dicts
-        
+        snapshots: Optional snapshot store (get/stage by key) for conditional requests
+        mode: "light" or "full"; defaults to JOB_GREENHOUSE_FETCH_MODE
+
     Returns:
         List of job dicts with keys: id, title, location, url, company
+
+    Raises:
+        BoardUnchanged: the board answered 304 or returned the same body as the last snapshot
     """
-    url = f"https://boards-api.greenhouse.io/v1/boards/{board_token}/jobs?content=true"
-    
+    mode = greenhouse_fetch_mode(mode)
+    url = f"{API_BASE}/{board_token}/jobs"
+    if mode == "full":
+        url += "?content=true"
+    key = board_snapshot_key(board_token)
+    previous = snapshots.get(key) if snapshots is not None else None
+    if previous and previous.get("mode", "full") != mode:
+        # Validators belong to the other URL; start over rather than risk a false 304
+        previous = None
+
     try:
-        response = requests.get(url, timeout=30)
+        response = http_get(url, headers=_conditional_headers(previous))
+        if response.status_code == 304 and previous:
+            raise BoardUnchanged(board_token, previous.get("job_count", 0), previous.get("bytes", 0))
         response.raise_for_status()
+
+        body = response.content
+        snapshot = {
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+            "sha256": hashlib.sha256(body).hexdigest(),
+            "bytes": int(response.headers.get("Content-Length") or len(body)),
+            "mode": mode,
+        }
+        if previous and previous.get("sha256") == snapshot["sha256"]:
+            # Same content under new validators; nothing was saved on the wire
+            snapshots.stage(key, dict(snapshot, job_count=previous.get("job_count", 0)))
+            raise BoardUnchanged(board_token, previous.get("job_count", 0), 0)
+
         data = response.json()
-        
+
         jobs = []
         for job in data.get("jobs", []):
             title = job.get("title", "")
-            description = extract_greenhouse_description(job.get("content", ""))
+            if mode == "full":
+                description = extract_greenhouse_description(job.get("content", ""))
+                description_source = "greenhouse_api" if description else "unavailable"
+            else:
+                description, description_source = "", PENDING_DESCRIPTION_SOURCE
             jobs.append({
                 "id": str(job.get("id", "")),
                 "title": title,
@@ -35,11 +116,36 @@ def scrape_greenhouse(board_token: str, company_name: str) -> List[Dict[str, str
                 "url": job.get("absolute_url", ""),
                 "company": company_name,
                 "description": description,
-                "description_source": "greenhouse_api" if description else "unavailable"
+                "description_source": description_source
             })
-        
+
+        if snapshots is not None:
+            snapshots.stage(key, dict(snapshot, job_count=len(jobs)))
         return jobs
+    except BoardUnchanged:
+        raise
     except Exception as e:
         # Return empty list on error, caller will handle error reporting
         print(f"Error scraping Greenhouse for {company_name}: {e}")
         return []
+
+
+def fetch_greenhouse_description(board_token: str, job: Dict[str, str]) -> Dict[str, str]:
+    """Fill a light-mode job's description from the single-job endpoint.
+
+    On failure the description stays empty so enrich_job_details can fall
+    back to the public posting page.
+    """
+    try:
+        response = http_get(f"{API_BASE}/{board_token}/jobs/{job['id']}")
+        response.raise_for_status()
+        description = extract_greenhouse_description(response.json().get("content", ""))
+    except Exception as e:
+        print(f"[WARN] Greenhouse detail fetch failed for {job.get('company', '')} job {job.get('id', '')}: {e}")
+        description = ""
+    job["description"] = description
+    if description:
+        job["description_source"] = "greenhouse_api"
+    else:
+        job.pop("description_source", None)
+    return job
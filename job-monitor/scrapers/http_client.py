@@ -0,0 +1,133 @@
+"""Shared pooled HTTP client for requests-based scrapers and fetchers."""
+
+import os
+import threading
+from typing import Any, Dict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = 20
+DEFAULT_RETRIES = 2
+DEFAULT_POOL_SIZE = 8
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+def _accept_encoding() -> str:
+    try:
+        import brotli  # noqa: F401
+
+        return "gzip, deflate, br"
+    except ImportError:
+        return "gzip, deflate"
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept-Encoding": _accept_encoding(),
+    "Connection": "keep-alive",
+}
+
+
+def _env_number(name: str, default: float, cast=float):
+    try:
+        return max(0, cast(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+class HttpClient:
+    """Keep one keep-alive session per host with shared timeout and retry policy."""
+
+    def __init__(self, timeout: float = None, retries: int = None, pool_size: int = None):
+        self.timeout = timeout if timeout is not None else _env_number("JOB_HTTP_TIMEOUT", DEFAULT_TIMEOUT)
+        self.retries = retries if retries is not None else _env_number("JOB_HTTP_RETRIES", DEFAULT_RETRIES, int)
+        self.pool_size = pool_size or max(1, _env_number("JOB_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE, int))
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _new_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=0.5,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size, max_retries=retry)
+        session = requests.Session()
+        session.headers.update(DEFAULT_HEADERS)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def session_for(self, url: str) -> requests.Session:
+        host = (urlparse(url or "").netloc or "").lower()
+        with self._lock:
+            if host not in self._sessions:
+                self._sessions[host] = self._new_session()
+            return self._sessions[host]
+
+    def get(self, url: str, timeout: float = None, **kwargs: Any) -> requests.Response:
+        return self.session_for(url).get(url, timeout=timeout or self.timeout, **kwargs)
+
+    def stats(self) -> Dict[str, int]:
+        """Connection reuse counters summed over every pooled connection."""
+        requests_sent = 0
+        connections = 0
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            for adapter in set(session.adapters.values()):
+                pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+                if pools is None:
+                    continue
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    requests_sent += getattr(pool, "num_requests", 0)
+                    connections += getattr(pool, "num_connections", 0)
+        return {
+            "http_hosts": len(sessions),
+            "http_requests": requests_sent,
+            "http_connections": connections,
+            "http_reused_connections": max(0, requests_sent - connections),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_client: HttpClient = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide pooled client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def http_get(url: str, timeout: float = None, **kwargs: Any) -> requests.Response:
+    """GET through the shared pooled client."""
+    return get_http_client().get(url, timeout=timeout, **kwargs)
+
+
+def http_stats() -> Dict[str, int]:
+    return get_http_client().stats()
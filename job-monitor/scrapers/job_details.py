@@ -1,21 +1,18 @@
 """Job detail enrichment utilities."""
 
 import re
-from typing import Dict
+from typing import Dict, List
 
-import requests
-from bs4 import BeautifulSoup
+from bs4 import Tag
+
+from scrapers.browser import browser_page
+from scrapers.http_client import http_get
+from scrapers.readiness import goto_when_ready
+from scrapers.soup import make_soup
 
 MAX_DESCRIPTION_CHARS = 12_000
 MIN_USEFUL_DESCRIPTION_CHARS = 300
 
-_HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    )
-}
-
 
 def normalize_description(text: str, max_chars: int = MAX_DESCRIPTION_CHARS) -> str:
     """Normalize readable job text and cap prompt size."""
@@ -23,33 +20,120 @@ def normalize_description(text: str, max_chars: int = MAX_DESCRIPTION_CHARS) ->
     return cleaned[:max_chars]
 
 
+# Subtrees that never hold posting text
+SKIPPED_TAGS = frozenset({"script", "style", "noscript", "svg", "header", "footer", "nav"})
+
+# Containers that may hold the posting, in preference order for equal-length text
+READABLE_SELECTORS = [
+    '[data-qa="job-description"]',
+    '[data-testid*="job"]',
+    '[class*="job-description"]',
+    '[class*="description"]',
+    '[id*="job-description"]',
+    "main",
+    "article",
+    "body",
+]
+
+
+def _attribute_text(tag: Tag, name: str) -> str:
+    value = tag.attrs.get(name)
+    if value is None:
+        return ""
+    # Multi-valued attributes such as class match against their space-joined form
+    return " ".join(value) if isinstance(value, list) else str(value)
+
+
+_SELECTOR_MATCHERS = (
+    lambda tag: tag.attrs.get("data-qa") == "job-description",
+    lambda tag: "job" in _attribute_text(tag, "data-testid"),
+    lambda tag: "job-description" in _attribute_text(tag, "class"),
+    lambda tag: "description" in _attribute_text(tag, "class"),
+    lambda tag: "job-description" in _attribute_text(tag, "id"),
+    lambda tag: tag.name == "main",
+    lambda tag: tag.name == "article",
+    lambda tag: tag.name == "body",
+)
+_NO_SELECTOR = len(_SELECTOR_MATCHERS)
+_BODY_RANK = READABLE_SELECTORS.index("body")
+_BODY_TAG_RE = re.compile(r"<body[\s/>]", re.IGNORECASE)
+_TEXT_TYPES = frozenset(Tag.MAIN_CONTENT_STRING_TYPES)
+
+
+def _selector_rank(tag: Tag) -> int:
+    """Index of the first READABLE_SELECTORS entry the tag matches."""
+    if not tag.attrs and tag.name not in ("main", "article", "body"):
+        return _NO_SELECTOR
+    for rank, matches in enumerate(_SELECTOR_MATCHERS):
+        if matches(tag):
+            return rank
+    return _NO_SELECTOR
+
+
 def extract_readable_text(html: str, max_chars: int = MAX_DESCRIPTION_CHARS) -> str:
-    """Extract readable text from a job-detail HTML page."""
-    soup = BeautifulSoup(html or "", "html.parser")
-    for tag in soup(["script", "style", "noscript", "svg", "header", "footer", "nav"]):
+    """Extract readable text from a job-detail HTML page.
+
+    Picks the READABLE_SELECTORS match with the longest text, earlier
+    selectors and then earlier nodes winning ties. One pass over the tree
+    sums each node's get_text(" ", strip=True) length bottom-up, so only
+    the chosen node is serialized.
+    """
+    soup = make_soup(html)
+    # lxml and selectolax wrap fragments in a <body>; only one from the markup is a candidate
+    explicit_body = not isinstance(html, str) or bool(_BODY_TAG_RE.search(html))
+    tags: List[Tag] = []
+    parents: List[int] = []
+    chars: List[int] = []
+    strings: List[int] = []
+    ranks: List[int] = []
+    skipped: List[Tag] = []
+
+    stack = [(soup, -1)]
+    while stack:
+        tag, parent = stack.pop()
+        index = len(tags)
+        tags.append(tag)
+        parents.append(parent)
+        ranks.append(_selector_rank(tag) if index else _NO_SELECTOR)
+        own_chars = own_strings = 0
+        for child in reversed(tag.contents):
+            if type(child) in _TEXT_TYPES:
+                length = len(child.strip())
+                if length:
+                    own_chars += length
+                    own_strings += 1
+            elif isinstance(child, Tag):
+                if child.name in SKIPPED_TAGS:
+                    skipped.append(child)
+                else:
+                    stack.append((child, index))
+        chars.append(own_chars)
+        strings.append(own_strings)
+
+    # Pre-order puts every child after its parent, so one reverse sweep totals subtrees
+    for index in range(len(tags) - 1, 0, -1):
+        parent = parents[index]
+        chars[parent] += chars[index]
+        strings[parent] += strings[index]
+
+    for tag in skipped:
         tag.decompose()
 
-    selectors = [
-        '[data-qa="job-description"]',
-        '[data-testid*="job"]',
-        '[class*="job-description"]',
-        '[class*="description"]',
-        '[id*="job-description"]',
-        "main",
-        "article",
-        "body",
-    ]
-    candidates = []
-    for selector in selectors:
-        for node in soup.select(selector):
-            text = node.get_text(" ", strip=True)
-            if text:
-                candidates.append(text)
-
-    if not candidates:
-        candidates.append(soup.get_text(" ", strip=True))
-
-    return normalize_description(max(candidates, key=len, default=""), max_chars)
+    best = None
+    for index, rank in enumerate(ranks):
+        if rank == _NO_SELECTOR or (rank == _BODY_RANK and not explicit_body):
+            continue
+        tag = tags[index]
+        if tag.name in soup.builder.string_containers:
+            # template/rt/rp only count their own string class; measure them directly
+            length = len(tag.get_text(" ", strip=True))
+        else:
+            length = chars[index] + strings[index] - 1 if strings[index] else 0
+        if length and (best is None or (-length, rank) < best[0]):
+            best = ((-length, rank), tag)
+
+    node = best[1] if best else soup
+    return normalize_description(node.get_text(" ", strip=True), max_chars)
 
 
 def extract_greenhouse_description(content_html: str) -> str:
@@ -57,13 +141,13 @@ def extract_greenhouse_description(content_html: str) -> str:
     return extract_readable_text(content_html)
 
 
-def fetch_job_description(url: str, timeout: int = 15) -> str:
+def fetch_job_description(url: str, timeout: int = None) -> str:
     """Fetch and extract readable job-description text from a public job URL."""
     if not url:
         return ""
 
     try:
-        response = requests.get(url, headers=_HEADERS, timeout=timeout)
+        response = http_get(url, timeout=timeout)
         response.raise_for_status()
         text = extract_readable_text(response.text)
         if len(text) >= MIN_USEFUL_DESCRIPTION_CHARS:
@@ -72,30 +156,45 @@ def fetch_job_description(url: str, timeout: int = 15) -> str:
         print(f"[WARN] requests detail fetch failed for {url}: {request_error}")
 
     try:
-        from playwright.sync_api import sync_playwright
-
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(url, timeout=60_000, wait_until="domcontentloaded")
-            page.wait_for_timeout(2_000)
+        with browser_page() as page:
+            goto_when_ready(page, url)
             html = page.content()
-            browser.close()
         return extract_readable_text(html)
     except Exception as playwright_error:
         print(f"[WARN] Playwright detail fetch failed for {url}: {playwright_error}")
         return ""
 
 
-def enrich_job_details(job: Dict[str, str]) -> Dict[str, str]:
-    """Ensure a job dict has normalized description text for scoring."""
+def reload_stored_description(job: Dict[str, str], store) -> bool:
+    """Fill an empty description from the description store by posting URL."""
+    if store is None:
+        return False
+    description = store.get_for_url(job.get("url", ""))
+    if not description:
+        return False
+    job["description"] = description
+    job["description_source"] = "description_store"
+    return True
+
+
+def enrich_job_details(job: Dict[str, str], store=None) -> Dict[str, str]:
+    """Ensure a job dict has normalized description text for scoring.
+
+    With a description store (put/get_for_url), text is saved by content hash
+    and a posting seen in an earlier run is reloaded instead of re-fetched.
+    """
     existing_description = normalize_description(job.get("description", ""))
     if existing_description:
         job["description"] = existing_description
         job.setdefault("description_source", "scraper")
-        return job
-
-    description = fetch_job_description(job.get("url", ""))
-    job["description"] = description
-    job["description_source"] = "url_fetch" if description else "unavailable"
+    elif not reload_stored_description(job, store):
+        description = fetch_job_description(job.get("url", ""))
+        job["description"] = description
+        job["description_source"] = "url_fetch" if description else "unavailable"
+
+    if store is not None and job["description"]:
+        try:
+            job["description_sha256"] = store.put(job["description"], job.get("url", ""))
+        except Exception as e:
+            print(f"[WARN] Could not store description for {job.get('url', '')}: {e}")
     return job
@@ -1,10 +1,84 @@
 """Playwright-based scraper for JS-rendered job boards."""
 
+import os
 import re
-from bs4 import BeautifulSoup
-from typing import List, Dict
+from typing import Any, List, Dict, Tuple
 from urllib.parse import urljoin, urlparse
-from playwright.sync_api import sync_playwright
+from scrapers.browser import browser_page
+from scrapers.readiness import LINK_COUNT_PROBE, ReadinessPlan, goto_when_ready
+from scrapers.soup import make_soup
+
+JOB_URL_KEYWORDS = ["/jobs/", "/job/", "/careers/", "/position", "/opening", "/role", "/apply"]
+UUID_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+EXCLUDED_URL_SEGMENTS = ['/guide', '/blog', '/roadmapping', '/resources', '/about', '/pricing']
+
+# Company-name keyword -> (host, path prefix) job links on that host must have
+COMPANY_JOB_PATHS = {"twilio": ("twilio.com", "/careers/job/")}
+
+# Common location patterns, searched case-insensitively in the anchor's parent text
+LOCATION_PATTERNS = [
+    r'(Remote|Remote\s*[–-]\s*\w+|Remote\s*\([^)]+\))',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z]{2})',  # City, State
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z][a-z]+)',  # City, Country
+]
+
+HARVEST_MODES = ("browser", "html")
+SAMPLE_LINKS = 5
+
+# Runs inside Chromium and mirrors _links_from_html: same href filter, title as
+# get_text(strip=True), location from the parent's text. Hrefs with an excluded URL
+# segment are dropped early to shrink the payload; _jobs_from_links still checks the
+# joined URL. Patterns come from Python so both modes share one definition; \w is
+# widened to Python's Unicode meaning. The page length is only needed when no links
+# are found, so it is left to PAGE_LENGTH_JS.
+HARVEST_LINKS_JS = """
+({keywords, uuidPattern, excludedSegments, locationPatterns, sampleLimit}) => {
+    const uuid = new RegExp(uuidPattern);
+    const locations = locationPatterns.map(
+        (source) => new RegExp(source.split("\\\\w").join("[\\\\p{L}\\\\p{N}_]"), "iu")
+    );
+    const skipped = new Set(["SCRIPT", "STYLE", "TEMPLATE"]);
+    const strings = (root) => {
+        const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT, {
+            acceptNode: (node) => {
+                if (node.nodeType === Node.TEXT_NODE) return NodeFilter.FILTER_ACCEPT;
+                return skipped.has(node.tagName) ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_SKIP;
+            },
+        });
+        const values = [];
+        while (walker.nextNode()) values.push(walker.currentNode.data);
+        return values;
+    };
+    const strippedText = (root) => strings(root).map((value) => value.trim()).filter(Boolean).join("");
+    const location = (root) => {
+        if (!root) return "";
+        const text = strings(root).join("");
+        for (const pattern of locations) {
+            const match = pattern.exec(text);
+            if (match) return match[1].trim();
+        }
+        return "";
+    };
+
+    const anchors = Array.from(document.querySelectorAll("a[href]"));
+    const seen = new Set();
+    const links = [];
+    for (const anchor of anchors) {
+        const href = anchor.getAttribute("href").trim();
+        if (!href || href.startsWith("#") || seen.has(href)) continue;
+        if (!keywords.some((keyword) => href.includes(keyword)) && !uuid.test(href)) continue;
+        seen.add(href);
+        const lowered = href.toLowerCase();
+        if (excludedSegments.some((segment) => lowered.includes(segment))) continue;
+        links.push({href, text: strippedText(anchor), location: location(anchor.parentElement)});
+    }
+    const samples = links.length ? [] : anchors.slice(0, sampleLimit).map(
+        (anchor) => ({href: anchor.getAttribute("href"), text: strippedText(anchor)})
+    );
+    return {links, samples};
+}
+"""
+PAGE_LENGTH_JS = "() => document.documentElement.outerHTML.length"
 
 
 def _slugify(text: str) -> str:
@@ -29,30 +103,38 @@ def _generate_id(url: str, title: str, company_name: str = "") -> str:
 
 def _is_valid_job_url(url: str) -> bool:
     """Check if URL is a valid job listing (excludes guide, blog, roadmapping, resources, about, pricing)."""
-    excluded_segments = ['/guide', '/blog', '/roadmapping', '/resources', '/about', '/pricing']
     url_lower = url.lower()
-    return not any(segment in url_lower for segment in excluded_segments)
+    return not any(segment in url_lower for segment in EXCLUDED_URL_SEGMENTS)
+
+
+def _company_job_path(company_name: str) -> Tuple[str, str]:
+    """The (host, path prefix) rule for a company's broad career page, or empty strings."""
+    name = company_name.lower()
+    for keyword, rule in COMPANY_JOB_PATHS.items():
+        if keyword in name:
+            return rule
+    return "", ""
 
 
 def _is_company_specific_job_url(url: str, company_name: str) -> bool:
     """Apply company-specific URL checks for broad career pages."""
     parsed = urlparse(url)
-    if "twilio" in company_name.lower() and "twilio.com" in parsed.netloc:
-        return parsed.path.startswith("/careers/job/")
+    host, path_prefix = _company_job_path(company_name)
+    if host and host in parsed.netloc:
+        return parsed.path.startswith(path_prefix)
 
     return True
 
 
+def _link_probe_arg(company_name: str) -> Dict[str, Any]:
+    """LINK_COUNT_PROBE arguments that count the links _jobs_from_links can accept."""
+    host, path_prefix = _company_job_path(company_name)
+    return {"keywords": JOB_URL_KEYWORDS, "uuidPattern": UUID_PATTERN.pattern, "host": host, "pathPrefix": path_prefix}
+
+
 def _extract_location_from_text(text: str) -> str:
     """Try to extract location from surrounding text."""
-    # Common location patterns
-    location_patterns = [
-        r'(Remote|Remote\s*[–-]\s*\w+|Remote\s*\([^)]+\))',
-        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z]{2})',  # City, State
-        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z][a-z]+)',  # City, Country
-    ]
-    
-    for pattern in location_patterns:
+    for pattern in LOCATION_PATTERNS:
         match = re.search(pattern, text, re.IGNORECASE)
         if match:
             return match.group(1).strip()
@@ -60,13 +142,106 @@ def _extract_location_from_text(text: str) -> str:
     return ""
 
 
-def scrape_playwright(url: str, company_name: str) -> List[Dict[str, str]]:
+def _harvest_mode() -> str:
+    mode = os.getenv("JOB_PLAYWRIGHT_HARVEST", "browser").strip().lower()
+    return mode if mode in HARVEST_MODES else "browser"
+
+
+def _is_candidate_href(href: str) -> bool:
+    return any(keyword in href for keyword in JOB_URL_KEYWORDS) or bool(UUID_PATTERN.search(href))
+
+
+def _links_from_html(html: str) -> Dict[str, Any]:
+    """Candidate job links from serialized page HTML, in the shape HARVEST_LINKS_JS returns."""
+    soup = make_soup(html)
+    anchors = soup.find_all('a', href=True)
+    seen_hrefs = set()
+    links = []
+    for anchor in anchors:
+        href = str(anchor.get('href', '')).strip()
+        if not href or href.startswith('#') or href in seen_hrefs or not _is_candidate_href(href):
+            continue
+        seen_hrefs.add(href)
+        parent = anchor.parent
+        links.append({
+            "href": href,
+            "text": anchor.get_text(strip=True),
+            "location": _extract_location_from_text(parent.get_text()) if parent else "",
+        })
+    samples = [] if links else [
+        {"href": str(anchor.get('href', '')), "text": anchor.get_text(strip=True)}
+        for anchor in anchors[:SAMPLE_LINKS]
+    ]
+    return {"page_length": len(html), "links": links, "samples": samples}
+
+
+def _harvest_in_browser(page) -> Dict[str, Any]:
+    harvest = page.evaluate(HARVEST_LINKS_JS, {
+        "keywords": JOB_URL_KEYWORDS,
+        "uuidPattern": UUID_PATTERN.pattern,
+        "excludedSegments": EXCLUDED_URL_SEGMENTS,
+        "locationPatterns": LOCATION_PATTERNS,
+        "sampleLimit": SAMPLE_LINKS,
+    })
+    if not harvest.get("links"):
+        # Serializing the page is only worth it for the zero-link diagnostics
+        harvest["page_length"] = page.evaluate(PAGE_LENGTH_JS)
+    return harvest
+
+
+def _jobs_from_links(harvest: Dict[str, Any], url: str, company_name: str) -> List[Dict[str, str]]:
+    """Turn harvested link records into job dicts; shared by both harvest modes."""
+    links = harvest.get("links") or []
+    print(f"[DEBUG] {company_name}: page length {harvest.get('page_length', 0)} chars, links found: {len(links)}")
+
+    if len(links) == 0 and harvest.get("page_length", 0) > 50000:
+        for link in harvest.get("samples") or []:
+            print(f"[SAMPLE LINK] {company_name}: href={link['href'][:80]} text={link['text'][:60]}")
+
+    jobs = []
+    for link in links:
+        title = re.sub(r'\s+', ' ', link["text"]).strip()
+        if len(title) < 5:
+            continue
+
+        job_url = urljoin(url, link["href"])
+
+        if not _is_company_specific_job_url(job_url, company_name):
+            continue
+
+        # Filter out non-job URLs (guide, blog, roadmapping, resources, about, pricing)
+        if not _is_valid_job_url(job_url):
+            continue
+
+        # Generate ID
+        job_id = _generate_id(job_url, title, company_name)
+
+        # Avoid duplicates
+        if not any(job['id'] == job_id for job in jobs):
+            jobs.append({
+                "id": job_id,
+                "title": title,
+                "location": link.get("location", ""),
+                "url": job_url,
+                "company": company_name
+            })
+
+    return jobs
+
+
+def scrape_playwright(url: str, company_name: str, readiness: ReadinessPlan = None) -> List[Dict[str, str]]:
     """
     Scrape Product Manager jobs from a JS-rendered career page using Playwright.
+
+    By default candidate links are harvested inside Chromium with one
+    page.evaluate call, so only compact link records cross into Python.
+    JOB_PLAYWRIGHT_HARVEST=html serializes the page and parses it instead,
+    which is also the fallback when the in-page script fails.
     
     Args:
         url: URL of the career page
         company_name: Company name for the returned job dicts
+        readiness: Selector and deadline for this company's page (default: env deadline)
         
     Returns:
         List of job dicts with keys: id, title, location, url, company
@@ -74,98 +249,30 @@ def scrape_playwright(url: str, company_name: str) -> List[Dict[str, str]]:
     Raises:
         Exception: If the page cannot be fetched or parsed
     """
-    with sync_playwright() as p:
-        # Launch headless Chromium browser
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
+    harvest = None
+    with browser_page() as page:
         try:
-            # Navigate to URL with 60s timeout and wait for domcontentloaded, then wait 3s
-            page.goto(url, timeout=60000, wait_until="domcontentloaded")
-            page.wait_for_timeout(3000)
-            
-            # Get page content
-            html_content = page.content()
-            
+            # Navigate, then wait until the job-link count settles instead of a fixed sleep
+            goto_when_ready(page, url, readiness or ReadinessPlan(), LINK_COUNT_PROBE, _link_probe_arg(company_name))
         except Exception as e:
-            browser.close()
             raise Exception(f"Failed to fetch page: {e}")
-        finally:
-            browser.close()
-        
+
+        if _harvest_mode() == "browser":
+            try:
+                harvest = _harvest_in_browser(page)
+            except Exception as e:
+                print(f"[WARN] {company_name}: in-browser link harvest failed, parsing page HTML: {e}")
+
+        if harvest is None:
+            try:
+                html_content = page.content()
+            except Exception as e:
+                raise Exception(f"Failed to fetch page: {e}")
+
+    if harvest is None:
         try:
-            # Parse HTML with BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
+            harvest = _links_from_html(html_content)
         except Exception as e:
             raise Exception(f"Failed to parse HTML: {e}")
-        
-        import re as _re
-        JOB_URL_KEYWORDS = ["/jobs/", "/job/", "/careers/", "/position", "/opening", "/role", "/apply"]
-        UUID_PATTERN = _re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
-
-        jobs = []
-        all_anchors = soup.find_all('a', href=True)
-        seen_hrefs = set()
-        candidate_anchors = []
-        for anchor in all_anchors:
-            href = anchor.get('href', '')
-            href_str = str(href).strip()
-            if (
-                href_str
-                and not href_str.startswith('#')
-                and href_str not in seen_hrefs
-                and (any(kw in href_str for kw in JOB_URL_KEYWORDS) or UUID_PATTERN.search(href_str))
-            ):
-                seen_hrefs.add(href_str)
-                candidate_anchors.append(('link', anchor))
-        print(f"[DEBUG] {company_name}: page length {len(html_content)} chars, links found: {len(candidate_anchors)}")
-
-        if len(candidate_anchors) == 0 and len(html_content) > 50000:
-            sample_links = soup.find_all('a', href=True)[:5]
-            for link in sample_links:
-                print(f"[SAMPLE LINK] {company_name}: href={link.get('href','')[:80]} text={link.get_text(strip=True)[:60]}")
-
-        for source, anchor in candidate_anchors:
-            if source == 'aria':
-                title = (anchor.get('aria-label', '') or '').strip()
-                if not title:
-                    title = anchor.get_text(strip=True)
-            else:
-                title = anchor.get_text(strip=True)
-            title = re.sub(r'\s+', ' ', title).strip()
-            if len(title) < 5:
-                continue
-
-            href = anchor.get('href')
-            if not href or not str(href).strip() or str(href).strip().startswith('#'):
-                continue
-            job_url = urljoin(url, href)
-
-            if not _is_company_specific_job_url(job_url, company_name):
-                continue
-
-            # Filter out non-job URLs (guide, blog, roadmapping, resources, about, pricing)
-            if not _is_valid_job_url(job_url):
-                continue
-
-            # Try to extract location from anchor's parent context
-            location = ""
-            parent = anchor.parent
-            if parent:
-                location_text = parent.get_text()
-                location = _extract_location_from_text(location_text)
-
-            # Generate ID
-            job_id = _generate_id(job_url, title, company_name)
-
-            # Avoid duplicates
-            if not any(job['id'] == job_id for job in jobs):
-                jobs.append({
-                    "id": job_id,
-                    "title": title,
-                    "location": location,
-                    "url": job_url,
-                    "company": company_name
-                })
-
-        return jobs
+
+    return _jobs_from_links(harvest, url, company_name)
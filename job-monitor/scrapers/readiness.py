@@ -0,0 +1,231 @@
+"""Adaptive page readiness for Playwright loads instead of fixed sleeps.
+
+A page counts as ready when the first of these happens:
+- a per-company selector appears ("selector"),
+- a probe value (job-link count, text length) is non-empty and unchanged
+  for a short window, twice as long while requests are in flight ("stable"),
+- no request has been in flight for a short window and the probe has
+  stopped moving ("network_idle"); after a navigation an empty probe only
+  counts once JOB_READY_EMPTY_IDLE_MS has passed,
+- the hard deadline passes ("deadline").
+
+The probe is polled every JOB_READY_POLL_MS. Each result records when the
+probe last changed (settled_ms). Navigation results are reported to the
+plan, which agent.readiness_hints learns from to tighten a company's
+deadline in later runs.
+"""
+
+import os
+import time
+from typing import Any, Callable, Dict
+
+DEFAULT_DEADLINE_MS = 10_000
+DEFAULT_DETAIL_DEADLINE_MS = 3_000
+DEFAULT_STABLE_MS = 600
+DEFAULT_IDLE_MS = 500
+DEFAULT_POLL_MS = 150
+# Navigation waits do not end on network idle while the probe is still empty
+# until this much time has passed, so a late data request still counts
+DEFAULT_EMPTY_IDLE_MS = 3_000
+
+# Count candidate job links: a raw href with one of the keywords or a posting UUID.
+# With a host, links on that host also need a path starting with pathPrefix.
+LINK_COUNT_PROBE = """
+({keywords, uuidPattern, host, pathPrefix}) => {
+    const uuid = new RegExp(uuidPattern);
+    return Array.from(document.querySelectorAll("a[href]")).filter((anchor) => {
+        const href = anchor.getAttribute("href").trim();
+        if (!href || href.startsWith("#")) return false;
+        if (!keywords.some((keyword) => href.includes(keyword)) && !uuid.test(href)) return false;
+        return !host || !anchor.host.includes(host) || anchor.pathname.startsWith(pathPrefix);
+    }).length;
+}
+"""
+TEXT_LENGTH_PROBE = "() => document.body ? document.body.innerText.length : 0"
+
+_NO_BASELINE = object()
+
+
+def _env_ms(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+class ReadinessPlan:
+    """How to wait for one company's pages, and where to report how long it took."""
+
+    def __init__(
+        self,
+        selector: str = "",
+        deadline_ms: int = None,
+        on_result: Callable[[Dict[str, Any]], None] = None,
+    ):
+        self.selector = selector or ""
+        self.deadline_ms = deadline_ms if deadline_ms is not None else _env_ms("JOB_READY_DEADLINE_MS", DEFAULT_DEADLINE_MS)
+        self.on_result = on_result
+
+    def report(self, result: Dict[str, Any]) -> None:
+        if self.on_result is not None:
+            self.on_result(result)
+
+
+class PageReadiness:
+    """Watch a page's requests from before navigation, then wait until it is ready.
+
+    Attach before page.goto so requests started during navigation count as in flight.
+    """
+
+    def __init__(self, page: Any, clock: Callable[[], float] = None):
+        self.page = page
+        self.clock = clock or time.monotonic
+        self.inflight = 0
+        self.last_activity = self.clock()
+        page.on("request", self._started)
+        page.on("requestfinished", self._finished)
+        page.on("requestfailed", self._finished)
+
+    def _started(self, request: Any) -> None:
+        self.inflight += 1
+        self.last_activity = self.clock()
+
+    def _finished(self, request: Any) -> None:
+        self.inflight = max(0, self.inflight - 1)
+        self.last_activity = self.clock()
+
+    def network_idle_ms(self) -> float:
+        if self.inflight:
+            return 0.0
+        return (self.clock() - self.last_activity) * 1000
+
+    def close(self) -> None:
+        for event, handler in (
+            ("request", self._started),
+            ("requestfinished", self._finished),
+            ("requestfailed", self._finished),
+        ):
+            try:
+                self.page.remove_listener(event, handler)
+            except Exception:
+                pass
+
+    def _probe(self, probe: str, probe_arg: Any) -> Any:
+        try:
+            return self.page.evaluate(probe, probe_arg)
+        except Exception:
+            # The document can be mid-navigation; try again on the next poll
+            return None
+
+    def _selector_present(self, selector: str) -> bool:
+        try:
+            return self.page.query_selector(selector) is not None
+        except Exception:
+            return False
+
+    def wait(
+        self,
+        probe: str = TEXT_LENGTH_PROBE,
+        probe_arg: Any = None,
+        selector: str = "",
+        deadline_ms: int = DEFAULT_DEADLINE_MS,
+        baseline: Any = _NO_BASELINE,
+        stable_ms: int = None,
+        idle_ms: int = None,
+        poll_ms: int = None,
+        empty_idle_ms: int = 0,
+    ) -> Dict[str, Any]:
+        """Poll until ready; with a baseline, nothing counts until the probe moves off it.
+
+        Network idle only ends a wait whose probe is still empty once empty_idle_ms has passed.
+        """
+        stable_ms = stable_ms if stable_ms is not None else _env_ms("JOB_READY_STABLE_MS", DEFAULT_STABLE_MS)
+        idle_ms = idle_ms if idle_ms is not None else _env_ms("JOB_READY_IDLE_MS", DEFAULT_IDLE_MS)
+        poll_ms = max(1, poll_ms if poll_ms is not None else _env_ms("JOB_READY_POLL_MS", DEFAULT_POLL_MS))
+
+        started = self.clock()
+        last_value = _NO_BASELINE
+        changed_at = started
+        settled_ms = 0.0
+        while True:
+            now = self.clock()
+            elapsed_ms = (now - started) * 1000
+            value = self._probe(probe, probe_arg)
+            if value != last_value:
+                last_value = value
+                changed_at = now
+                if value:
+                    settled_ms = elapsed_ms
+            stable_for_ms = (now - changed_at) * 1000
+
+            signal = ""
+            if baseline is _NO_BASELINE or value != baseline:
+                if selector and self._selector_present(selector):
+                    signal = "selector"
+                elif value and stable_for_ms >= (stable_ms if not self.inflight else 2 * stable_ms):
+                    # A loading shell can hold still while its data request is in flight
+                    signal = "stable"
+                elif (
+                    self.network_idle_ms() >= idle_ms
+                    and stable_for_ms >= poll_ms
+                    and (value or elapsed_ms >= empty_idle_ms)
+                ):
+                    signal = "network_idle"
+            if not signal and elapsed_ms >= deadline_ms:
+                signal = "deadline"
+            if signal:
+                return {
+                    "signal": signal,
+                    "elapsed_ms": round(elapsed_ms),
+                    "settled_ms": round(settled_ms),
+                    "deadline_ms": deadline_ms,
+                    "value": value,
+                }
+            self.page.wait_for_timeout(poll_ms)
+
+
+def goto_when_ready(
+    page: Any,
+    url: str,
+    plan: ReadinessPlan = None,
+    probe: str = TEXT_LENGTH_PROBE,
+    probe_arg: Any = None,
+    timeout: int = 60_000,
+    wait_until: str = "domcontentloaded",
+) -> Dict[str, Any]:
+    """Navigate, wait for readiness under plan, and report the result to it."""
+    plan = plan or ReadinessPlan(deadline_ms=_env_ms("JOB_DETAIL_READY_DEADLINE_MS", DEFAULT_DETAIL_DEADLINE_MS))
+    readiness = PageReadiness(page)
+    try:
+        page.goto(url, timeout=timeout, wait_until=wait_until)
+        result = readiness.wait(
+            probe,
+            probe_arg,
+            selector=plan.selector,
+            deadline_ms=plan.deadline_ms,
+            empty_idle_ms=_env_ms("JOB_READY_EMPTY_IDLE_MS", DEFAULT_EMPTY_IDLE_MS),
+        )
+    finally:
+        readiness.close()
+    plan.report(result)
+    return result
+
+
+def act_when_ready(
+    page: Any,
+    action: Callable[[], Any],
+    plan: ReadinessPlan,
+    probe: str = TEXT_LENGTH_PROBE,
+    probe_arg: Any = None,
+) -> Dict[str, Any]:
+    """Run an in-page action (a click) and wait until the probe moves off its prior value and settles.
+
+    Not reported to the plan: its settle times describe the action, not a page load.
+    """
+    readiness = PageReadiness(page)
+    try:
+        baseline = readiness._probe(probe, probe_arg)
+        action()
+        return readiness.wait(probe, probe_arg, deadline_ms=plan.deadline_ms, baseline=baseline)
+    finally:
+        readiness.close()
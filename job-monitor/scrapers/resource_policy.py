@@ -0,0 +1,181 @@
+"""Request blocking for Playwright pages that only need the rendered DOM.
+
+Pages leased through scrapers.browser abort image, media, font and
+stylesheet requests and requests to known analytics/ad domains. Companies
+whose pages break without some of them list exceptions in companies.py:
+
+    {"name": ..., "allow_resource_types": ["stylesheet"], "allow_resource_domains": ["hs-scripts.com"]}
+
+Environment:
+    JOB_BROWSER_BLOCK_RESOURCES   "0" turns blocking off (default on)
+    JOB_BROWSER_BLOCKED_TYPES     comma-separated resource types (default image,media,font,stylesheet)
+    JOB_BROWSER_BLOCKED_DOMAINS   extra comma-separated domains to block
+"""
+
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional
+from urllib.parse import urlparse
+
+DEFAULT_BLOCKED_TYPES = ("image", "media", "font", "stylesheet")
+
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "facebook.net",
+    "connect.facebook.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "hotjar.com",
+    "fullstory.com",
+    "segment.com",
+    "segment.io",
+    "heapanalytics.com",
+    "mixpanel.com",
+    "amplitude.com",
+    "optimizely.com",
+    "hs-analytics.net",
+    "hs-banner.com",
+    "licdn.com",
+    "ads.linkedin.com",
+    "twitter.com/i/adsct",
+    "ads-twitter.com",
+    "tiktok.com/i18n/pixel",
+    "quantserve.com",
+    "newrelic.com",
+    "nr-data.net",
+    "6sc.co",
+    "demandbase.com",
+    "bizible.com",
+    "marketo.net",
+    "qualified.com",
+    "drift.com",
+    "intercomcdn.com",
+)
+
+# Rough transfer sizes for requests that were never made, so avoided bytes are estimates
+ESTIMATED_BYTES = {
+    "image": 30_000,
+    "media": 250_000,
+    "font": 35_000,
+    "stylesheet": 20_000,
+    "script": 25_000,
+}
+DEFAULT_ESTIMATED_BYTES = 5_000
+
+_local = threading.local()
+
+
+def _env_list(name: str, default: Iterable[str]) -> tuple:
+    value = os.getenv(name)
+    if value is None:
+        return tuple(default)
+    return tuple(item.strip().lower() for item in value.split(",") if item.strip())
+
+
+def _host_matches(host: str, path: str, domains: Iterable[str]) -> bool:
+    for domain in domains:
+        domain_host, _, domain_path = domain.partition("/")
+        if (host == domain_host or host.endswith("." + domain_host)) and (
+            not domain_path or path.startswith("/" + domain_path)
+        ):
+            return True
+    return False
+
+
+class ResourceUsage:
+    """Requests a policy blocked, by resource type, with estimated bytes avoided."""
+
+    def __init__(self):
+        self.requests = 0
+        self.estimated_bytes_avoided = 0
+        self.by_type = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, resource_type: str) -> None:
+        with self._lock:
+            self.requests += 1
+            self.estimated_bytes_avoided += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+            self.by_type[resource_type] += 1
+
+
+class ResourcePolicy:
+    """Decide which Playwright requests to abort."""
+
+    def __init__(
+        self,
+        blocked_types: Iterable[str] = DEFAULT_BLOCKED_TYPES,
+        blocked_domains: Iterable[str] = TRACKER_DOMAINS,
+        allowed_types: Iterable[str] = (),
+        allowed_domains: Iterable[str] = (),
+        enabled: bool = True,
+    ):
+        allowed_types = {value.lower() for value in allowed_types}
+        self.blocked_types = frozenset(value.lower() for value in blocked_types) - allowed_types
+        self.blocked_domains = tuple(value.lower() for value in blocked_domains)
+        self.allowed_domains = tuple(value.lower() for value in allowed_domains)
+        self.enabled = enabled
+
+    def block_reason(self, resource_type: str, url: str) -> str:
+        """Why a request should be aborted ("tracker" or its resource type); "" lets it through."""
+        if not self.enabled:
+            return ""
+        parsed = urlparse(url or "")
+        if parsed.scheme not in ("http", "https"):
+            return ""
+        host = (parsed.hostname or "").lower()
+        path = parsed.path or "/"
+        if _host_matches(host, path, self.allowed_domains):
+            return ""
+        if _host_matches(host, path, self.blocked_domains):
+            return "tracker"
+        return resource_type if resource_type in self.blocked_types else ""
+
+    def install(self, context: Any, usage: ResourceUsage) -> None:
+        """Route every request of a Playwright browser context through this policy."""
+
+        def handle(route, request):
+            resource_type = request.resource_type
+            if self.block_reason(resource_type, request.url):
+                usage.record(resource_type)
+                route.abort("blockedbyclient")
+            else:
+                route.continue_()
+
+        context.route("**/*", handle)
+
+
+def resource_policy_for(company: Optional[Dict[str, Any]] = None) -> ResourcePolicy:
+    """The env-configured policy with a company's allowlist applied."""
+    company = company or {}
+    return ResourcePolicy(
+        blocked_types=_env_list("JOB_BROWSER_BLOCKED_TYPES", DEFAULT_BLOCKED_TYPES),
+        blocked_domains=TRACKER_DOMAINS + _env_list("JOB_BROWSER_BLOCKED_DOMAINS", ()),
+        allowed_types=company.get("allow_resource_types") or (),
+        allowed_domains=company.get("allow_resource_domains") or (),
+        enabled=os.getenv("JOB_BROWSER_BLOCK_RESOURCES", "1") != "0",
+    )
+
+
+@contextmanager
+def resource_scope(policy: ResourcePolicy) -> Iterator[ResourceUsage]:
+    """Apply policy to pages this thread leases inside the block and count what it blocks."""
+    previous = getattr(_local, "scope", None)
+    usage = ResourceUsage()
+    _local.scope = (policy, usage)
+    try:
+        yield usage
+    finally:
+        _local.scope = previous
+
+
+def current_resource_scope():
+    """(policy, usage) for this thread; outside resource_scope, the default policy and a throwaway counter."""
+    scope = getattr(_local, "scope", None)
+    if scope is None:
+        return resource_policy_for(), ResourceUsage()
+    return scope
@@ -0,0 +1,106 @@
+"""BeautifulSoup construction with a configurable HTML parser backend.
+
+JOB_HTML_PARSER picks the backend: "lxml" (default), "selectolax" or
+"html.parser". A backend whose package is not installed falls back to the
+pure-Python html.parser with one warning. Call sites keep the BeautifulSoup
+API whichever backend builds the tree.
+"""
+
+import os
+import threading
+from typing import Set, Union
+
+from bs4 import BeautifulSoup, Comment
+from bs4.builder import HTMLParserTreeBuilder
+
+HTML_PARSERS = ("lxml", "selectolax", "html.parser")
+DEFAULT_HTML_PARSER = "lxml"
+FALLBACK_HTML_PARSER = "html.parser"
+
+_warned: Set[str] = set()
+_warn_lock = threading.Lock()
+
+
+class SelectolaxTreeBuilder(HTMLParserTreeBuilder):
+    """Build a BeautifulSoup tree from selectolax's lexbor (C, HTML5) parse.
+
+    Reuses html.parser's encoding detection, then replays the lexbor tree as
+    start/data/end events. Like lxml, documents gain html/head/body and
+    <template> contents are dropped.
+    """
+
+    NAME = "selectolax"
+    ALTERNATE_NAMES = ["lexbor"]
+    features = [NAME] + ALTERNATE_NAMES + ["html", "fast"]
+
+    def feed(self, markup: str) -> None:
+        from selectolax.lexbor import LexborHTMLParser
+
+        soup = self.soup
+        root = LexborHTMLParser(markup).root
+        if root is None:
+            return
+        stack = [(root, False)]
+        while stack:
+            node, closing = stack.pop()
+            if closing:
+                soup.endData()
+                soup.handle_endtag(node.tag)
+                continue
+            tag = node.tag
+            if tag == "-text":
+                soup.handle_data(node.text_content or "")
+            elif tag == "-comment":
+                soup.endData()
+                soup.handle_data(node.comment_content or "")
+                soup.endData(Comment)
+            elif not tag.startswith(("-", "_", "#")):
+                # Boolean attributes come back as None; html.parser reports them as ""
+                attributes = {name: value or "" for name, value in node.attributes.items()}
+                soup.handle_starttag(tag, None, None, attributes)
+                stack.append((node, True))
+                children = []
+                child = node.child
+                while child is not None:
+                    children.append(child)
+                    child = child.next
+                stack.extend((child, False) for child in reversed(children))
+
+
+def _available(parser: str) -> bool:
+    try:
+        if parser == "lxml":
+            import lxml.etree  # noqa: F401
+        elif parser == "selectolax":
+            import selectolax.lexbor  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _warn_once(message: str) -> None:
+    with _warn_lock:
+        if message in _warned:
+            return
+        _warned.add(message)
+    print(f"[WARN] {message}")
+
+
+def html_parser_name(parser: str = None) -> str:
+    """The backend to use: parser, else JOB_HTML_PARSER, else lxml; html.parser when unavailable."""
+    name = (parser or os.getenv("JOB_HTML_PARSER", DEFAULT_HTML_PARSER) or DEFAULT_HTML_PARSER).strip().lower()
+    if name not in HTML_PARSERS:
+        _warn_once(f"Unknown HTML parser '{name}'; using {FALLBACK_HTML_PARSER}")
+        return FALLBACK_HTML_PARSER
+    if not _available(name):
+        _warn_once(f"HTML parser '{name}' is not installed; using {FALLBACK_HTML_PARSER}")
+        return FALLBACK_HTML_PARSER
+    return name
+
+
+def make_soup(markup: Union[str, bytes], parser: str = None) -> BeautifulSoup:
+    """Parse HTML with the configured backend."""
+    name = html_parser_name(parser)
+    if name == "selectolax":
+        return BeautifulSoup(markup or "", builder=SelectolaxTreeBuilder())
+    return BeautifulSoup(markup or "", name)
@@ -2,10 +2,12 @@
 
 import requests
 import re
-from bs4 import BeautifulSoup
 from typing import List, Dict
 from urllib.parse import urljoin, urlparse, urlencode
 
+from scrapers.http_client import http_get
+from scrapers.soup import make_soup
+
 
 def _slugify(text: str) -> str:
     """Convert text to a URL-friendly slug."""
@@ -62,18 +64,14 @@ def scrape_static(url: str, company_name: str) -> List[Dict[str, str]]:
     Raises:
         Exception: If the page cannot be fetched or parsed
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         raise Exception(f"Failed to fetch page: {e}")
     
     try:
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = make_soup(response.content)
     except Exception as e:
         raise Exception(f"Failed to parse HTML: {e}")
     
@@ -153,7 +151,7 @@ def scrape_parallel(company_id: str, company_name: str) -> List[Dict[str, str]]:
         url = "https://api.useparallel.com/find-jobs?" + urlencode(params)
 
         try:
-            resp = requests.get(url, timeout=10, headers=headers)
+            resp = http_get(url, headers=headers)
             resp.raise_for_status()
             data = resp.json()
         except Exception as e:
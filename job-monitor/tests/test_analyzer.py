@@ -1,8 +1,12 @@
 import json
 import os
+import tempfile
 import unittest
 
+from agent.cache import AnalysisCache, PersistentCache
 from ai import analyzer
+from ai.client import GeminiClientProvider, get_gemini_provider, set_gemini_provider
+from ai.gemini import GeminiExecutor, get_gemini_executor, set_gemini_executor
 
 
 class _FakeResponse:
@@ -13,8 +17,10 @@ class _FakeResponse:
 class _FakeModels:
     def __init__(self, response_text):
         self.response_text = response_text
+        self.calls = []
 
     def generate_content(self, model, contents):
+        self.calls.append(model)
         return _FakeResponse(self.response_text)
 
 
@@ -27,21 +33,28 @@ def _long_description(text):
     return (text + " ") * 25
 
 
+def _unthrottled_executor():
+    return GeminiExecutor(model_limits={"gemini-2.5-flash": (10_000, 10**9), "gemini-2.5-flash-lite": (10_000, 10**9)})
+
+
 class AnalyzerScoringTests(unittest.TestCase):
     def setUp(self):
-        self.original_client = analyzer.genai.Client
+        self.original_provider = get_gemini_provider()
+        self.original_executor = get_gemini_executor()
+        set_gemini_executor(_unthrottled_executor())
         self.original_api_key = os.environ.get("GEMINI_API_KEY")
         os.environ["GEMINI_API_KEY"] = "test-key"
 
     def tearDown(self):
-        analyzer.genai.Client = self.original_client
+        set_gemini_provider(self.original_provider)
+        set_gemini_executor(self.original_executor)
         if self.original_api_key is None:
             os.environ.pop("GEMINI_API_KEY", None)
         else:
             os.environ["GEMINI_API_KEY"] = self.original_api_key
 
     def _analyze_with_response(self, job, payload):
-        analyzer.genai.Client = lambda api_key: _FakeClient(json.dumps(payload))
+        set_gemini_provider(GeminiClientProvider(client_factory=lambda api_key: _FakeClient(json.dumps(payload))))
         return analyzer.analyze_job(job)
 
     def test_generic_twilio_principal_pm_without_description_caps_at_six(self):
@@ -317,5 +330,61 @@ class AnalyzerScoringTests(unittest.TestCase):
         self.assertIn("Marketing", " ".join(result["concerns"]))
 
 
+class AnalyzerCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.original_provider = get_gemini_provider()
+        self.original_executor = get_gemini_executor()
+        set_gemini_executor(_unthrottled_executor())
+        self.original_api_key = os.environ.get("GEMINI_API_KEY")
+        os.environ["GEMINI_API_KEY"] = "test-key"
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = AnalysisCache(PersistentCache(os.path.join(self.tmpdir.name, "analysis.json"), max_entries=10))
+        self.client = _FakeClient(json.dumps({"score": 9, "reason": "Fit", "summary": "Support AI.", "evidence": ["a"]}))
+        self.calls = self.client.models.calls
+        set_gemini_provider(GeminiClientProvider(client_factory=lambda api_key: self.client))
+
+    def tearDown(self):
+        set_gemini_provider(self.original_provider)
+        set_gemini_executor(self.original_executor)
+        self.tmpdir.cleanup()
+        if self.original_api_key is None:
+            os.environ.pop("GEMINI_API_KEY", None)
+        else:
+            os.environ["GEMINI_API_KEY"] = self.original_api_key
+
+    def _job(self, description):
+        return {
+            "title": "Staff Product Manager, Support AI",
+            "company": "ExampleCo",
+            "location": "Remote - US",
+            "description": description,
+        }
+
+    def test_repeat_posting_is_served_from_cache(self):
+        description = _long_description("Own the AI support agent platform, workflow automation, and evals.")
+
+        first = analyzer.analyze_job(self._job(description), cache=self.cache)
+        first["evidence"].append("mutated by calibration")
+        second = analyzer.analyze_job(self._job(description), cache=self.cache)
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(second["score"], first["score"])
+        self.assertNotIn("mutated by calibration", second["evidence"])
+
+    def test_changed_description_misses_cache(self):
+        analyzer.analyze_job(self._job(_long_description("Own support AI workflows.")), cache=self.cache)
+        analyzer.analyze_job(self._job(_long_description("Own support AI workflows and evals.")), cache=self.cache)
+
+        self.assertEqual(len(self.calls), 2)
+
+    def test_failed_analysis_is_not_cached(self):
+        set_gemini_provider(GeminiClientProvider(client_factory=lambda api_key: _FakeClient("not json")))
+        job = self._job(_long_description("Own support AI workflows."))
+
+        analyzer.analyze_job(job, cache=self.cache)
+
+        self.assertIsNone(self.cache.lookup(job))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import main
+from scrapers.ashby import legacy_seen_ids, scrape_ashby
+from scrapers.job_details import enrich_job_details
+
+PM_ID = "0a1b2c3d-0000-1111-2222-333344445555"
+ENGINEER_ID = "9f8e7d6c-0000-1111-2222-333344445555"
+
+BOARD = {
+    "apiVersion": "1",
+    "jobs": [
+        {
+            "id": PM_ID,
+            "title": "Senior Product Manager,\n Identity",
+            "location": "Toronto",
+            "isRemote": True,
+            "isListed": True,
+            "jobUrl": f"https://jobs.ashbyhq.com/examplecorp/{PM_ID}",
+            "descriptionPlain": "Own the  identity roadmap.\n\nWork with security and support teams.",
+            "descriptionHtml": "<p>Own the identity roadmap.</p>",
+        },
+        {
+            "id": ENGINEER_ID,
+            "title": "Staff Engineer",
+            "location": "Remote - US",
+            "isRemote": True,
+            "isListed": True,
+            "descriptionPlain": "",
+            "descriptionHtml": "<div><h2>About</h2><p>Build the sync engine.</p><script>track()</script></div>",
+        },
+        {
+            "id": "11111111-0000-1111-2222-333344445555",
+            "title": "Internal Product Manager",
+            "location": "Berlin",
+            "isListed": False,
+        },
+    ],
+}
+
+
+class _AshbyHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        _AshbyHandler.requests.append(self.path)
+        if self.path == "/posting-api/job-board/examplecorp":
+            self._reply(200, json.dumps(BOARD).encode("utf-8"))
+        else:
+            self._reply(404, b'{"error": "not found"}')
+
+    def _reply(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AshbyScraperTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _AshbyHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        api_base = f"http://127.0.0.1:{cls.server.server_address[1]}/posting-api/job-board/"
+        cls.env = mock.patch.dict(os.environ, {"JOB_ASHBY_API_BASE": api_base})
+        cls.env.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.env.stop()
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _AshbyHandler.requests = []
+
+    def test_one_request_returns_listed_postings_with_descriptions(self):
+        jobs = scrape_ashby("examplecorp", "ExampleCorp")
+
+        self.assertEqual(_AshbyHandler.requests, ["/posting-api/job-board/examplecorp"])
+        self.assertEqual(
+            [(job["id"], job["title"], job["location"], job["url"]) for job in jobs],
+            [
+                (PM_ID, "Senior Product Manager, Identity", "Toronto (Remote)", f"https://jobs.ashbyhq.com/examplecorp/{PM_ID}"),
+                (ENGINEER_ID, "Staff Engineer", "Remote - US", f"https://jobs.ashbyhq.com/examplecorp/{ENGINEER_ID}"),
+            ],
+        )
+        self.assertEqual(jobs[0]["description"], "Own the identity roadmap. Work with security and support teams.")
+        self.assertEqual(jobs[1]["description"], "About Build the sync engine.")
+        self.assertEqual({job["description_source"] for job in jobs}, {"ashby_api"})
+
+    def test_descriptions_can_be_left_out(self):
+        with mock.patch.dict(os.environ, {"JOB_ASHBY_DESCRIPTIONS": "0"}):
+            jobs = scrape_ashby("examplecorp", "ExampleCorp")
+
+        self.assertNotIn("description", jobs[0])
+
+    def test_unknown_board_raises(self):
+        with self.assertRaisesRegex(Exception, "Failed to fetch Ashby board 'missing'"):
+            scrape_ashby("missing", "Missing")
+
+    def test_api_descriptions_skip_the_detail_page_fetch(self):
+        job = scrape_ashby("examplecorp", "ExampleCorp")[0]
+
+        with mock.patch("scrapers.job_details.fetch_job_description", side_effect=AssertionError("fetched")):
+            enrich_job_details(job)
+
+        self.assertEqual(job["description_source"], "ashby_api")
+
+    def test_postings_seen_under_playwright_ids_stay_seen(self):
+        company = {"name": "ExampleCorp", "type": "ashby", "board_token": "examplecorp"}
+        legacy_ids = {f"examplecorp-{PM_ID}-senior-product-manager-identity", "unrelated-id"}
+        self.assertEqual(legacy_seen_ids(legacy_ids), {PM_ID})
+
+        with mock.patch("builtins.print"), \
+                mock.patch.object(main, "filter_titles", side_effect=lambda jobs, cache=None: []) as filter_titles:
+            result = main.process_company(company, legacy_ids, {})
+
+        self.assertEqual(result["error"], "")
+        self.assertEqual(result["new_count"], 1)
+        self.assertEqual([job["id"] for job in filter_titles.call_args.args[0]], [ENGINEER_ID])
+
+
+if __name__ == "__main__":
+    unittest.main()
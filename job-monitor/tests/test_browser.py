@@ -0,0 +1,154 @@
+import threading
+import unittest
+
+from scrapers.browser import BrowserManager
+from scrapers.resource_policy import ResourcePolicy, resource_scope
+
+
+class _FakeContext:
+    def __init__(self, browser, options=None):
+        self.browser = browser
+        self.options = options or {}
+        self.closed = False
+        self.routes = []
+
+    def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    def new_page(self):
+        return {"context": self}
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    def new_context(self, **options):
+        context = _FakeContext(self, options)
+        self.contexts.append(context)
+        return context
+
+    def close(self):
+        self.closed = True
+
+
+class _FakePlaywright:
+    def __init__(self, launched):
+        self.launched = launched
+        self.chromium = self
+
+    def start(self):
+        return self
+
+    def launch(self, **options):
+        browser = _FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+    def stop(self):
+        pass
+
+
+class BrowserManagerTests(unittest.TestCase):
+    def _manager(self, recycle_after=50):
+        self.launched = []
+        return BrowserManager(
+            recycle_after=recycle_after,
+            page_slots=threading.BoundedSemaphore(2),
+            playwright_factory=lambda: _FakePlaywright(self.launched),
+        )
+
+    def test_pages_share_one_browser_with_isolated_contexts(self):
+        manager = self._manager()
+
+        with manager.page() as first:
+            pass
+        with manager.page() as second:
+            pass
+
+        self.assertEqual(len(self.launched), 1)
+        self.assertIsNot(first["context"], second["context"])
+        self.assertTrue(first["context"].closed)
+        self.assertEqual(manager.stats["leases"], 2)
+
+    def test_browser_recycles_after_lease_budget(self):
+        manager = self._manager(recycle_after=2)
+
+        for _ in range(3):
+            with manager.page():
+                pass
+
+        self.assertEqual(len(self.launched), 2)
+        self.assertTrue(self.launched[0].closed)
+        self.assertEqual(manager.stats["recycles"], 1)
+
+    def test_disconnected_browser_is_relaunched(self):
+        manager = self._manager()
+        with manager.page():
+            pass
+        self.launched[0].connected = False
+
+        with manager.page() as page:
+            self.assertIs(page["context"].browser, self.launched[1])
+
+        self.assertEqual(manager.stats["crash_restarts"], 1)
+
+    def test_close_shuts_down_browser(self):
+        manager = self._manager()
+        with manager.page():
+            pass
+
+        manager.close()
+
+        self.assertTrue(self.launched[0].closed)
+
+    def test_page_routes_requests_through_the_thread_resource_policy(self):
+        manager = self._manager()
+        handled = []
+
+        class Route:
+            def abort(self, reason):
+                handled.append(("abort", reason))
+
+            def continue_(self):
+                handled.append(("continue", ""))
+
+        class Request:
+            def __init__(self, resource_type, url):
+                self.resource_type = resource_type
+                self.url = url
+
+        policy = ResourcePolicy(allowed_types=["stylesheet"])
+        with resource_scope(policy) as usage, manager.page() as page:
+            context = page["context"]
+            (pattern, handler), = context.routes
+            handler(Route(), Request("document", "https://stripe.com/jobs/search"))
+            handler(Route(), Request("image", "https://stripe.com/logo.png"))
+            handler(Route(), Request("stylesheet", "https://stripe.com/site.css"))
+            handler(Route(), Request("script", "https://www.googletagmanager.com/gtm.js"))
+
+        self.assertEqual(pattern, "**/*")
+        self.assertEqual(context.options["service_workers"], "block")
+        self.assertEqual([action for action, _ in handled], ["continue", "abort", "continue", "abort"])
+        self.assertEqual(usage.requests, 2)
+        self.assertEqual(usage.by_type, {"image": 1, "script": 1})
+        self.assertGreater(usage.estimated_bytes_avoided, 0)
+
+    def test_disabled_policy_leaves_contexts_unrouted(self):
+        manager = self._manager()
+
+        with resource_scope(ResourcePolicy(enabled=False)), manager.page() as page:
+            self.assertEqual(page["context"].routes, [])
+            self.assertNotIn("service_workers", page["context"].options)
+
+
+if __name__ == "__main__":
+    unittest.main()
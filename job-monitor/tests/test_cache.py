@@ -0,0 +1,80 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from agent.cache import PersistentCache
+
+
+class PersistentCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_preserves_values_and_counts_hits(self):
+        cache = PersistentCache(self.path, max_entries=10)
+        cache.put("a", True)
+        cache.save()
+
+        reloaded = PersistentCache(self.path, max_entries=10)
+
+        self.assertTrue(reloaded.get("a"))
+        self.assertIsNone(reloaded.get("b"))
+        self.assertEqual(reloaded.stats()["hits"], 1)
+        self.assertEqual(reloaded.stats()["misses"], 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = PersistentCache(self.path, max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_expired_entries_are_misses(self):
+        cache = PersistentCache(self.path, max_entries=10, ttl_seconds=60)
+        cache.put("a", 1)
+        cache._entries["a"]["stored_at"] = time.time() - 120
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["expired"], 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_concurrent_puts_are_all_kept(self):
+        cache = PersistentCache(self.path, max_entries=1000)
+
+        def fill(offset):
+            for index in range(100):
+                cache.put(f"{offset}-{index}", index)
+
+        threads = [threading.Thread(target=fill, args=(offset,)) for offset in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        cache.save()
+
+        self.assertEqual(len(PersistentCache(self.path, max_entries=1000)), 500)
+
+    def test_failed_save_is_retried_by_the_next_save(self):
+        cache = PersistentCache(self.path, max_entries=10)
+        cache.put("a", 1)
+
+        with mock.patch("agent.cache.os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                cache.save()
+        cache.save()
+
+        self.assertEqual(PersistentCache(self.path, max_entries=10).get("a"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import threading
+import unittest
+
+from ai.client import GeminiClientProvider
+from ai.gemini import GeminiExecutor, get_gemini_executor, set_gemini_executor
+
+
+class _FakeResponse:
+    text = "YES"
+
+
+class _FakeModels:
+    def __init__(self):
+        self.calls = []
+
+    def generate_content(self, model, contents):
+        self.calls.append(model)
+        return _FakeResponse()
+
+
+class _FakeClient:
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self.models = _FakeModels()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class GeminiClientProviderTests(unittest.TestCase):
+    def setUp(self):
+        self.original_executor = get_gemini_executor()
+        set_gemini_executor(GeminiExecutor(model_limits={"test-model": (10_000, 10**9)}))
+        self.original_api_key = os.environ.get("GEMINI_API_KEY")
+        os.environ["GEMINI_API_KEY"] = "key-1"
+        self.created = []
+
+        def factory(api_key):
+            client = _FakeClient(api_key)
+            self.created.append(client)
+            return client
+
+        self.provider = GeminiClientProvider(client_factory=factory)
+
+    def tearDown(self):
+        set_gemini_executor(self.original_executor)
+        if self.original_api_key is None:
+            os.environ.pop("GEMINI_API_KEY", None)
+        else:
+            os.environ["GEMINI_API_KEY"] = self.original_api_key
+
+    def test_one_client_is_shared_across_threads(self):
+        model = self.provider.model("test-model")
+        threads = [threading.Thread(target=model.generate, args=("prompt",)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.created), 1)
+        self.assertEqual(len(self.created[0].models.calls), 8)
+        self.assertIs(self.provider.model("test-model"), model)
+
+    def test_changed_api_key_rebuilds_and_closes_client(self):
+        first = self.provider.client()
+        os.environ["GEMINI_API_KEY"] = "key-2"
+        second = self.provider.client()
+
+        self.assertTrue(first.closed)
+        self.assertEqual(second.api_key, "key-2")
+        self.assertEqual(self.provider.stats["clients_created"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import main
+from agent.audit import RunAudit
+from agent.concurrency import HostLimiter, company_host, parse_host_limits, run_ordered
+
+
+def _companies():
+    return [
+        {"name": "Alpha", "type": "greenhouse", "board_token": "alpha"},
+        {"name": "Beta", "type": "greenhouse", "board_token": "beta"},
+        {"name": "Gamma", "type": "playwright", "board_token": "https://gamma.example.com/careers"},
+        {"name": "Broken", "type": "mystery", "board_token": "broken"},
+    ]
+
+
+def _fake_scrape(company, snapshots=None, readiness=None):
+    if company["type"] == "mystery":
+        raise main.UnknownCompanyType(f"Unknown company type 'mystery' for {company['name']}")
+    # Later companies finish first so out-of-order completion is exercised.
+    time.sleep({"Alpha": 0.05, "Beta": 0.02}.get(company["name"], 0))
+    name = company["name"]
+    return [
+        {"id": f"{name}-1", "title": "Senior Product Manager", "company": name, "url": f"https://{name}.example.com/jobs/1"},
+        {"id": f"{name}-2", "title": "Staff Product Manager, AI", "company": name, "url": f"https://{name}.example.com/jobs/2"},
+        {"id": f"{name}-3", "title": "Software Engineer", "company": name, "url": f"https://{name}.example.com/jobs/3"},
+    ]
+
+
+def _fake_evaluate(job, feedback, analysis_cache=None, descriptions=None, host_limiter=None):
+    job["feedback_id"] = f"{job['company']}::{job['id']}"
+    job["score"] = 8 if job["id"].endswith("-2") else 5
+    job["fit_tier"] = ""
+    return job
+
+
+class RunOrderedTests(unittest.TestCase):
+    def test_results_keep_input_order(self):
+        def slow_identity(value):
+            time.sleep(0.01 * (5 - value))
+            return value
+
+        self.assertEqual(list(run_ordered(range(5), slow_identity, workers=4)), [0, 1, 2, 3, 4])
+
+    def test_exceptions_surface_in_order(self):
+        def explode(value):
+            if value == 1:
+                raise ValueError("boom")
+            return value
+
+        results = run_ordered([0, 1, 2], explode, workers=3)
+        self.assertEqual(next(results), 0)
+        with self.assertRaises(ValueError):
+            next(results)
+
+
+    def test_consumer_failure_stops_unstarted_work(self):
+        calls = []
+        lock = threading.Lock()
+
+        def record(value):
+            with lock:
+                calls.append(value)
+            time.sleep(0.01)
+            return value
+
+        with self.assertRaises(RuntimeError):
+            for _ in run_ordered(range(40), record, workers=4):
+                raise RuntimeError("merge failed")
+
+        self.assertLessEqual(len(calls), 8)
+
+
+class HostLimiterTests(unittest.TestCase):
+    def test_parse_host_limits_skips_invalid_entries(self):
+        self.assertEqual(
+            parse_host_limits("jobs.ashbyhq.com=1, bad, example.com=x,boards-api.greenhouse.io=3"),
+            {"jobs.ashbyhq.com": 1, "boards-api.greenhouse.io": 3},
+        )
+
+    def test_company_host_uses_api_host_for_ats_types(self):
+        self.assertEqual(company_host({"type": "greenhouse", "board_token": "x"}), "boards-api.greenhouse.io")
+        self.assertEqual(company_host({"type": "ashby", "board_token": "notion"}), "api.ashbyhq.com")
+        self.assertEqual(
+            company_host({"type": "playwright", "board_token": "https://Stripe.com/jobs/search"}),
+            "stripe.com",
+        )
+
+    def test_hold_enforces_per_host_limit(self):
+        limiter = HostLimiter({"example.com": 2}, default_limit=4)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            with limiter.hold("example.com"):
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                time.sleep(0.02)
+                with lock:
+                    active.pop()
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(max(peak), 2)
+
+
+class EvaluateHostSlotTests(unittest.TestCase):
+    def test_host_slot_is_released_before_analysis(self):
+        limiter = HostLimiter({"alpha.example.com": 1})
+        job = {"id": "1", "title": "Senior Product Manager", "company": "Alpha", "url": "https://alpha.example.com/jobs/1"}
+        slot_free = []
+
+        def analyze(job, cache=None):
+            semaphore = limiter._semaphore("alpha.example.com")
+            slot_free.append(semaphore.acquire(blocking=False))
+            semaphore.release()
+            return {}
+
+        with mock.patch.object(main, "enrich_job_details"), \
+                mock.patch.object(main, "repair_job_url"), \
+                mock.patch.object(main, "verify_job", return_value={}), \
+                mock.patch.object(main, "analyze_job", side_effect=analyze), \
+                mock.patch.object(main, "apply_analysis"):
+            main.evaluate_job(job, {}, host_limiter=limiter)
+
+        self.assertEqual(slot_free, [True])
+
+
+class ConcurrentMergeTests(unittest.TestCase):
+    def setUp(self):
+        self.original_scrape = main.scrape_company
+        self.original_evaluate = main.evaluate_job
+        main.scrape_company = _fake_scrape
+        main.evaluate_job = _fake_evaluate
+
+    def tearDown(self):
+        main.scrape_company = self.original_scrape
+        main.evaluate_job = self.original_evaluate
+
+    def _run(self, workers):
+        seen_jobs = {"Alpha": ["Alpha-1"]}
+        state = {
+            "seen_jobs": seen_jobs,
+            "evaluated_jobs": [],
+            "new_jobs_by_company": {},
+            "low_jobs_by_company": {},
+            "errors": [],
+        }
+        audit = RunAudit(run_id="fixed")
+        limiter = HostLimiter()
+        results = run_ordered(
+            _companies(),
+            lambda company: main.process_company(company, seen_jobs.get(company["name"], []), {}, limiter),
+            workers,
+        )
+        for result in results:
+            main.merge_company_result(result, state, audit)
+        run_audit = audit.to_dict()
+        run_audit.pop("started_at")
+        run_audit.pop("finished_at")
+        return state, run_audit
+
+    def test_concurrent_run_matches_sequential_output(self):
+        sequential_state, sequential_audit = self._run(workers=1)
+        concurrent_state, concurrent_audit = self._run(workers=4)
+
+        self.assertEqual(sequential_state, concurrent_state)
+        self.assertEqual(sequential_audit, concurrent_audit)
+        self.assertEqual(
+            [job["feedback_id"] for job in concurrent_state["evaluated_jobs"]],
+            ["Alpha::Alpha-2", "Beta::Beta-1", "Beta::Beta-2", "Gamma::Gamma-1", "Gamma::Gamma-2"],
+        )
+        self.assertEqual(concurrent_state["seen_jobs"]["Alpha"], ["Alpha-1", "Alpha-2", "Alpha-3"])
+        self.assertEqual(concurrent_state["errors"], ["Unknown company type 'mystery' for Broken"])
+
+
+if __name__ == "__main__":
+    unittest.main()
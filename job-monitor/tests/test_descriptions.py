@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+import unittest
+
+from agent.descriptions import DescriptionStore, description_sha256
+from agent.ledger import ledger_entry
+from scrapers import job_details
+
+
+class DescriptionStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmpdir.name, "descriptions")
+        self.original_fetch = job_details.fetch_job_description
+        self.fetched = []
+
+        def fake_fetch(url, timeout=None):
+            self.fetched.append(url)
+            return "Fetched body."
+
+        job_details.fetch_job_description = fake_fetch
+
+    def tearDown(self):
+        job_details.fetch_job_description = self.original_fetch
+        self.tmpdir.cleanup()
+
+    def test_identical_text_is_stored_once_and_round_trips(self):
+        store = DescriptionStore(self.directory)
+
+        first = store.put("Own the AI roadmap.", "https://alpha.example/jobs/1")
+        second = store.put("Own the AI roadmap.", "https://beta.example/jobs/9")
+
+        self.assertEqual(first, second)
+        self.assertEqual(first, description_sha256("Own the AI roadmap."))
+        self.assertEqual(store.get(first), "Own the AI roadmap.")
+        self.assertIsNone(store.get("0" * 64))
+        self.assertEqual(store.stats()["writes"], 1)
+        self.assertEqual(store.stats()["deduplicated"], 1)
+        self.assertTrue(os.path.exists(store.blob_path(first)))
+
+    def test_url_index_reloads_after_save(self):
+        store = DescriptionStore(self.directory)
+        store.put("Own the AI roadmap.", "https://alpha.example/jobs/1")
+        store.save()
+
+        reopened = DescriptionStore(self.directory)
+
+        self.assertEqual(reopened.get_for_url("https://alpha.example/jobs/1"), "Own the AI roadmap.")
+        self.assertIsNone(reopened.get_for_url("https://alpha.example/jobs/2"))
+
+    def test_stored_text_expires_after_the_ttl(self):
+        store = DescriptionStore(self.directory)
+        store.put("Own the AI roadmap.", "https://alpha.example/jobs/1")
+        store.save()
+        with open(store.index_path) as f:
+            index = json.load(f)
+        index["stored_at"]["https://alpha.example/jobs/1"] -= 8 * 86400
+        with open(store.index_path, "w") as f:
+            json.dump(index, f)
+
+        fresh = DescriptionStore(self.directory, ttl_seconds=30 * 86400)
+        stale = DescriptionStore(self.directory, ttl_seconds=7 * 86400)
+        job = job_details.enrich_job_details({"url": "https://alpha.example/jobs/1"}, stale)
+
+        self.assertEqual(fresh.get_for_url("https://alpha.example/jobs/1"), "Own the AI roadmap.")
+        self.assertEqual(self.fetched, ["https://alpha.example/jobs/1"])
+        self.assertEqual(job["description"], "Fetched body.")
+        self.assertEqual(stale.stats()["expired"], 1)
+        # The re-fetched text replaces the stale entry and restarts its clock
+        self.assertEqual(stale.get_for_url("https://alpha.example/jobs/1"), "Fetched body.")
+
+    def test_index_entries_without_a_store_time_are_expired(self):
+        os.makedirs(self.directory)
+        sha = DescriptionStore(self.directory).put("Old text.")
+        with open(os.path.join(self.directory, "url_index.json"), "w") as f:
+            json.dump({"urls": {"https://alpha.example/jobs/1": sha}}, f)
+
+        self.assertIsNone(DescriptionStore(self.directory, ttl_seconds=86400).get_for_url("https://alpha.example/jobs/1"))
+        self.assertEqual(DescriptionStore(self.directory).get_for_url("https://alpha.example/jobs/1"), "Old text.")
+
+    def test_enrich_reloads_stored_text_without_fetching(self):
+        store = DescriptionStore(self.directory)
+        scraped = job_details.enrich_job_details(
+            {"url": "https://alpha.example/jobs/1", "description": "  Own   the AI roadmap. "}, store
+        )
+        store.save()
+
+        job = job_details.enrich_job_details({"url": "https://alpha.example/jobs/1"}, DescriptionStore(self.directory))
+
+        self.assertEqual(self.fetched, [])
+        self.assertEqual(job["description"], "Own the AI roadmap.")
+        self.assertEqual(job["description_source"], "description_store")
+        self.assertEqual(job["description_sha256"], scraped["description_sha256"])
+
+    def test_ledger_entry_keeps_hash_after_description_is_dropped(self):
+        store = DescriptionStore(self.directory)
+        job = job_details.enrich_job_details({"url": "https://alpha.example/jobs/1"}, store)
+        job.pop("description")
+
+        entry = ledger_entry(job, "run-1", False)
+
+        self.assertEqual(self.fetched, ["https://alpha.example/jobs/1"])
+        self.assertEqual(store.get(entry["description_sha256"]), "Fetched body.")
+        self.assertEqual(entry["description_hash"], entry["description_sha256"][:16])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,18 @@
+import json
+import os
+import random
+import tempfile
 import unittest
 
-from agent.feedback import apply_feedback_calibration, feedback_id
+from agent.feedback import (
+    CompiledRules,
+    _matches_rule,
+    apply_feedback_calibration,
+    feedback_id,
+    load_feedback,
+    save_feedback,
+)
+from agent.rule_matcher import SubstringMatcher
 
 
 def _job(score=8):
@@ -63,5 +75,74 @@ class FeedbackCalibrationTests(unittest.TestCase):
         self.assertIn("Manual rule", " ".join(job["concerns"]))
 
 
+class CompiledRulesTests(unittest.TestCase):
+    def _random_rules(self, rng, count):
+        words = ["product", "AI", "remote", "support", "Evals", "jobs", "growth", "ExampleCo", "  ", "manager"]
+
+        def needles():
+            picked = rng.sample(words, rng.randint(0, 2))
+            return picked[0] if len(picked) == 1 and rng.random() < 0.5 else picked
+
+        rules = []
+        for index in range(count):
+            rule = {"name": f"rule {index}", "score_delta": rng.choice([-1, 1])}
+            if rng.random() < 0.3:
+                rule["company"] = rng.choice(["exampleco", "OtherCo", ""])
+            for key in ("title_contains", "location_contains", "url_contains", "description_contains"):
+                if rng.random() < 0.5:
+                    rule[key] = needles()
+            rules.append(rule)
+        rules.insert(count // 2, "not a rule")
+        return rules
+
+    def test_matches_agree_with_rule_by_rule_check(self):
+        rng = random.Random(7)
+        for count in (5, 200):
+            rules = self._random_rules(rng, count)
+            compiled = CompiledRules(rules)
+            for company in ("ExampleCo", "OtherCo", "Nobody"):
+                job = dict(_job(), company=company)
+                with self.subTest(count=count, company=company):
+                    self.assertEqual(
+                        compiled.matching(job),
+                        [rule for rule in rules if _matches_rule(job, rule)],
+                    )
+
+    def test_automaton_and_direct_search_agree(self):
+        patterns = ["ai", "support ai", "evals", "resolution", "ion", "zzz", "i"]
+        text = "Own SUPPORT AI workflows, guardrails, evals, and customer resolution."
+
+        matcher = SubstringMatcher(patterns, automaton_after_checks=2)
+        scan = matcher.scan(text)
+
+        self.assertEqual(matcher.find(text), {0, 1, 2, 3, 4, 6})
+        self.assertEqual([scan.contains(pattern_id) for pattern_id in range(len(patterns))], [True] * 5 + [False, True])
+        # The third lookup switched the scan over to one automaton pass
+        self.assertIsNotNone(scan.found)
+
+    def test_rules_added_after_load_are_recompiled(self):
+        job = _job(score=9)
+        feedback = {"rules": [{"name": "cap", "title_contains": "Product", "cap": 7}]}
+        apply_feedback_calibration(job, feedback)
+        feedback["rules"].append({"name": "narrow cap", "title_contains": "Support AI", "cap": 5})
+
+        apply_feedback_calibration(job, feedback)
+
+        self.assertEqual(job["score"], 5)
+
+    def test_compiled_rules_are_not_saved(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "feedback.json")
+            with open(path, "w") as f:
+                json.dump({"rules": [{"name": "cap", "title_contains": "Product", "cap": 6}]}, f)
+
+            feedback = load_feedback(path)
+            self.assertIsInstance(feedback["_compiled_rules"], CompiledRules)
+            save_feedback(feedback, path)
+
+            with open(path) as f:
+                self.assertNotIn("_compiled_rules", json.load(f))
+
+
 if __name__ == "__main__":
     unittest.main()
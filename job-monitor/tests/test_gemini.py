@@ -0,0 +1,137 @@
+import unittest
+
+from ai.gemini import GeminiExecutor, TokenBucket, is_retryable, parse_model_limits, retry_after_seconds
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _ApiError(Exception):
+    def __init__(self, code, message="", headers=None):
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.response = type("Response", (), {"headers": headers or {}})()
+
+
+class _Response:
+    text = "ok"
+    usage_metadata = None
+
+
+class _FakeModels:
+    def __init__(self, failures=None):
+        self.failures = list(failures or [])
+        self.calls = []
+
+    def generate_content(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.failures:
+            raise self.failures.pop(0)
+        return _Response()
+
+
+class _FakeClient:
+    def __init__(self, failures=None):
+        self.models = _FakeModels(failures)
+
+
+def _executor(clock, **kwargs):
+    kwargs.setdefault("model_limits", {"test-model": (2, 100_000)})
+    return GeminiExecutor(sleep=clock.sleep, clock=clock, base_delay=1, max_delay=60, **kwargs)
+
+
+class GeminiHelperTests(unittest.TestCase):
+    def test_parse_model_limits_skips_invalid_entries(self):
+        self.assertEqual(
+            parse_model_limits("gemini-2.5-flash=5/100000, bad=x, gemini-2.5-flash-lite=20"),
+            {"gemini-2.5-flash": (5, 100_000), "gemini-2.5-flash-lite": (20, 250_000)},
+        )
+
+    def test_retry_after_prefers_header_then_retry_info(self):
+        self.assertEqual(retry_after_seconds(_ApiError(429, headers={"retry-after": "7"})), 7.0)
+        self.assertEqual(retry_after_seconds(_ApiError(429, "{'retryDelay': '33s'}")), 33.0)
+        self.assertEqual(retry_after_seconds(_ApiError(429)), 0.0)
+
+    def test_client_errors_are_not_retryable(self):
+        self.assertTrue(is_retryable(_ApiError(429)))
+        self.assertTrue(is_retryable(_ApiError(503)))
+        self.assertFalse(is_retryable(_ApiError(400)))
+        self.assertFalse(is_retryable(ValueError("bad prompt")))
+
+    def test_token_bucket_reports_wait_until_refill(self):
+        clock = _FakeClock()
+        bucket = TokenBucket(60, clock)
+
+        self.assertEqual(bucket.wait_time(60), 0.0)
+        self.assertAlmostEqual(bucket.wait_time(1), 1.0)
+        clock.now += 1
+        self.assertEqual(bucket.wait_time(1), 0.0)
+
+
+class GeminiExecutorTests(unittest.TestCase):
+    def test_requests_beyond_rpm_wait_for_budget(self):
+        clock = _FakeClock()
+        executor = _executor(clock)
+        client = _FakeClient()
+
+        for _ in range(3):
+            executor.generate(client, "test-model", "prompt")
+
+        self.assertEqual(len(client.models.calls), 3)
+        self.assertEqual(clock.sleeps, [30.0])
+        self.assertEqual(executor.stats["throttled_seconds"], 30.0)
+
+    def test_retry_after_is_honored_and_shared(self):
+        clock = _FakeClock()
+        executor = _executor(clock, model_limits={"test-model": (100, 1_000_000)})
+        client = _FakeClient([_ApiError(429, headers={"Retry-After": "12"})])
+
+        response = executor.generate(client, "test-model", "prompt")
+
+        self.assertEqual(response.text, "ok")
+        self.assertEqual(clock.sleeps, [12.0])
+        self.assertEqual(executor.stats["retries"], 1)
+        self.assertEqual(executor.stats["requests"], 2)
+
+    def test_non_retryable_errors_raise_immediately(self):
+        clock = _FakeClock()
+        executor = _executor(clock)
+        client = _FakeClient([_ApiError(400, "INVALID_ARGUMENT")])
+
+        with self.assertRaises(_ApiError):
+            executor.generate(client, "test-model", "prompt")
+        self.assertEqual(len(client.models.calls), 1)
+
+    def test_gives_up_after_max_attempts(self):
+        clock = _FakeClock()
+        executor = _executor(clock, max_attempts=2, model_limits={"test-model": (100, 1_000_000)})
+        client = _FakeClient([_ApiError(503), _ApiError(503), _ApiError(503)])
+
+        with self.assertRaises(_ApiError):
+            executor.generate(client, "test-model", "prompt")
+        self.assertEqual(len(client.models.calls), 2)
+
+    def test_config_is_only_passed_when_given(self):
+        clock = _FakeClock()
+        executor = _executor(clock)
+        client = _FakeClient()
+
+        executor.generate(client, "test-model", "prompt")
+        executor.generate(client, "test-model", "prompt", config={"response_mime_type": "application/json"})
+
+        self.assertNotIn("config", client.models.calls[0])
+        self.assertEqual(client.models.calls[1]["config"], {"response_mime_type": "application/json"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import main
+from agent.audit import RunAudit
+from agent.concurrency import HostLimiter
+from agent.snapshots import BoardSnapshotStore
+from scrapers import greenhouse
+
+
+BOARD = json.dumps(
+    {
+        "jobs": [
+            {
+                "id": 101,
+                "title": "Senior Product Manager",
+                "location": {"name": "Remote - US"},
+                "absolute_url": "https://boards.greenhouse.io/example/jobs/101",
+                "content": "&lt;p&gt;Own the AI platform roadmap.&lt;/p&gt;",
+            }
+        ]
+    }
+).encode("utf-8")
+
+
+class _FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class GreenhouseSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.original_http_get = greenhouse.http_get
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "board_snapshots.json")
+        self.store = BoardSnapshotStore(self.path)
+        self.requests = []
+        self.responses = []
+
+        def fake_http_get(url, headers=None, **kwargs):
+            self.requests.append(headers or {})
+            return self.responses.pop(0)
+
+        greenhouse.http_get = fake_http_get
+
+    def tearDown(self):
+        greenhouse.http_get = self.original_http_get
+        self.tmpdir.cleanup()
+
+    def _fetch_and_commit(self):
+        self.responses.append(_FakeResponse(200, BOARD, {"ETag": '"v1"', "Content-Length": "4096"}))
+        jobs = greenhouse.scrape_greenhouse("example", "ExampleCo", self.store)
+        self.store.commit(greenhouse.board_snapshot_key("example"))
+        return jobs
+
+    def test_not_modified_board_raises_with_bytes_saved(self):
+        self.assertEqual(len(self._fetch_and_commit()), 1)
+        self.responses.append(_FakeResponse(304))
+
+        with self.assertRaises(greenhouse.BoardUnchanged) as raised:
+            greenhouse.scrape_greenhouse("example", "ExampleCo", self.store)
+
+        self.assertEqual(self.requests[-1], {"If-None-Match": '"v1"'})
+        self.assertEqual(raised.exception.bytes_saved, 4096)
+        self.assertEqual(raised.exception.job_count, 1)
+
+    def test_identical_body_is_unchanged_without_bytes_saved(self):
+        self._fetch_and_commit()
+        self.responses.append(_FakeResponse(200, BOARD, {"ETag": '"v2"'}))
+
+        with self.assertRaises(greenhouse.BoardUnchanged) as raised:
+            greenhouse.scrape_greenhouse("example", "ExampleCo", self.store)
+
+        self.assertEqual(raised.exception.bytes_saved, 0)
+
+    def test_uncommitted_snapshot_is_not_used_or_saved(self):
+        self.responses.append(_FakeResponse(200, BOARD, {"ETag": '"v1"'}))
+        greenhouse.scrape_greenhouse("example", "ExampleCo", self.store)
+        self.store.discard(greenhouse.board_snapshot_key("example"))
+        self.store.save()
+
+        self.assertIsNone(self.store.get(greenhouse.board_snapshot_key("example")))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_committed_snapshots_round_trip(self):
+        self._fetch_and_commit()
+        self.store.save()
+
+        reloaded = BoardSnapshotStore(self.path)
+
+        self.assertEqual(reloaded.get(greenhouse.board_snapshot_key("example"))["etag"], '"v1"')
+
+
+class GreenhouseLightModeTests(unittest.TestCase):
+    def setUp(self):
+        self.original_http_get = greenhouse.http_get
+        self.urls = []
+
+        def fake_http_get(url, headers=None, **kwargs):
+            self.urls.append(url)
+            if url.endswith("/jobs"):
+                return _FakeResponse(200, BOARD)
+            if url.endswith("/jobs/101"):
+                return _FakeResponse(200, json.dumps({"id": 101, "content": "<p>Own the AI roadmap.</p>"}).encode())
+            return _FakeResponse(404)
+
+        greenhouse.http_get = fake_http_get
+
+    def tearDown(self):
+        greenhouse.http_get = self.original_http_get
+
+    def test_full_mode_is_the_default(self):
+        with mock.patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("JOB_GREENHOUSE_FETCH_MODE", None)
+            self.assertEqual(greenhouse.greenhouse_fetch_mode(), "full")
+        with mock.patch.dict(os.environ, {"JOB_GREENHOUSE_FETCH_MODE": "light"}):
+            self.assertEqual(greenhouse.greenhouse_fetch_mode(), "light")
+
+    def test_light_list_skips_content_and_marks_jobs_pending(self):
+        jobs = greenhouse.scrape_greenhouse("example", "ExampleCo", mode="light")
+
+        self.assertEqual(self.urls, ["https://boards-api.greenhouse.io/v1/boards/example/jobs"])
+        self.assertEqual(jobs[0]["description"], "")
+        self.assertEqual(jobs[0]["description_source"], greenhouse.PENDING_DESCRIPTION_SOURCE)
+
+    def test_only_filtered_pending_jobs_are_fetched(self):
+        company = {"name": "ExampleCo", "type": "greenhouse", "board_token": "example"}
+        pending = {"description": "", "description_source": greenhouse.PENDING_DESCRIPTION_SOURCE}
+        jobs = [
+            dict(pending, id="101", company="ExampleCo"),
+            dict(pending, id="404", company="ExampleCo"),
+            {"id": "7", "company": "ExampleCo", "description": "Already scraped.", "description_source": "scraper"},
+        ]
+
+        main.fetch_pending_descriptions(company, jobs, HostLimiter())
+
+        self.assertEqual(sorted(url.rsplit("/", 1)[1] for url in self.urls), ["101", "404"])
+        self.assertEqual(jobs[0]["description"], "Own the AI roadmap.")
+        self.assertEqual(jobs[0]["description_source"], "greenhouse_api")
+        # A failed detail fetch leaves the job for enrich_job_details to fetch from the posting page
+        self.assertEqual(jobs[1]["description"], "")
+        self.assertNotIn("description_source", jobs[1])
+
+
+class UnchangedBoardMergeTests(unittest.TestCase):
+    def setUp(self):
+        self.original_scrape = main.scrape_company
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = BoardSnapshotStore(os.path.join(self.tmpdir.name, "board_snapshots.json"))
+
+        def unchanged(company, snapshots=None, readiness=None):
+            raise greenhouse.BoardUnchanged(company["board_token"], 12, 2048)
+
+        main.scrape_company = unchanged
+
+    def tearDown(self):
+        main.scrape_company = self.original_scrape
+        self.tmpdir.cleanup()
+
+    def test_unchanged_board_skips_company_and_keeps_seen_ids(self):
+        company = {"name": "ExampleCo", "type": "greenhouse", "board_token": "example"}
+        state = {
+            "seen_jobs": {"ExampleCo": ["101"]},
+            "evaluated_jobs": [],
+            "new_jobs_by_company": {},
+            "low_jobs_by_company": {},
+            "errors": [],
+        }
+        audit = RunAudit(run_id="fixed")
+
+        result = main.process_company(company, ["101"], {}, snapshots=self.store)
+        main.merge_company_result(result, state, audit)
+
+        self.assertTrue(result["unchanged"])
+        self.assertEqual(state["seen_jobs"], {"ExampleCo": ["101"]})
+        self.assertEqual(audit.company_stats["ExampleCo"]["bytes_saved"], 2048)
+        self.assertEqual(audit.company_stats["ExampleCo"]["scraped"], 12)
+        self.assertEqual(audit.stats["unchanged_boards"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scrapers.http_client import HttpClient
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    flaky_remaining = 0
+
+    def do_GET(self):
+        if self.path == "/flaky" and _KeepAliveHandler.flaky_remaining > 0:
+            _KeepAliveHandler.flaky_remaining -= 1
+            self._reply(503, b"try again")
+            return
+        self._reply(200, f"ok {self.headers.get('Accept-Encoding', '')}".encode("utf-8"))
+
+    def _reply(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HttpClientTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_requests_to_one_host_reuse_a_connection(self):
+        client = HttpClient(timeout=5, retries=0)
+
+        for index in range(3):
+            response = client.get(f"{self.base_url}/jobs/{index}")
+            self.assertEqual(response.status_code, 200)
+        stats = client.stats()
+        client.close()
+
+        self.assertEqual(stats["http_hosts"], 1)
+        self.assertEqual(stats["http_requests"], 3)
+        self.assertEqual(stats["http_connections"], 1)
+        self.assertEqual(stats["http_reused_connections"], 2)
+
+    def test_default_headers_negotiate_compression(self):
+        client = HttpClient(timeout=5, retries=0)
+
+        response = client.get(f"{self.base_url}/headers")
+        client.close()
+
+        self.assertIn("gzip", response.text)
+
+    def test_retryable_status_is_retried(self):
+        _KeepAliveHandler.flaky_remaining = 1
+        client = HttpClient(timeout=5, retries=2)
+
+        response = client.get(f"{self.base_url}/flaky")
+        client.close()
+
+        self.assertEqual(response.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
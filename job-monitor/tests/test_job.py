@@ -0,0 +1,124 @@
+import copy
+import pickle
+import unittest
+
+from agent.job import Job, as_job, derived, job_text
+from agent.ledger import description_hash, job_description_sha256
+from agent.verification import collapse_duplicate_jobs, verify_job
+from ai.analyzer import _combined_text
+
+
+def _posting(**overrides):
+    posting = {
+        "id": "1",
+        "company": "Alpha",
+        "title": "Senior Product Manager, AI Support",
+        "location": "Remote - US",
+        "url": "https://boards.greenhouse.io/alpha/jobs/1?gh_src=feed",
+        "description": "Own the roadmap for AI support agents. Remote in the United States.",
+        "source_board": "greenhouse",
+    }
+    posting.update(overrides)
+    return posting
+
+
+class JobTests(unittest.TestCase):
+    def test_reads_and_writes_like_a_dict(self):
+        job = Job(_posting())
+
+        self.assertEqual(job["title"], "Senior Product Manager, AI Support")
+        self.assertEqual(job["source_board"], "greenhouse")
+        self.assertEqual(job.to_dict(), _posting())
+        self.assertEqual(job, _posting())
+        self.assertNotIn("score", job)
+        self.assertIsNone(job.get("score"))
+        with self.assertRaises(KeyError):
+            job["score"]
+
+        job["score"] = 8
+        job.setdefault("fit_tier", "Competitive")
+        job.update(reason="Strong match")
+        del job["source_board"]
+
+        self.assertEqual(job.score, 8)
+        self.assertEqual(job["fit_tier"], "Competitive")
+        self.assertEqual(job.get("reason"), "Strong match")
+        self.assertNotIn("source_board", job)
+        self.assertEqual(len(job), len(_posting()) + 2)
+        self.assertEqual(list(job)[:3], ["id", "company", "title"])
+
+    def test_slots_keep_unknown_fields_out_of_attributes(self):
+        job = Job(_posting())
+
+        self.assertFalse(hasattr(job, "__dict__"))
+        with self.assertRaises(AttributeError):
+            job.source_board = "lever"
+
+    def test_derived_values_reset_when_a_source_field_changes(self):
+        job = Job(_posting())
+        calls = []
+
+        def upper_title(value):
+            calls.append(1)
+            return value["title"].upper()
+
+        self.assertEqual(job.derive("upper_title", upper_title), "SENIOR PRODUCT MANAGER, AI SUPPORT")
+        job.derive("upper_title", upper_title)
+        job["score"] = 7
+        job.derive("upper_title", upper_title)
+        self.assertEqual(len(calls), 1)
+
+        job["title"] = "Staff Product Manager"
+        self.assertEqual(job.derive("upper_title", upper_title), "STAFF PRODUCT MANAGER")
+        self.assertEqual(job_text(job, "title"), "Staff Product Manager")
+        self.assertEqual(len(calls), 2)
+
+        first_hash = description_hash(job)
+        job.description = "Rewritten description."
+        self.assertNotEqual(description_hash(job), first_hash)
+        self.assertEqual(job_description_sha256(job), job_description_sha256(job.to_dict()))
+
+    def test_helpers_accept_plain_dicts(self):
+        posting = _posting(title=None)
+
+        self.assertEqual(job_text(posting, "title"), "")
+        self.assertEqual(derived(posting, "name", lambda job: job["company"]), "Alpha")
+        job = as_job(posting)
+        self.assertIs(as_job(job), job)
+        self.assertEqual(_combined_text(job), _combined_text(posting))
+
+    def test_copy_and_pickle_round_trip_without_the_cache(self):
+        job = Job(_posting(evidence=["AI support agents"]))
+        job.derive("upper_title", lambda value: value["title"].upper())
+
+        for clone in (job.copy(), copy.deepcopy(job), pickle.loads(pickle.dumps(job))):
+            self.assertIsInstance(clone, Job)
+            self.assertEqual(clone, job)
+            self.assertEqual(clone._derived, {})
+        deep = copy.deepcopy(job)
+        deep["evidence"].append("guardrails")
+        self.assertEqual(job["evidence"], ["AI support agents"])
+
+    def test_verification_and_dedupe_match_plain_dicts(self):
+        postings = [
+            _posting(),
+            _posting(id=" 1 "),
+            _posting(id="", url="https://boards.greenhouse.io/alpha/jobs/2"),
+            _posting(id="", url="https://boards.greenhouse.io/alpha/jobs/2?gh_src=feed", title="Duplicate URL"),
+            _posting(id="", url="", title="Senior  product manager, ai support", location="remote - us"),
+            _posting(id="", url="", location="Remote -  US"),
+            _posting(id="4", title="Product Manager, Payments", url="https://boards.greenhouse.io/alpha/jobs/4"),
+        ]
+
+        dict_unique, dict_removed = collapse_duplicate_jobs([dict(posting) for posting in postings])
+        job_unique, job_removed = collapse_duplicate_jobs([Job(posting) for posting in postings])
+
+        self.assertEqual(len(job_removed), 3)
+        self.assertEqual(job_removed, dict_removed)
+        self.assertEqual([job.to_dict() for job in job_unique], dict_unique)
+        for plain, job in zip(dict_unique, job_unique):
+            self.assertEqual(verify_job(job), verify_job(plain))
+
+
+if __name__ == "__main__":
+    unittest.main()
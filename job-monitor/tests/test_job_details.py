@@ -1,7 +1,31 @@
+import os
+import random
 import unittest
+from unittest import mock
 
+from benchmarks.readable_text import extract_readable_text_by_selectors
 from scrapers.job_details import extract_greenhouse_description, extract_readable_text
 
+PAGE_TAGS = ["div", "section", "main", "article", "p", "span", "nav", "header", "footer", "script", "template", "svg", "body"]
+PAGE_ATTRIBUTES = [
+    "",
+    ' class="job-description"',
+    ' class="posting description"',
+    ' data-testid="job-card"',
+    ' data-qa="job-description"',
+    ' id="job-description-1"',
+    ' id="apply"',
+]
+PAGE_WORDS = ["Own the roadmap", "  evals\n guardrails ", "<!-- tracking -->", "&amp; handoff", ""]
+
+
+def _random_markup(rng, depth=0):
+    if depth > 4 or rng.random() < 0.25:
+        return rng.choice(PAGE_WORDS)
+    tag = rng.choice(PAGE_TAGS)
+    children = "".join(_random_markup(rng, depth + 1) for _ in range(rng.randint(0, 4)))
+    return f"<{tag}{rng.choice(PAGE_ATTRIBUTES)}>{children}</{tag}>"
+
 
 class JobDetailsTests(unittest.TestCase):
     def test_extract_readable_text_prefers_job_description_content(self):
@@ -41,6 +65,25 @@ class JobDetailsTests(unittest.TestCase):
             "About the role Build agentic customer support automation for enterprise teams.",
         )
 
+    @mock.patch.dict(os.environ, {"JOB_HTML_PARSER": "html.parser"})
+    def test_extract_readable_text_breaks_length_ties_by_selector_then_order(self):
+        html = """
+        <main><p>Same length text</p></main>
+        <div class="description"><p>Same length text</p></div>
+        <header class="job-description">Much longer header text that is removed</header>
+        """
+
+        self.assertEqual(extract_readable_text(html), "Same length text")
+        self.assertEqual(extract_readable_text(html), extract_readable_text_by_selectors(html))
+
+    @mock.patch.dict(os.environ, {"JOB_HTML_PARSER": "html.parser"})
+    def test_extract_readable_text_matches_selector_scan_on_random_pages(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            html = "".join(_random_markup(rng) for _ in range(rng.randint(1, 4)))
+            with self.subTest(html=html):
+                self.assertEqual(extract_readable_text(html), extract_readable_text_by_selectors(html))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,120 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from agent.ledger_segments import INDEX_FILE, SNAPSHOT_FILE, SegmentedLedger, iter_members
+from agent.ledger_store import JsonlLedger
+from test_ledger_store import ENTRIES
+
+
+class _Clock:
+    def __init__(self, when):
+        self.when = when
+
+    def __call__(self):
+        return self.when
+
+
+class SegmentedLedgerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmpdir.name, "ledger_segments")
+        self.ledger_path = os.path.join(self.tmpdir.name, "job_ledger.jsonl")
+        self.audit_path = os.path.join(self.tmpdir.name, "run_audits.jsonl")
+        self.clock = _Clock(datetime(2026, 1, 5, tzinfo=timezone.utc))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _ledger(self, **kwargs):
+        return SegmentedLedger(self.directory, import_ledger_path=self.ledger_path,
+                               import_audit_path=self.audit_path, clock=self.clock, **kwargs)
+
+    def test_each_flush_is_one_gzip_member_and_queries_match_jsonl(self):
+        ledger = self._ledger()
+        ledger.append_entries(ENTRIES[:2])
+        ledger.append_run_audit({"run_id": "run-1"})
+        ledger.flush()
+        ledger.append_entries(ENTRIES[2:])
+        ledger.close()
+
+        segment = os.path.join(self.directory, ledger.segments()[0])
+        self.assertEqual([len(records) for _, _, records in iter_members(segment)], [2, 2])
+        with gzip.open(segment, "rt") as f:
+            self.assertEqual([json.loads(line) for line in f], ENTRIES)
+        self.assertEqual(ledger.stats(), {"flushes": 2, "records": 5})
+
+        reopened = self._ledger()
+        self.assertEqual(list(reopened.iter_entries()), ENTRIES)
+        self.assertEqual([entry["run_id"] for entry in reopened.job_history("alpha::1")], ["run-1", "run-2"])
+        self.assertEqual([entry["feedback_id"] for entry in reopened.run_entries("run-2")], ["alpha::1", "alpha::2"])
+        self.assertEqual(reopened.latest_for_description("aaa")["run_id"], "run-2")
+        self.assertEqual([audit["run_id"] for audit in reopened.iter_run_audits()], ["run-1"])
+
+    def test_segments_rotate_by_month_and_size(self):
+        ledger = self._ledger(max_segment_bytes=1)
+        ledger.append_entries(ENTRIES[:1])
+        ledger.flush()
+        ledger.append_entries(ENTRIES[1:2])
+        ledger.flush()
+        self.clock.when = datetime(2026, 2, 1, tzinfo=timezone.utc)
+        ledger.append_entries(ENTRIES[2:])
+        ledger.flush()
+
+        self.assertEqual(
+            ledger.segments(),
+            ["ledger-202601-0001.jsonl.gz", "ledger-202601-0002.jsonl.gz", "ledger-202602-0001.jsonl.gz"],
+        )
+        self.assertEqual(list(ledger.iter_entries()), ENTRIES)
+
+    def test_email_selection_is_indexed_under_the_selected_jobs(self):
+        ledger = self._ledger(max_segment_bytes=1)
+        ledger.append_entries([dict(entry, sent_in_email=False) for entry in ENTRIES])
+        ledger.flush()
+        ledger.record_email_selection("run-2", {"alpha::2"})
+
+        self.assertEqual([entry["sent_in_email"] for entry in ledger.job_history("alpha::2")], [True])
+        self.assertEqual([run["sent_in_email"] for run in ledger.company_runs("Alpha")], [0, 1])
+
+    def test_compact_keeps_latest_state_per_job(self):
+        ledger = self._ledger(max_segment_bytes=1)
+        for entry in ENTRIES:
+            ledger.append_entries([entry])
+            ledger.flush()
+
+        self.assertEqual(ledger.compact(), 3)
+
+        self.assertEqual(ledger.segments(), ["ledger-202601-0004.jsonl.gz"])
+        latest = {entry["feedback_id"]: entry["run_id"] for entry in ledger.iter_entries()}
+        self.assertEqual(latest, {"alpha::1": "run-2", "beta::7": "run-1", "alpha::2": "run-2"})
+        self.assertEqual(len(ledger.job_history("alpha::1")), 1)
+        self.assertEqual(ledger.compact(), 0)
+
+    def test_rebuild_index_recovers_lookups(self):
+        ledger = self._ledger()
+        ledger.append_entries(ENTRIES)
+        ledger.flush()
+        os.remove(os.path.join(self.directory, INDEX_FILE))
+
+        self.assertEqual(ledger.rebuild_index(), 1)
+        self.assertEqual(len(ledger.job_history("alpha::1")), 2)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, SNAPSHOT_FILE)))
+
+    def test_jsonl_history_is_imported_once(self):
+        history = JsonlLedger(self.ledger_path, self.audit_path)
+        history.append_entries(ENTRIES)
+        history.append_run_audit({"run_id": "run-1"})
+        history.close()
+
+        self._ledger().close()
+        reopened = self._ledger()
+
+        self.assertEqual(list(reopened.iter_entries()), ENTRIES)
+        self.assertEqual(len(list(reopened.iter_run_audits())), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import main
+from agent.audit import RunAudit
+from agent.ledger import LedgerWriter
+from agent.ledger_store import JsonlLedger, SqliteLedger, ledger_streaming
+
+
+def _entry(run_id, evaluated_at, feedback_id, company, score, description_hash="", sent=False):
+    return {
+        "run_id": run_id,
+        "evaluated_at": evaluated_at,
+        "feedback_id": feedback_id,
+        "company": company,
+        "score": score,
+        "description_hash": description_hash,
+        "sent_in_email": sent,
+        "title": "Senior Product Manager",
+    }
+
+
+ENTRIES = [
+    _entry("run-1", "2026-01-01T10:00:00+00:00", "alpha::1", "Alpha", 8, "aaa", sent=True),
+    _entry("run-1", "2026-01-01T10:01:00+00:00", "beta::7", "Beta", 5, "bbb"),
+    _entry("run-2", "2026-01-02T10:00:00+00:00", "alpha::1", "Alpha", 6, "aaa"),
+    _entry("run-2", "2026-01-02T10:02:00+00:00", "alpha::2", "Alpha", 9, "ccc", sent=True),
+]
+
+
+class LedgerBackendTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.ledger_path = os.path.join(self.tmpdir.name, "job_ledger.jsonl")
+        self.audit_path = os.path.join(self.tmpdir.name, "run_audits.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _backends(self):
+        jsonl = JsonlLedger(self.ledger_path, self.audit_path)
+        jsonl.append_entries(ENTRIES[:2])
+        jsonl.append_run_audit({"run_id": "run-1", "started_at": "2026-01-01T09:59:00+00:00"})
+        jsonl.flush()
+        # The SQLite backend imports the existing JSONL history on first open
+        sqlite = SqliteLedger(os.path.join(self.tmpdir.name, "job_ledger.sqlite3"), self.ledger_path, self.audit_path)
+        for backend in (jsonl, sqlite):
+            backend.append_entries(ENTRIES[2:])
+        return [jsonl, sqlite]
+
+    def test_backends_answer_queries_identically(self):
+        for backend in self._backends():
+            with self.subTest(backend=type(backend).__name__):
+                self.assertEqual(
+                    [entry["run_id"] for entry in backend.job_history("alpha::1")],
+                    ["run-1", "run-2"],
+                )
+                self.assertEqual(backend.latest_for_description("aaa")["run_id"], "run-2")
+                self.assertIsNone(backend.latest_for_description("missing"))
+                self.assertEqual(
+                    backend.company_runs("Alpha"),
+                    [
+                        {"run_id": "run-1", "evaluated_at": "2026-01-01T10:00:00+00:00", "jobs": 1, "max_score": 8, "sent_in_email": 1},
+                        {"run_id": "run-2", "evaluated_at": "2026-01-02T10:00:00+00:00", "jobs": 2, "max_score": 9, "sent_in_email": 1},
+                    ],
+                )
+                self.assertEqual(
+                    backend.score_distribution(),
+                    {"2026-01-01": {5: 1, 8: 1}, "2026-01-02": {6: 1, 9: 1}},
+                )
+                self.assertEqual(backend.score_distribution(since="2026-01-02", period="month"), {"2026-01": {6: 1, 9: 1}})
+                backend.close()
+
+    def test_sqlite_export_round_trips_jsonl(self):
+        sqlite = self._backends()[1]
+        export_path = os.path.join(self.tmpdir.name, "export.jsonl")
+        audit_export_path = os.path.join(self.tmpdir.name, "export_audits.jsonl")
+
+        count = sqlite.export_jsonl(export_path, audit_export_path)
+        sqlite.close()
+
+        exported = JsonlLedger(export_path, audit_export_path)
+        self.assertEqual(count, 4)
+        self.assertEqual(list(exported.iter_entries()), ENTRIES)
+        self.assertEqual([audit["run_id"] for audit in exported.iter_run_audits()], ["run-1"])
+
+    def test_sqlite_imports_jsonl_only_once(self):
+        history = JsonlLedger(self.ledger_path, self.audit_path)
+        history.append_entries(ENTRIES[:1])
+        history.close()
+        db_path = os.path.join(self.tmpdir.name, "job_ledger.sqlite3")
+
+        SqliteLedger(db_path, self.ledger_path, self.audit_path).close()
+        reopened = SqliteLedger(db_path, self.ledger_path, self.audit_path)
+
+        self.assertEqual(len(list(reopened.iter_entries())), 1)
+        reopened.close()
+
+
+class LedgerWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.ledger_path = os.path.join(self.tmpdir.name, "nested", "job_ledger.jsonl")
+        self.audit_path = os.path.join(self.tmpdir.name, "run_audits.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_buffers_until_flush_then_writes_one_batch_per_file(self):
+        writer = LedgerWriter()
+        for entry in ENTRIES:
+            writer.add(entry, self.ledger_path)
+        writer.add({"run_id": "run-2"}, self.audit_path)
+
+        self.assertFalse(os.path.exists(self.ledger_path))
+        self.assertEqual(writer.pending(), 5)
+        self.assertEqual(writer.flush(), 5)
+
+        self.assertEqual(writer.stats(), {"flushes": 2, "records": 5})
+        self.assertEqual(list(JsonlLedger(self.ledger_path, self.audit_path).iter_entries()), ENTRIES)
+
+    def test_context_manager_flushes_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with LedgerWriter() as writer:
+                writer.add(ENTRIES[0], self.ledger_path)
+                raise RuntimeError("boom")
+
+        with open(self.ledger_path) as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_jsonl_backend_counts_flushes(self):
+        ledger = JsonlLedger(self.ledger_path, self.audit_path)
+        ledger.append_entries(ENTRIES)
+        ledger.flush()
+        ledger.append_run_audit({"run_id": "run-2"})
+        ledger.close()
+
+        self.assertEqual(ledger.stats(), {"flushes": 2, "records": 5})
+
+
+class StreamingLedgerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.ledger_path = os.path.join(self.tmpdir.name, "job_ledger.jsonl")
+        self.audit_path = os.path.join(self.tmpdir.name, "run_audits.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _result(self):
+        jobs = [
+            {"id": "1", "title": "Staff Product Manager", "company": "Alpha", "description": "Long body.", "score": 8},
+            {"id": "2", "title": "Product Manager", "company": "Alpha", "description": "Other body.", "score": 5},
+        ]
+        for job in jobs:
+            job["feedback_id"] = f"alpha::{job['id']}"
+        return {
+            "company": "Alpha",
+            "jobs": jobs,
+            "scraped_count": 2,
+            "duplicate_notes": [],
+            "new_count": 2,
+            "candidate_count": 2,
+            "evaluated": jobs,
+            "error": "",
+            "error_detail": "",
+        }
+
+    def test_streaming_is_opt_in(self):
+        with mock.patch.dict(os.environ, {}):
+            os.environ.pop("JOB_LEDGER_STREAMING", None)
+            self.assertFalse(ledger_streaming())
+        with mock.patch.dict(os.environ, {"JOB_LEDGER_STREAMING": "1"}):
+            self.assertTrue(ledger_streaming())
+
+    def test_merge_writes_provisional_entries_and_frees_descriptions(self):
+        ledger = JsonlLedger(self.ledger_path, self.audit_path)
+        state = {"seen_jobs": {}, "evaluated_jobs": [], "new_jobs_by_company": {}, "low_jobs_by_company": {}, "errors": []}
+        audit = RunAudit(run_id="run-1")
+
+        main.merge_company_result(self._result(), state, audit, ledger)
+
+        written = list(JsonlLedger(self.ledger_path, self.audit_path).iter_entries())
+        self.assertEqual([entry["sent_in_email"] for entry in written], [False, False])
+        self.assertNotEqual(written[0]["description_hash"], "")
+        self.assertNotIn("description", state["new_jobs_by_company"]["Alpha"][0])
+
+    def test_email_selection_is_folded_into_entries(self):
+        for backend in (
+            JsonlLedger(self.ledger_path, self.audit_path),
+            SqliteLedger(os.path.join(self.tmpdir.name, "job_ledger.sqlite3"), "", ""),
+        ):
+            with self.subTest(backend=type(backend).__name__):
+                backend.append_entries([dict(entry, sent_in_email=False) for entry in ENTRIES])
+                backend.flush()
+                backend.record_email_selection("run-2", {"alpha::2"})
+
+                sent = [(entry["run_id"], entry["feedback_id"]) for entry in backend.iter_entries() if entry["sent_in_email"]]
+                self.assertEqual(sent, [("run-2", "alpha::2")])
+                self.assertEqual([run["sent_in_email"] for run in backend.company_runs("Alpha")], [0, 1])
+                backend.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
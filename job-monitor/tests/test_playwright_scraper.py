@@ -1,6 +1,75 @@
+import os
 import unittest
+from contextlib import contextmanager
+from unittest import mock
 
-from scrapers.playwright_scraper import _generate_id, _is_company_specific_job_url
+from scrapers import playwright_scraper
+from scrapers.readiness import LINK_COUNT_PROBE
+from scrapers.playwright_scraper import (
+    HARVEST_LINKS_JS,
+    PAGE_LENGTH_JS,
+    _generate_id,
+    _is_company_specific_job_url,
+    _link_probe_arg,
+    _links_from_html,
+    scrape_playwright,
+)
+
+LISTING_HTML = """
+<html><body>
+  <ul>
+    <li><a href=" /jobs/123 "> Senior Product Manager, <span>AI</span> </a><span>Remote - US</span></li>
+    <li><a href="/jobs/123">Duplicate link</a></li>
+    <li><a href="/blog/jobs-we-love">Jobs we love</a><span>New York, NY</span></li>
+    <li><a href="/team/0a1b2c3d-0000-1111-2222-333344445555">Staff Product Manager</a>San Francisco, CA</li>
+    <li><a href="/jobs/9">PM</a></li>
+    <li><a href="#apply">Apply now</a></li>
+  </ul>
+</body></html>
+"""
+
+
+class _FakePage:
+    def __init__(self, html, harvest=None, evaluate_error=None):
+        self.html = html
+        self.harvest = harvest
+        self.evaluate_error = evaluate_error
+        self.content_calls = 0
+        self.evaluated = []
+        self.probes = []
+        self.listeners = {}
+
+    def goto(self, url, **options):
+        pass
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    def wait_for_timeout(self, milliseconds):
+        pass
+
+    def query_selector(self, selector):
+        return None
+
+    def evaluate(self, script, arg=None):
+        if script == PAGE_LENGTH_JS:
+            self.evaluated.append((script, arg))
+            return len(self.html)
+        if script != HARVEST_LINKS_JS:
+            # Readiness probe: the job-link count
+            self.probes.append((script, arg))
+            return 3
+        self.evaluated.append((script, arg))
+        if self.evaluate_error:
+            raise self.evaluate_error
+        return self.harvest
+
+    def content(self):
+        self.content_calls += 1
+        return self.html
 
 
 class PlaywrightScraperUrlTests(unittest.TestCase):
@@ -12,6 +81,13 @@ class PlaywrightScraperUrlTests(unittest.TestCase):
             _is_company_specific_job_url("https://www.twilio.com/careers/job/1099553537887", "Twilio")
         )
 
+    def test_readiness_probe_applies_the_company_path_rule(self):
+        self.assertEqual(
+            (_link_probe_arg("Twilio")["host"], _link_probe_arg("Twilio")["pathPrefix"]),
+            ("twilio.com", "/careers/job/"),
+        )
+        self.assertEqual(_link_probe_arg("ExampleCo")["host"], "")
+
     def test_twilio_job_id_ignores_dynamic_card_text(self):
         url = "https://www.twilio.com/careers/job/1099553537887"
 
@@ -33,5 +109,62 @@ class PlaywrightScraperUrlTests(unittest.TestCase):
         )
 
 
+class PlaywrightHarvestTests(unittest.TestCase):
+    def _scrape(self, page, mode="browser"):
+        @contextmanager
+        def fake_browser_page():
+            yield page
+
+        with mock.patch.object(playwright_scraper, "browser_page", fake_browser_page), \
+                mock.patch.dict(os.environ, {"JOB_PLAYWRIGHT_HARVEST": mode, "JOB_READY_STABLE_MS": "0"}), \
+                mock.patch("builtins.print"):
+            return scrape_playwright("https://example.com/careers", "ExampleCo")
+
+    def test_html_harvest_keeps_the_anchor_filters(self):
+        jobs = self._scrape(_FakePage(LISTING_HTML), mode="html")
+
+        self.assertEqual(
+            [(job["url"], job["title"], job["location"]) for job in jobs],
+            [
+                ("https://example.com/jobs/123", "Senior Product Manager,AI", "Remote"),
+                (
+                    "https://example.com/team/0a1b2c3d-0000-1111-2222-333344445555",
+                    "Staff Product Manager",
+                    "Staff Product ManagerSan Francisco, CA",
+                ),
+            ],
+        )
+
+    def test_browser_harvest_skips_the_page_html(self):
+        harvest = _links_from_html(LISTING_HTML)
+        page = _FakePage(LISTING_HTML, harvest=harvest)
+
+        jobs = self._scrape(page)
+
+        self.assertEqual(page.content_calls, 0)
+        self.assertEqual(page.probes[0][0], LINK_COUNT_PROBE)
+        self.assertEqual(page.probes[0][1]["uuidPattern"], playwright_scraper.UUID_PATTERN.pattern)
+        self.assertEqual(page.listeners, {"request": [], "requestfinished": [], "requestfailed": []})
+        self.assertEqual(len(page.evaluated), 1)
+        script, arg = page.evaluated[0]
+        self.assertEqual(script, HARVEST_LINKS_JS)
+        self.assertIn("/jobs/", arg["keywords"])
+        self.assertEqual(jobs, self._scrape(_FakePage(LISTING_HTML), mode="html"))
+
+    def test_page_length_is_measured_only_when_no_links_are_found(self):
+        page = _FakePage(LISTING_HTML, harvest={"links": [], "samples": []})
+
+        self.assertEqual(self._scrape(page), [])
+        self.assertEqual([script for script, _ in page.evaluated], [HARVEST_LINKS_JS, PAGE_LENGTH_JS])
+
+    def test_failed_browser_harvest_falls_back_to_page_html(self):
+        page = _FakePage(LISTING_HTML, evaluate_error=RuntimeError("Execution context was destroyed"))
+
+        jobs = self._scrape(page)
+
+        self.assertEqual(page.content_calls, 1)
+        self.assertEqual(jobs, self._scrape(_FakePage(LISTING_HTML), mode="html"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,252 @@
+import json
+import os
+import tempfile
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+
+from agent.readiness_hints import MIN_LEARNED_DEADLINE_MS, ReadinessHints
+from scrapers import facetwp_scraper
+from scrapers.readiness import PageReadiness, ReadinessPlan, goto_when_ready
+
+
+class _ClockPage:
+    """Fake Playwright page on a fake clock that wait_for_timeout advances.
+
+    values: [(from_ms, probe value)], the last entry at or before now wins.
+    requests: [(start_ms, end_ms)] fired to request listeners as time passes.
+    """
+
+    def __init__(self, values, requests=(), selector_at_ms=None, on_click=None):
+        self.now_ms = 0
+        self.values = values
+        self.pending = sorted([(start, "request") for start, _ in requests] + [(end, "requestfinished") for _, end in requests])
+        self.selector_at_ms = selector_at_ms
+        self.on_click = on_click
+        self.listeners = {}
+
+    def clock(self):
+        return self.now_ms / 1000
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    def _fire_due(self):
+        while self.pending and self.pending[0][0] <= self.now_ms:
+            _, event = self.pending.pop(0)
+            for handler in list(self.listeners.get(event, [])):
+                handler(object())
+
+    def goto(self, url, **options):
+        self._fire_due()
+
+    def click(self, selector):
+        self.on_click(self)
+
+    def wait_for_timeout(self, milliseconds):
+        self.now_ms += milliseconds
+        self._fire_due()
+
+    def evaluate(self, script, arg=None):
+        value = None
+        for from_ms, candidate in self.values:
+            if from_ms <= self.now_ms:
+                value = candidate
+        return value
+
+    def query_selector(self, selector):
+        if self.selector_at_ms is not None and self.now_ms >= self.selector_at_ms:
+            return object()
+        return None
+
+    def content(self):
+        return ""
+
+
+def _wait(page, **options):
+    readiness = PageReadiness(page, clock=page.clock)
+    try:
+        return readiness.wait(stable_ms=600, idle_ms=500, poll_ms=100, **options)
+    finally:
+        readiness.close()
+
+
+class PageReadinessTests(unittest.TestCase):
+    def test_stops_once_the_probe_holds_still(self):
+        page = _ClockPage([(0, 0), (400, 5), (900, 12)], requests=[(0, 1200)])
+
+        result = _wait(page, deadline_ms=10_000)
+
+        self.assertEqual(result["signal"], "stable")
+        self.assertEqual(result["value"], 12)
+        self.assertEqual(result["settled_ms"], 900)
+        # Stable for 600ms once the last request finished at 1200ms, well before the deadline
+        self.assertLess(result["elapsed_ms"], 2_500)
+        self.assertEqual(page.listeners, {"request": [], "requestfinished": [], "requestfailed": []})
+
+    def test_in_flight_requests_double_the_stability_window(self):
+        page = _ClockPage([(0, 3)], requests=[(0, 5_000)])
+
+        result = _wait(page, deadline_ms=10_000)
+
+        self.assertEqual(result["signal"], "stable")
+        self.assertEqual(result["elapsed_ms"], 1_200)
+
+    def test_selector_wins_over_waiting_for_stability(self):
+        page = _ClockPage([(0, 1), (100, 2), (200, 3), (300, 4), (400, 5)], selector_at_ms=300)
+
+        result = _wait(page, selector=".jobs a", deadline_ms=10_000)
+
+        self.assertEqual((result["signal"], result["elapsed_ms"]), ("selector", 300))
+
+    def test_empty_page_ends_on_network_idle(self):
+        page = _ClockPage([(0, 0)], requests=[(0, 700)])
+
+        result = _wait(page, deadline_ms=10_000)
+
+        self.assertEqual(result["signal"], "network_idle")
+        self.assertEqual(result["elapsed_ms"], 1_200)
+
+    def test_hard_deadline_caps_a_page_that_never_settles(self):
+        page = _ClockPage([(ms, ms) for ms in range(0, 20_000, 100)], requests=[(0, 30_000)])
+
+        result = _wait(page, deadline_ms=3_000)
+
+        self.assertEqual(result["signal"], "deadline")
+        self.assertEqual(result["elapsed_ms"], 3_000)
+        self.assertEqual(result["settled_ms"], 3_000)
+
+    def test_baseline_waits_for_the_probe_to_move(self):
+        page = _ClockPage([(0, "10:/jobs/1"), (800, "10:/jobs/11")])
+
+        result = _wait(page, deadline_ms=10_000, baseline="10:/jobs/1")
+
+        self.assertEqual(result["value"], "10:/jobs/11")
+        self.assertGreaterEqual(result["elapsed_ms"], 800)
+
+    def test_navigation_waits_for_links_requested_after_an_idle_gap(self):
+        # The bundle loads, the network idles for 1.3s, then the jobs request fills the list
+        page = _ClockPage([(0, 0), (2_000, 4)], requests=[(0, 200), (1_500, 2_000)])
+
+        with mock.patch("scrapers.readiness.time.monotonic", page.clock), \
+                mock.patch.dict(os.environ, {"JOB_READY_STABLE_MS": "600", "JOB_READY_POLL_MS": "100"}):
+            result = goto_when_ready(page, "https://example.com/jobs", ReadinessPlan(deadline_ms=10_000))
+
+        self.assertEqual((result["value"], result["settled_ms"]), (4, 2_000))
+        self.assertLess(result["elapsed_ms"], 3_000)
+
+    def test_goto_reports_to_the_plan(self):
+        page = _ClockPage([(0, 4)])
+        reported = []
+
+        with mock.patch("scrapers.readiness.time.monotonic", page.clock), \
+                mock.patch.dict(os.environ, {"JOB_READY_STABLE_MS": "300", "JOB_READY_POLL_MS": "100"}):
+            result = goto_when_ready(page, "https://example.com/jobs", ReadinessPlan(deadline_ms=5_000, on_result=reported.append))
+
+        self.assertEqual(reported, [result])
+        self.assertEqual((result["signal"], result["elapsed_ms"]), ("stable", 300))
+
+
+class ReadinessHintsTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "readiness_hints.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _result(self, signal, settled_ms, elapsed_ms, deadline_ms=10_000, value=12):
+        return {"signal": signal, "settled_ms": settled_ms, "elapsed_ms": elapsed_ms, "deadline_ms": deadline_ms, "value": value}
+
+    def test_learns_a_tighter_deadline_and_persists_it(self):
+        company = {"name": "Quick"}
+        hints = ReadinessHints(self.path)
+        self.assertEqual(hints.plan_for(company).deadline_ms, 10_000)
+
+        for _ in range(3):
+            hints.plan_for(company).report(self._result("deadline", 1_000, 10_000))
+        hints.save()
+
+        reloaded = ReadinessHints(self.path)
+        self.assertEqual(reloaded.plan_for(company).deadline_ms, 3_200)
+        self.assertEqual(reloaded.hint("Quick")["runs"], 3)
+        self.assertEqual(hints.stats(), {"waits": 3, "wait_ms": 30_000, "deadline_hits": 3, "signals": {"deadline": 3}, "learned": 1})
+        with open(self.path) as f:
+            self.assertEqual(json.load(f)["companies"]["Quick"]["settled_ms"], 1_000)
+
+    def test_learned_deadline_stays_within_bounds(self):
+        hints = ReadinessHints(self.path)
+        for _ in range(2):
+            hints.record("Instant", self._result("stable", 0, 600))
+            hints.record("Slow", self._result("stable", 9_000, 9_600))
+
+        self.assertEqual(hints.plan_for({"name": "Instant"}).deadline_ms, MIN_LEARNED_DEADLINE_MS)
+        self.assertEqual(hints.plan_for({"name": "Slow"}).deadline_ms, 10_000)
+
+    def test_still_changing_at_the_deadline_forgets_the_learned_value(self):
+        hints = ReadinessHints(self.path)
+        for _ in range(2):
+            hints.record("Flaky", self._result("stable", 500, 1_100))
+        self.assertLess(hints.plan_for({"name": "Flaky"}).deadline_ms, 10_000)
+
+        hints.record("Flaky", self._result("deadline", 2_100, 2_200, deadline_ms=2_200))
+
+        self.assertEqual(hints.plan_for({"name": "Flaky"}).deadline_ms, 10_000)
+
+    def test_empty_results_teach_no_settle_time(self):
+        hints = ReadinessHints(self.path)
+        for _ in range(2):
+            hints.record("Learned", self._result("stable", 500, 1_100))
+        hints.record("Empty", self._result("network_idle", 0, 3_000, value=0))
+
+        self.assertEqual(hints.hint("Empty"), {})
+        self.assertEqual(hints.stats()["waits"], 3)
+
+        hints.record("Learned", self._result("deadline", 0, 2_000, deadline_ms=2_000, value=0))
+
+        self.assertEqual(hints.plan_for({"name": "Learned"}).deadline_ms, 10_000)
+
+    def test_company_overrides_win(self):
+        hints = ReadinessHints(self.path)
+        for _ in range(2):
+            hints.record("Pinned", self._result("stable", 100, 700))
+
+        plan = hints.plan_for({"name": "Pinned", "ready_selector": ".jobs a", "ready_deadline_ms": 7_000})
+
+        self.assertEqual((plan.selector, plan.deadline_ms), (".jobs a", 7_000))
+
+
+class FacetwpReadinessTests(unittest.TestCase):
+    def test_pagination_waits_for_the_listing_to_change(self):
+        listing = '<div class="facetwp-template"><a href="/jobs/{0}">Product Manager {0}</a></div>{1}'
+        pages = [listing.format(1, '<a class="facetwp-page last" data-page="2">2</a>'), listing.format(2, "")]
+
+        def click(page):
+            # FacetWP swaps the listing 700ms after the click
+            page.values = page.values + [(page.now_ms + 700, "1:/jobs/2")]
+
+        page = _ClockPage([(0, "1:/jobs/1")], on_click=click)
+        page.content = lambda: pages[0] if page.evaluate(None) == "1:/jobs/1" else pages[1]
+
+        @contextmanager
+        def fake_browser_page():
+            yield page
+
+        reported = []
+        plan = ReadinessPlan(deadline_ms=5_000, on_result=reported.append)
+        with mock.patch.object(facetwp_scraper, "browser_page", fake_browser_page), \
+                mock.patch("scrapers.readiness.time.monotonic", page.clock), \
+                mock.patch("builtins.print"):
+            jobs = facetwp_scraper.scrape_facetwp("https://example.com/positions/", "ExampleCo", plan)
+
+        self.assertEqual([job["title"] for job in jobs], ["Product Manager 1", "Product Manager 2"])
+        self.assertLess(page.now_ms, 5_000)
+        # Only the navigation wait feeds the learned deadline, not the pagination click
+        self.assertEqual(len(reported), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
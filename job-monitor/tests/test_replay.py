@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from agent.descriptions import DescriptionStore
+from agent.feedback import apply_analysis
+from agent.ledger import ledger_entry
+from agent.ledger_store import JsonlLedger
+from agent.replay import Replayer, select_entries
+from ai.analyzer import _fallback, _normalize_result
+
+DESCRIPTION = (
+    "Own the roadmap for AI support agents that resolve customer issues across chat and email. "
+    "Partner with engineering on evals, guardrails, and human handoff workflows for enterprise customers. "
+    "Define success metrics for resolution automation and ship platform APIs used by support teams. "
+    "Remote in the United States."
+)
+
+RAW = {
+    "score": 9,
+    "reason": "Direct match on AI support agents.",
+    "summary": "Owns AI support agent roadmap.",
+    "competitive_angle": "Support automation background.",
+    "evidence": ["AI support agents", "evals and guardrails"],
+    "concerns": ["Enterprise sales cycle"],
+    "extraction": {
+        "role_type": "PM",
+        "seniority": "Senior",
+        "domain_lanes": ["ai_support_agents"],
+        "location_fit": "remote_us",
+        "evidence_strength": "strong",
+        "red_flags": [],
+        "confidence": 0.9,
+    },
+}
+
+
+def _job(job_id="1"):
+    return {
+        "id": job_id,
+        "company": "Alpha",
+        "title": "Senior Product Manager, AI Support",
+        "location": "Remote - US",
+        "url": f"https://alpha.example/jobs/{job_id}",
+        "description": DESCRIPTION,
+        "feedback_id": f"Alpha::{job_id}",
+    }
+
+
+class ReplayTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.descriptions = DescriptionStore(os.path.join(self.tmpdir.name, "descriptions"))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _entry(self, analysis, job_id="1", feedback=None):
+        job = _job(job_id)
+        job["description_sha256"] = self.descriptions.put(job["description"], job["url"])
+        apply_analysis(job, analysis, feedback or {})
+        return ledger_entry(job, "run-1", False)
+
+    def test_replay_with_unchanged_rules_reproduces_scores(self):
+        job = _job()
+        entries = [
+            self._entry(_normalize_result(RAW, job)),
+            self._entry(_fallback(5, "No API key", "", job), job_id="2"),
+        ]
+
+        report = Replayer({}, self.descriptions).replay(entries)
+
+        self.assertEqual(report.counts["replayed"], 2)
+        self.assertEqual(report.counts["unchanged"], 2)
+
+    def test_new_feedback_rule_reports_tier_changes(self):
+        entry = self._entry(_normalize_result(RAW, _job()))
+        self.assertEqual(entry["fit_tier"], "Bullseye")
+        feedback = {"rules": [{"name": "watch support roles", "title_contains": "AI Support", "cap": 6}]}
+
+        report = Replayer(feedback, self.descriptions).replay([entry])
+
+        self.assertEqual(report.counts["tier_changed"], 1)
+        self.assertEqual(report.counts["score_lowered"], 1)
+        self.assertEqual(report.tier_changes[("Bullseye", "Watchlist")], 1)
+        self.assertEqual(report.examples[0]["score"], [9, 6])
+        self.assertIn("watch support roles: capped at 6", report.examples[0]["calibration"])
+
+    def test_entries_without_raw_output_or_stored_text_are_skipped(self):
+        entry = self._entry(_normalize_result(RAW, _job()))
+        legacy = dict(entry, analysis_raw={})
+        missing_text = dict(entry, description_sha256="0" * 64)
+
+        with mock.patch("builtins.print") as printed:
+            report = Replayer({}, self.descriptions).replay([legacy, missing_text])
+
+        self.assertEqual(report.counts["skipped_no_analysis_raw"], 1)
+        self.assertEqual(report.counts["skipped_no_description"], 1)
+        self.assertEqual(report.counts["replayed"], 0)
+        printed.assert_called_once_with("[WARN] Skipped 1 ledger entries whose description text is not stored")
+
+    def test_entries_with_inline_text_are_backfilled(self):
+        entry = self._entry(_normalize_result(RAW, _job()))
+        legacy = dict(entry, description_sha256="", description=DESCRIPTION)
+
+        report = Replayer({}, DescriptionStore(os.path.join(self.tmpdir.name, "empty"))).replay([legacy])
+
+        self.assertEqual(report.counts["replayed"], 1)
+        self.assertEqual(report.counts["unchanged"], 1)
+
+    def test_latest_selection_reads_from_the_ledger(self):
+        ledger = JsonlLedger(os.path.join(self.tmpdir.name, "job_ledger.jsonl"), os.path.join(self.tmpdir.name, "runs.jsonl"))
+        older = dict(self._entry(_normalize_result(RAW, _job())), evaluated_at="2026-01-01T00:00:00+00:00")
+        newer = dict(older, evaluated_at="2026-02-01T00:00:00+00:00", run_id="run-2")
+        ledger.append_entries([older, newer])
+        ledger.close()
+
+        selected = list(select_entries(ledger.iter_entries(), latest=True))
+
+        self.assertEqual([entry["run_id"] for entry in selected], ["run-2"])
+        self.assertEqual(list(select_entries([older, newer], since="2026-01-15")), [newer])
+
+
+if __name__ == "__main__":
+    unittest.main()
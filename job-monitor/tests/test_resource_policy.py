@@ -0,0 +1,109 @@
+import os
+import unittest
+from unittest import mock
+
+import main
+from agent.audit import RunAudit
+from companies import COMPANIES
+from scrapers.resource_policy import (
+    ResourcePolicy,
+    current_resource_scope,
+    resource_policy_for,
+    resource_scope,
+)
+
+
+class ResourcePolicyTests(unittest.TestCase):
+    def test_blocks_heavy_types_and_trackers_only(self):
+        policy = ResourcePolicy()
+
+        self.assertEqual(policy.block_reason("image", "https://stripe.com/img/hero.png"), "image")
+        self.assertEqual(policy.block_reason("font", "https://fonts.gstatic.com/s/inter.woff2"), "font")
+        self.assertEqual(policy.block_reason("script", "https://www.googletagmanager.com/gtm.js"), "tracker")
+        self.assertEqual(policy.block_reason("xhr", "https://analytics.twitter.com/i/adsct?p=1"), "tracker")
+        self.assertEqual(policy.block_reason("script", "https://twitter.com/widgets.js"), "")
+        self.assertEqual(policy.block_reason("image", "https://t.co/i/adsct?p=1"), "image")
+        self.assertEqual(policy.block_reason("script", "https://stripe.com/jobs/search.js"), "")
+        self.assertEqual(policy.block_reason("xhr", "https://api.ashbyhq.com/posting-api/job-board/x"), "")
+        self.assertEqual(policy.block_reason("image", "data:image/png;base64,AAAA"), "")
+
+    def test_company_allowlists_override_blocking(self):
+        company = {
+            "name": "HubSpot",
+            "allow_resource_types": ["stylesheet"],
+            "allow_resource_domains": ["hs-analytics.net"],
+        }
+        policy = resource_policy_for(company)
+
+        self.assertEqual(policy.block_reason("stylesheet", "https://www.hubspot.com/main.css"), "")
+        self.assertEqual(policy.block_reason("script", "https://js.hs-analytics.net/analytics/123.js"), "")
+        self.assertEqual(policy.block_reason("script", "https://www.google-analytics.com/analytics.js"), "tracker")
+        self.assertEqual(policy.block_reason("image", "https://www.hubspot.com/logo.png"), "image")
+
+    def test_environment_configures_the_default_policy(self):
+        env = {
+            "JOB_BROWSER_BLOCKED_TYPES": "media",
+            "JOB_BROWSER_BLOCKED_DOMAINS": "cdn.example-tracker.io",
+        }
+        with mock.patch.dict(os.environ, env):
+            policy = resource_policy_for()
+        with mock.patch.dict(os.environ, {"JOB_BROWSER_BLOCK_RESOURCES": "0"}):
+            disabled = resource_policy_for()
+
+        self.assertEqual(policy.block_reason("image", "https://example.com/a.png"), "")
+        self.assertEqual(policy.block_reason("media", "https://example.com/a.mp4"), "media")
+        self.assertEqual(policy.block_reason("script", "https://cdn.example-tracker.io/t.js"), "tracker")
+        self.assertFalse(disabled.enabled)
+        self.assertEqual(disabled.block_reason("image", "https://example.com/a.png"), "")
+
+    def test_configured_allowlists_are_known_resource_types(self):
+        known = {"document", "stylesheet", "image", "media", "font", "script", "xhr", "fetch", "other"}
+        for company in COMPANIES:
+            with self.subTest(company=company["name"]):
+                self.assertLessEqual(set(company.get("allow_resource_types", [])), known)
+
+
+class CompanyResourceStatsTests(unittest.TestCase):
+    def setUp(self):
+        self.original_scrape = main.scrape_company
+
+    def tearDown(self):
+        main.scrape_company = self.original_scrape
+
+    def test_blocked_requests_are_reported_per_company(self):
+        seen_policies = []
+
+        def scrape(company, snapshots=None, readiness=None):
+            # What the route handler records for pages leased during the scrape
+            policy, usage = current_resource_scope()
+            seen_policies.append(policy)
+            for resource_type in ("image", "image", "font"):
+                usage.record(resource_type)
+            return []
+
+        main.scrape_company = scrape
+        company = {"name": "Stripe", "type": "playwright", "board_token": "https://stripe.com/jobs/search"}
+        state = {"seen_jobs": {}, "evaluated_jobs": [], "new_jobs_by_company": {}, "low_jobs_by_company": {}, "errors": []}
+        audit = RunAudit(run_id="fixed")
+
+        result = main.process_company(company, [], {})
+        main.merge_company_result(result, state, audit)
+
+        self.assertEqual(seen_policies[0].block_reason("image", "https://stripe.com/a.png"), "image")
+        self.assertEqual(result["resources_blocked"], 3)
+        self.assertEqual(audit.company_stats["Stripe"]["requests_blocked"], 3)
+        self.assertEqual(audit.company_stats["Stripe"]["estimated_bytes_avoided"], result["resource_estimated_bytes_avoided"])
+        self.assertEqual(audit.stats["browser_requests_blocked"], 3)
+        # The scope ends with the company
+        self.assertIsNot(current_resource_scope()[0], seen_policies[0])
+
+    def test_nested_scopes_restore_the_outer_policy(self):
+        outer, inner = ResourcePolicy(), ResourcePolicy(enabled=False)
+        with resource_scope(outer):
+            with resource_scope(inner):
+                self.assertIs(current_resource_scope()[0], inner)
+            self.assertIs(current_resource_scope()[0], outer)
+
+
+if __name__ == "__main__":
+    unittest.main()
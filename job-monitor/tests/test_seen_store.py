@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import main
+from agent.seen_store import SeenJobsStore, open_seen_store
+
+
+class SeenJobsStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "seen_jobs.sqlite3")
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_legacy_json_is_migrated_once(self):
+        legacy_path = os.path.join(self.tmpdir.name, "seen_jobs.json")
+        with open(legacy_path, "w") as f:
+            json.dump({"Alpha": ["3", "1", "2"], "Beta": []}, f)
+
+        store = open_seen_store(self.db_path, legacy_json=legacy_path)
+        self.assertEqual(main.load_seen_jobs(store), {"Alpha": ["3", "1", "2"]})
+        store.update_company("Alpha", ["3"], now=self.now)
+        store.close()
+
+        reopened = open_seen_store(self.db_path, legacy_json=legacy_path)
+        self.assertEqual(reopened.current_ids(), {"Alpha": ["3"]})
+        reopened.close()
+
+    def test_removed_ids_stay_known_until_retention_expires(self):
+        store = SeenJobsStore(self.db_path, retention_days=30)
+        store.update_company("Alpha", ["1", "2"], now=self.now)
+        store.update_company("Alpha", ["2", "4"], now=self.now + timedelta(days=1))
+
+        self.assertEqual(store.current_ids(), {"Alpha": ["2", "4"]})
+        self.assertEqual(store.known_ids(), {"Alpha": {"1", "2", "4"}})
+        self.assertEqual(store.first_seen("Alpha", "2"), self.now.isoformat(timespec="seconds"))
+
+        self.assertEqual(store.purge_removed(now=self.now + timedelta(days=10)), 0)
+        self.assertEqual(store.purge_removed(now=self.now + timedelta(days=40)), 1)
+        self.assertEqual(store.known_ids(), {"Alpha": {"2", "4"}})
+        store.close()
+
+    def test_relisted_id_becomes_current_again(self):
+        store = SeenJobsStore(self.db_path)
+        store.update_company("Alpha", ["1"], now=self.now)
+        store.update_company("Alpha", [], now=self.now + timedelta(days=1))
+        store.update_company("Alpha", ["1"], now=self.now + timedelta(days=2))
+
+        self.assertEqual(store.current_ids(), {"Alpha": ["1"]})
+        store.close()
+
+    def test_updates_in_the_same_second_or_behind_the_clock_mark_removals(self):
+        store = SeenJobsStore(self.db_path)
+        store.update_company("Alpha", ["1", "2"], now=self.now)
+        store.update_company("Alpha", ["2"], now=self.now)
+        self.assertEqual(store.current_ids(), {"Alpha": ["2"]})
+
+        store.update_company("Alpha", ["2", "3"], now=self.now - timedelta(minutes=5))
+
+        self.assertEqual(store.current_ids(), {"Alpha": ["2", "3"]})
+        self.assertEqual(store.known_ids(), {"Alpha": {"1", "2", "3"}})
+        store.close()
+
+    def test_save_adapter_writes_every_company(self):
+        store = SeenJobsStore(self.db_path)
+
+        self.assertTrue(main.save_seen_jobs({"Alpha": ["1", "2"], "Beta": ["9"]}, store))
+
+        self.assertEqual(main.load_seen_jobs(store), {"Alpha": ["1", "2"], "Beta": ["9"]})
+        store.close()
+
+    def test_get_new_jobs_uses_known_ids(self):
+        jobs = [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+
+        self.assertEqual(main.get_new_jobs(jobs, {"1", "3"}), [{"id": "2"}])
+        self.assertEqual(main.get_new_jobs(jobs, ["2"]), [{"id": "1"}, {"id": "3"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import unittest
+from unittest import mock
+
+from agent.url_repair import extract_candidate_links
+from scrapers import static
+from scrapers.facetwp_scraper import _parse_template
+from scrapers.job_details import extract_greenhouse_description, extract_readable_text
+from scrapers.soup import HTML_PARSERS, html_parser_name, make_soup
+
+DETAIL_PAGE = """
+<!doctype html>
+<html>
+  <head><title>Careers</title><script>window.__state = {"jobs": []};</script></head>
+  <body>
+    <nav>Careers Home Profile Login</nav>
+    <main>
+      <section class="job-description">
+        <h1>Staff Product Manager</h1>
+        <p>Own the AI support workflow platform &amp; its <b>evals</b>.</p>
+        <!-- apply widget -->
+        <p>Build guardrails, handoff, and resolution metrics.</p>
+      </section>
+    </main>
+    <footer>Privacy Terms</footer>
+  </body>
+</html>
+"""
+
+GREENHOUSE_CONTENT = """
+<div class="content-intro"><p>About Alpha</p></div>
+<div class="description">
+  <h2>About the role</h2>
+  <p>Build agentic customer support automation for enterprise teams.</p>
+</div>
+"""
+
+LISTING_PAGE = """
+<html><body>
+  <div class="facetwp-template">
+    <div class="job"><a href="/jobs/123-senior-pm">Senior Product Manager, Support AI</a><span>Remote - US</span></div>
+    <div class="job"><a href="/jobs/456-staff-pm">Staff Product Manager, Payments</a><span>New York, NY</span></div>
+    <div class="job"><a href="/blog/product-manager-guide">Product manager guide</a></div>
+    <div class="job"><a href="/about">About</a></div>
+  </div>
+  <a class="facetwp-page last" data-page="3">3</a>
+</body></html>
+"""
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, html):
+        self.text = html
+        self.content = html.encode("utf-8")
+
+    def raise_for_status(self):
+        pass
+
+
+def _scrape_fixtures():
+    job = {"id": "123", "title": "Senior Product Manager, Support AI", "company": "ExampleCo"}
+    with mock.patch.object(static, "http_get", lambda url: _Response(LISTING_PAGE)), \
+            mock.patch("builtins.print"):
+        return {
+            "readable_text": extract_readable_text(DETAIL_PAGE),
+            "greenhouse": extract_greenhouse_description(GREENHOUSE_CONTENT),
+            "candidate_links": extract_candidate_links(LISTING_PAGE, "https://example.com/careers", job),
+            "facetwp": _parse_template(LISTING_PAGE, "https://example.com/careers", "ExampleCo"),
+            "static": static.scrape_static("https://example.com/careers", "ExampleCo"),
+        }
+
+
+class HtmlParserBackendTests(unittest.TestCase):
+    def test_backends_agree_on_fixture_pages(self):
+        with mock.patch.dict(os.environ, {"JOB_HTML_PARSER": "html.parser"}):
+            expected = _scrape_fixtures()
+        self.assertIn("Staff Product Manager", expected["readable_text"])
+        self.assertEqual(len(expected["facetwp"]), 4)
+        self.assertEqual(len(expected["static"]), 2)
+
+        for parser in HTML_PARSERS:
+            with self.subTest(parser=parser), mock.patch.dict(os.environ, {"JOB_HTML_PARSER": parser}):
+                if html_parser_name() != parser:
+                    self.skipTest(f"{parser} is not installed")
+                self.assertEqual(_scrape_fixtures(), expected)
+
+    def test_backends_build_the_same_text_and_attributes(self):
+        html = '<div class="a b" hidden data-x="1">hi <!-- c --><b>x</b> &amp; <script>var a = "<p>";</script></div>'
+        expected = make_soup(html, "html.parser")
+
+        for parser in HTML_PARSERS:
+            with self.subTest(parser=parser):
+                if html_parser_name(parser) != parser:
+                    self.skipTest(f"{parser} is not installed")
+                soup = make_soup(html, parser)
+                self.assertEqual(soup.get_text("|"), expected.get_text("|"))
+                self.assertEqual(soup.find("div").attrs, {"class": ["a", "b"], "hidden": "", "data-x": "1"})
+                self.assertEqual(soup.find("script").string, 'var a = "<p>";')
+
+    def test_unknown_or_missing_parser_falls_back_to_html_parser(self):
+        with mock.patch("builtins.print") as printed:
+            self.assertEqual(html_parser_name("html5lib-fast"), "html.parser")
+            with mock.patch("scrapers.soup._available", return_value=False):
+                self.assertEqual(html_parser_name("lxml"), "html.parser")
+
+        self.assertTrue(all(call.args[0].startswith("[WARN]") for call in printed.call_args_list))
+        self.assertEqual(make_soup(b"<p>caf\xc3\xa9</p>", "html.parser").get_text(), "café")
+
+
+if __name__ == "__main__":
+    unittest.main()
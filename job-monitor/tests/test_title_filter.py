@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+import unittest
+
+from agent.cache import PersistentCache
+from ai import title_filter
+from ai.client import GeminiClientProvider, get_gemini_provider, set_gemini_provider
+from ai.gemini import GeminiExecutor, get_gemini_executor, set_gemini_executor
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeModels:
+    def __init__(self, responder):
+        self.responder = responder
+        self.calls = []
+
+    def generate_content(self, model, contents, config=None):
+        self.calls.append(contents)
+        return _FakeResponse(self.responder(contents))
+
+
+class _FakeClient:
+    def __init__(self, responder):
+        self.models = _FakeModels(responder)
+
+
+def _titles_in(prompt):
+    start = prompt.index("[")
+    end = prompt.index("]", start) + 1
+    return [item["title"] for item in json.loads(prompt[start:end])]
+
+
+def _answer(prompt):
+    if prompt.startswith("Is this job title"):
+        return "YES" if "Product" in prompt else "NO"
+    titles = _titles_in(prompt)
+    return json.dumps(
+        {"results": [{"index": index, "is_pm": "Product" in title} for index, title in enumerate(titles, start=1)]}
+    )
+
+
+def _unthrottled_executor():
+    return GeminiExecutor(model_limits={"gemini-2.5-flash": (10_000, 10**9), "gemini-2.5-flash-lite": (10_000, 10**9)})
+
+
+class TitleFilterBatchTests(unittest.TestCase):
+    def setUp(self):
+        self.original_provider = get_gemini_provider()
+        self.original_executor = get_gemini_executor()
+        set_gemini_executor(_unthrottled_executor())
+        self.original_api_key = os.environ.get("GEMINI_API_KEY")
+        os.environ["GEMINI_API_KEY"] = "test-key"
+
+    def tearDown(self):
+        set_gemini_provider(self.original_provider)
+        set_gemini_executor(self.original_executor)
+        if self.original_api_key is None:
+            os.environ.pop("GEMINI_API_KEY", None)
+        else:
+            os.environ["GEMINI_API_KEY"] = self.original_api_key
+
+    def _install(self, responder):
+        client = _FakeClient(responder)
+        set_gemini_provider(GeminiClientProvider(client_factory=lambda api_key: client))
+        return client
+
+    def test_batch_classifies_titles_in_one_call(self):
+        client = self._install(_answer)
+
+        decisions = title_filter.is_pm_role_batch(
+            ["Product Owner, Payments", "Senior Software Engineer", "Product Owner, Payments"]
+        )
+
+        self.assertEqual(decisions, {"Product Owner, Payments": True, "Senior Software Engineer": False})
+        self.assertEqual(len(client.models.calls), 1)
+
+    def test_unparseable_batch_splits_then_falls_back_to_single_title(self):
+        def responder(prompt):
+            if not prompt.startswith("Is this job title") and len(_titles_in(prompt)) > 1:
+                return "I think the first one is a PM role."
+            return _answer(prompt)
+
+        client = self._install(responder)
+
+        decisions = title_filter.is_pm_role_batch(["Product Owner", "Data Scientist", "Product Architect"])
+
+        self.assertEqual(
+            decisions,
+            {"Product Owner": True, "Data Scientist": False, "Product Architect": True},
+        )
+        # One 3-title call, then 1- and 2-title halves, then the 2-title half splits again.
+        self.assertEqual(len(client.models.calls), 5)
+
+    def test_cached_titles_skip_gemini(self):
+        client = self._install(_answer)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = PersistentCache(os.path.join(tmpdir, "titles.json"), max_entries=100)
+            title_filter.is_pm_role_batch(["Product Owner", "Data Scientist"], cache=cache)
+
+            decisions = title_filter.is_pm_role_batch(["product  owner", "Data Scientist", "Product Architect"], cache=cache)
+
+        self.assertEqual(
+            decisions,
+            {"product  owner": True, "Data Scientist": False, "Product Architect": True},
+        )
+        self.assertEqual(len(client.models.calls), 2)
+        self.assertEqual(_titles_in(client.models.calls[-1]), ["Product Architect"])
+        self.assertEqual(cache.stats()["hits"], 2)
+
+    def test_incomplete_batch_response_is_rejected(self):
+        with self.assertRaises(ValueError):
+            title_filter._parse_batch_response('{"results": [{"index": 1, "is_pm": true}]}', 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
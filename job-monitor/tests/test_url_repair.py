@@ -1,5 +1,7 @@
+import tempfile
 import unittest
 
+from agent.descriptions import DescriptionStore, description_sha256
 from agent.url_repair import extract_candidate_links, repair_job_url
 
 
@@ -39,6 +41,25 @@ class UrlRepairTests(unittest.TestCase):
         self.assertEqual(len(job["url_repair"]["attempts"]), 1)
         self.assertTrue(job["url_repair"]["attempts"][0]["accepted"])
 
+    def test_repaired_description_is_stored_under_its_hash(self):
+        title = "Principal Product Manager"
+        job = {
+            "id": "1099549995199",
+            "title": title,
+            "company": "Twilio",
+            "url": "https://jobs.twilio.com/careers?pid=1099549995199",
+            "description": "Twilio careers Search all jobs Product Operations Engineering Sales " * 10,
+            "description_sha256": "stale",
+        }
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = DescriptionStore(directory)
+            repair_job_url(job, max_attempts=2, fetch_description_func=lambda url: _long_description(title), store=store)
+
+            self.assertEqual(job["description_sha256"], description_sha256(job["description"]))
+            self.assertEqual(store.get(job["description_sha256"]), job["description"])
+            self.assertEqual(store.get_for_url(job["url"]), job["description"])
+
     def test_repair_respects_max_attempts(self):
         job = {
             "id": "abc",